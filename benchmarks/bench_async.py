@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark aconvert_many() against serial to_markdown() calls over URLs.
+
+Pages are served from a local HTTP server that waits a fixed latency before
+each response, standing in for remote sites. Serial conversion pays the
+latency once per URL; aconvert_many() overlaps up to concurrency fetches
+with each other and with conversion.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import aconvert_many, to_markdown
+from fixtures import product_page
+
+LATENCY = 0.05
+PAGES = [product_page(sections=20, seed=seed).encode("utf-8") for seed in range(64)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = PAGES[int(self.path.strip("/")) % len(PAGES)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def _convert_all(urls, concurrency):
+    return [result.output async for result in aconvert_many(urls, concurrency=concurrency)]
+
+
+def main():
+    """Run the benchmark."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/{i}" for i in range(len(PAGES))]
+    try:
+        to_markdown(urls[0])
+        start = time.perf_counter()
+        expected = [to_markdown(url) for url in urls]
+        serial = time.perf_counter() - start
+        print(f"{len(urls)} URLs, {LATENCY * 1000:.0f} ms latency; "
+              f"serial: {len(urls) / serial:6.1f} pages/s")
+        for concurrency in (1, 4, 16, 64):
+            start = time.perf_counter()
+            outputs = asyncio.run(_convert_all(urls, concurrency))
+            elapsed = time.perf_counter() - start
+            assert outputs == expected
+            print(f"concurrency={concurrency:2d}: {len(urls) / elapsed:6.1f} pages/s ({serial / elapsed:.2f}x)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
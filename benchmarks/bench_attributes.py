@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark attribute cleaning.
+
+Compares parsing a page and then walking it with ``clean_html_attributes``
+against dropping non-whitelisted attributes while the tree is built.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+
+from html2cleantext.cleaners import KEEP_ATTRIBUTES, clean_html_attributes
+from html2cleantext.parsing import parse_html, parse_soup, soup_from_tree
+from fixtures import product_page
+
+
+def _parse_then_walk(html: str) -> BeautifulSoup:
+    return clean_html_attributes(BeautifulSoup(html, 'lxml'))
+
+
+def _filter_while_parsing(html: str) -> BeautifulSoup:
+    return parse_soup(html, KEEP_ATTRIBUTES)
+
+
+def _filter_while_replaying(html: str) -> BeautifulSoup:
+    return soup_from_tree(parse_html(html), KEEP_ATTRIBUTES)
+
+
+def _best_of(func, html: str, runs: int = 5) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    html = product_page(sections=3000)
+    print(f"Page size: {len(html) / 1024:.0f} KB")
+
+    expected = str(_parse_then_walk(html))
+    assert str(_filter_while_parsing(html)) == expected, "parse filter disagrees"
+    assert str(_filter_while_replaying(html)) == expected, "replay filter disagrees"
+
+    walk_time = _best_of(_parse_then_walk, html)
+    parse_time = _best_of(_filter_while_parsing, html)
+    replay_time = _best_of(_filter_while_replaying, html)
+
+    print(f"parse + clean_html_attributes: {walk_time * 1000:8.1f} ms")
+    print(f"filter while parsing:          {parse_time * 1000:8.1f} ms")
+    print(f"filter while replaying lxml:   {replay_time * 1000:8.1f} ms")
+    print(f"Speedup: {walk_time / parse_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark convert_many() throughput against the number of worker processes.
+
+Converts a corpus of synthetic product pages serially with to_markdown()
+and with convert_many() at increasing worker counts, up to the number of
+CPUs (or the count given as the first argument), and reports documents per
+second and the speedup over one process.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import convert_many, to_markdown
+from fixtures import product_page
+
+
+def main():
+    """Run the benchmark."""
+    documents = [product_page(sections=60, seed=seed) for seed in range(200)]
+    cpus = os.cpu_count() or 1
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else cpus
+
+    start = time.perf_counter()
+    expected = [to_markdown(document) for document in documents]
+    serial = time.perf_counter() - start
+    print(f"{cpus} CPUs, {len(documents)} documents of ~{len(documents[0]) // 1024} KiB")
+    print(f"serial to_markdown():   {len(documents) / serial:7.1f} docs/s")
+
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        outputs = [result.output for result in convert_many(documents, workers=workers, chunksize=4)]
+        elapsed = time.perf_counter() - start
+        assert outputs == expected
+        print(f"convert_many({workers:2d} workers): {len(documents) / elapsed:7.1f} docs/s "
+              f"({serial / elapsed:.2f}x)")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark manual boilerplate removal.
+
+Compares one ``soup.select()`` call per selector with the compiled matcher
+that checks tag names, classes, ids and roles in a single traversal. Both
+finish with the same low-content filter.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+
+from html2cleantext import cleaners
+from fixtures import product_page
+
+SELECT_SELECTORS = [s for s in cleaners.BOILERPLATE_SELECTORS if not s.startswith('[')]
+ROLES = ['navigation', 'banner', 'contentinfo', 'complementary']
+
+
+def _select_each(soup) -> None:
+    for selector in SELECT_SELECTORS:
+        for element in soup.select(selector):
+            element.decompose()
+    for element in soup.find_all(attrs={'role': ROLES}):
+        element.decompose()
+    cleaners._remove_low_content_elements(soup)
+
+
+def _fused(soup) -> None:
+    cleaners._manual_boilerplate_removal(soup)
+
+
+def _time_once(func, soup) -> float:
+    start = time.perf_counter()
+    func(soup)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    html = product_page(sections=3000)
+    print(f"Page size: {len(html) / 1024:.0f} KB")
+
+    expected = BeautifulSoup(html, 'lxml')
+    _select_each(expected)
+    result = BeautifulSoup(html, 'lxml')
+    _fused(result)
+    assert str(result) == str(expected), "matchers disagree"
+
+    # Both mutate the tree, so every run gets a fresh copy
+    select_time = min(_time_once(_select_each, BeautifulSoup(html, 'lxml')) for _ in range(3))
+    fused_time = min(_time_once(_fused, BeautifulSoup(html, 'lxml')) for _ in range(3))
+
+    print(f"select() per selector: {select_time * 1000:8.1f} ms")
+    print(f"single traversal:      {fused_time * 1000:8.1f} ms")
+    print(f"Speedup: {select_time / fused_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark a daily re-fetch of the same URLs with and without a FetchCache.
+
+A local server sends each page after REQUEST_LATENCY plus its size over
+BANDWIDTH, and answers matching If-None-Match requests with 304. Between
+the first and second day a tenth of the pages change. Reports the time
+and body bytes of each day without a cache and with a cold and then a warm
+FetchCache, and the cache's hit, revalidation and miss counts.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.caching import FetchCache
+from html2cleantext.fetching import Fetcher
+from fixtures import product_page
+
+REQUEST_LATENCY = 0.02
+BANDWIDTH = 5 << 20    # bytes per second
+PAGES = 100
+VERSIONS = {}
+
+
+@lru_cache(maxsize=None)
+def _body(index: int, version: int) -> bytes:
+    return product_page(sections=300, seed=index * 1000 + version).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        index = int(self.path.strip("/"))
+        version = VERSIONS[index]
+        etag = f'"{index}-{version}"'
+        time.sleep(REQUEST_LATENCY)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = _body(index, version)
+        time.sleep(len(body) / BANDWIDTH)
+        with self.server.lock:
+            self.server.body_bytes += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _day(server, urls, cache=None):
+    """Fetch every URL on 4 threads and return the time and body bytes sent."""
+    server.body_bytes = 0
+    with Fetcher(cache=cache) as fetcher, ThreadPoolExecutor(4) as executor:
+        start = time.perf_counter()
+        list(executor.map(fetcher.fetch_markup, urls))
+        return time.perf_counter() - start, server.body_bytes
+
+
+def main():
+    """Run the benchmark."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/{i}" for i in range(PAGES)]
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FetchCache(directory)
+            for day in (1, 2):
+                if day == 2:
+                    for index in range(0, PAGES, 10):
+                        VERSIONS[index] += 1
+                else:
+                    VERSIONS.update((index, 0) for index in range(PAGES))
+                for index in range(PAGES):
+                    _body(index, VERSIONS[index])
+                uncached, uncached_bytes = _day(server, urls)
+                cached, cached_bytes = _day(server, urls, cache)
+                print(f"day {day}: no cache {uncached * 1000:7.1f} ms, {uncached_bytes / 1e6:5.1f} MB; "
+                      f"FetchCache {cached * 1000:7.1f} ms, {cached_bytes / 1e6:5.1f} MB "
+                      f"({uncached / cached:.2f}x)")
+            print(cache.cache_info())
+            cache.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
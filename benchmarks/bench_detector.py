@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading language profiles for detection.
+
+Each measurement runs in a fresh interpreter, so it includes the first
+detection's profile load: langdetect's own detect() loads every profile,
+LanguageDetector only the candidates. Reports the first and later call
+latency and the memory allocated by the load (measured in a separate run, since tracing slows
+the load down).
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TEXT = "The quick brown fox jumps over the lazy dog and runs across the field. " * 20
+
+SCRIPT = '''
+import json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+from html2cleantext.utils import LanguageDetector, detect_language
+text = {text!r}
+languages = {languages!r}
+if {trace!r}:
+    tracemalloc.start()
+start = time.perf_counter()
+detector = LanguageDetector(languages) if languages else None
+first = detect_language(text, detector=detector)
+first_time = time.perf_counter() - start
+memory = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+start = time.perf_counter()
+for _ in range(20):
+    detect_language(text, detector=detector)
+print(json.dumps([first, first_time, (time.perf_counter() - start) / 20, memory]))
+'''
+
+
+def _measure(languages, trace=False):
+    code = SCRIPT.format(root=str(ROOT), text=TEXT, languages=languages, trace=trace)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def main():
+    """Run the benchmark."""
+    for label, languages in (("all profiles", None), ("en, bn, de", ('en', 'bn', 'de')),
+                             ("en, bn", ('en', 'bn'))):
+        language, first_time, call_time, _ = _measure(languages)
+        memory = _measure(languages, trace=True)[3]
+        print(f"{label:>12}: first call {first_time * 1000:7.1f} ms, later calls {call_time * 1000:5.2f} ms, "
+              f"profiles {memory / 2 ** 20:6.1f} MiB ({language})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark pooled Fetcher requests against one-off fetch_url() calls.
+
+A local HTTP/1.1 server waits SETUP_LATENCY when a connection is accepted,
+standing in for the TCP and TLS handshakes with a remote retailer, and
+REQUEST_LATENCY per request. fetch_url() opens a new connection per page;
+a Fetcher pays the setup once per pooled connection.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.fetching import Fetcher
+from html2cleantext.utils import fetch_url
+from fixtures import product_page
+
+SETUP_LATENCY = 0.03
+REQUEST_LATENCY = 0.01
+PAGE = product_page(sections=20, seed=0).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; like production servers, send
+    # them without waiting for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        time.sleep(SETUP_LATENCY)
+        super().setup()
+
+    def do_GET(self):
+        time.sleep(REQUEST_LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    """Run the benchmark."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/{i}" for i in range(100)]
+    print(f"{len(urls)} pages, {SETUP_LATENCY * 1000:.0f} ms connection setup, "
+          f"{REQUEST_LATENCY * 1000:.0f} ms per request")
+    try:
+        for threads in (1, 8):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                list(executor.map(fetch_url, urls))
+            one_off = time.perf_counter() - start
+
+            with Fetcher() as fetcher, ThreadPoolExecutor(threads) as executor:
+                start = time.perf_counter()
+                list(executor.map(fetcher.fetch, urls))
+                pooled = time.perf_counter() - start
+                stats = fetcher.stats()
+            print(f"{threads} thread(s): fetch_url {len(urls) / one_off:6.1f} pages/s, "
+                  f"Fetcher {len(urls) / pooled:6.1f} pages/s ({one_off / pooled:.2f}x); "
+                  f"{stats.connections_opened} connections opened, {stats.connections_reused} reused")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-host language cache on a simulated crawl.
+
+Detects the language of pages from a handful of hosts, once for every
+page and once through a HostLanguageCache, and reports hits, misses and
+pages whose language differs.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.utils import HostLanguageCache, detect_language, detect_script_language
+
+SENTENCES = {
+    'en': "The quick brown fox jumps over the lazy dog and runs across the field. ",
+    'de': "Der schnelle braune Fuchs springt über den faulen Hund und läuft davon. ",
+    'fr': "Le renard brun rapide saute par-dessus le chien paresseux et s'enfuit. ",
+}
+
+
+def _crawl(pages: int = 1000, hosts: int = 20, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    host_languages = [rng.choice(sorted(SENTENCES)) for _ in range(hosts)]
+    crawl = []
+    for i in range(pages):
+        host = rng.randrange(hosts)
+        crawl.append((f"https://site{host}.example.com/page/{i}",
+                      SENTENCES[host_languages[host]] * rng.randint(5, 20)))
+    return crawl
+
+
+def main():
+    """Run the benchmark."""
+    crawl = _crawl()
+    detect_language("Load the language profiles before timing anything.")
+
+    start = time.perf_counter()
+    expected = [detect_script_language(text) for _, text in crawl]
+    uncached_time = time.perf_counter() - start
+
+    cache = HostLanguageCache()
+    start = time.perf_counter()
+    cached = [cache.detect(text, url) for url, text in crawl]
+    cached_time = time.perf_counter() - start
+
+    info = cache.cache_info()
+    differing = sum(a != b for a, b in zip(expected, cached))
+    print(f"{len(crawl)} pages: every page {uncached_time * 1000:7.1f} ms, "
+          f"host cache {cached_time * 1000:6.1f} ms ({uncached_time / cached_time:.1f}x), "
+          f"{info.hits} hits, {info.misses} misses, {differing} differing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch language identification.
+
+Detects the language of a batch of generated documents in several
+languages with detect_language() one document at a time, and with the
+NumPy batch detector, and reports the share of matching answers. Pass
+the batch size as an argument (default: 10000).
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.langid import detect_languages
+from html2cleantext.utils import detect_language
+
+SENTENCES = {
+    'en': "The quick brown fox jumps over the lazy dog. We ship all orders within two days.",
+    'bn': "আমি বাংলায় গান গাই, আমি বাংলার গান গাই। আজকের সংবাদ: ঢাকায় বৃষ্টি হয়েছে।",
+    'de': "Der schnelle braune Fuchs springt über den faulen Hund. Wir liefern innerhalb von zwei Tagen.",
+    'fr': "Le renard brun rapide saute par-dessus le chien paresseux. Nous expédions sous deux jours.",
+    'es': "El rápido zorro marrón salta sobre el perro perezoso. Enviamos los pedidos en dos días.",
+    'ru': "Быстрая коричневая лиса прыгает через ленивую собаку. Мы отправляем заказы за два дня.",
+}
+
+
+def _documents(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = {language: sentence.split() for language, sentence in SENTENCES.items()}
+    documents = []
+    for _ in range(count):
+        vocabulary = words[rng.choice(sorted(words))]
+        documents.append(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(20, 1000))))
+    return documents
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    documents = _documents(count)
+    detect_language("Load the language profiles before timing anything.")
+    detect_languages(["Build the profile matrix before timing anything."])
+
+    start = time.perf_counter()
+    expected = [detect_language(text) for text in documents]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = detect_languages(documents)
+    batch_time = time.perf_counter() - start
+
+    matching = sum(a == b for a, b in zip(expected, batch))
+    print(f"{count} documents: detect_language {single_time:6.2f} s, batch {batch_time:5.2f} s "
+          f"({single_time / batch_time:.1f}x), {matching / count:.2%} matching")
+
+
+if __name__ == "__main__":
+    main()
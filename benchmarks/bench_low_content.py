@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark the text-to-HTML ratio filter on deeply nested wrappers.
+
+Calling ``get_text()`` and ``str()`` on every container walks and serializes
+each subtree once per enclosing container; the bottom-up pass visits every
+node once.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.cleaners import _remove_low_content_elements
+from html2cleantext.parsing import parse_html, soup_from_tree
+from fixtures import nested_page
+
+
+def _per_element(soup, threshold: float = 0.3) -> None:
+    for element in soup.find_all(['div', 'section', 'article']):
+        text_length = len(element.get_text().strip())
+        html_length = len(str(element))
+        if html_length > 0 and text_length / html_length < threshold and text_length < 50:
+            element.decompose()
+
+
+def _time_once(func, soup) -> float:
+    start = time.perf_counter()
+    func(soup)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    for depth, breadth in ((25, 200), (50, 100), (100, 50)):
+        html = nested_page(depth=depth, breadth=breadth)
+        root = parse_html(html)
+
+        expected = soup_from_tree(root)
+        _per_element(expected)
+        result = soup_from_tree(root)
+        _remove_low_content_elements(result)
+        assert str(result) == str(expected), "filters disagree"
+
+        # Both filters mutate the tree, so every run gets a fresh copy
+        per_element_time = min(_time_once(_per_element, soup_from_tree(root)) for _ in range(3))
+        bottom_up_time = min(_time_once(_remove_low_content_elements, soup_from_tree(root)) for _ in range(3))
+
+        print(f"{len(html) / 1024:6.0f} KB, depth {depth:3d}: per element {per_element_time * 1000:8.1f} ms, "
+              f"bottom-up {bottom_up_time * 1000:6.1f} ms, speedup {per_element_time / bottom_up_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark the native Markdown renderer against markdownify.
+
+Both renderers start from the same cleaned BeautifulSoup tree; markdownify
+first has to serialize it and parse the markup again.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from markdownify import markdownify
+
+from html2cleantext.parsing import parse_html, soup_from_tree
+from html2cleantext.renderers import render_markdown
+from fixtures import product_page
+
+
+def _best_of(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    html = product_page(sections=3000)
+    soup = soup_from_tree(parse_html(html))
+    print(f"Page size: {len(html) / 1024:.0f} KB")
+
+    reference = markdownify(str(soup), heading_style="ATX", bullets="*")
+    assert render_markdown(soup) == reference, "renderers disagree"
+
+    markdownify_time = _best_of(lambda: markdownify(str(soup), heading_style="ATX", bullets="*"))
+    native_time = _best_of(lambda: render_markdown(soup))
+
+    print(f"markdownify(str(soup)): {markdownify_time * 1000:8.1f} ms")
+    print(f"render_markdown(soup):  {native_time * 1000:8.1f} ms")
+    print(f"Speedup: {markdownify_time / native_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
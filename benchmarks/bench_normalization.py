@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call cost of the text normalization layer.
+
+Compares module-level compiled patterns with passing pattern strings to
+``re`` on every call, as the normalization functions used to. The strings
+version is timed with a warm ``re`` cache and with the cache purged before
+each call, which is what happens when other code fills the cache.
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import cleaners
+from html2cleantext.cleaners import currency_regex
+from html2cleantext.utils import normalize_whitespace
+
+TEXT = (
+    "Product 12 “special” offer — now… only\n"
+    "ab 1.299,00 EUR *\n"
+    "Statt: 1.499,00 €\n\n"
+    "See https://shop.example.com/p/12 and [IMAGE:https://cdn.example.com/12.jpg]\n"
+)
+
+
+def _string_patterns(text: str) -> str:
+    text = re.sub(r'[“”]', '"', text)
+    text = re.sub(r'[‘’]', "'", text)
+    text = re.sub(r'[–—]', '-', text)
+    text = re.sub(r'…', '...', text)
+    text = re.sub(r'(https?://[^\s\]]+|[^\s\]]*\.[a-zA-Z]{2,}[^\s\]]*)', lambda m: m.group(0), text)
+    text = re.sub(r'(\[IMAGE:[^\]]+\])', lambda m: m.group(0), text)
+    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'[\u00A0\u2000-\u200F\u2028-\u202F\u205F-\u206F\uFEFF]', ' ', text)
+    price_pattern = re.compile(
+        rf"(\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?|ab\s?\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?|Statt:\s?\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?)"
+    )
+    for line in text.split('\n'):
+        price_pattern.search(line)
+    return normalize_whitespace(text)
+
+
+def _compiled_patterns(text: str) -> str:
+    text = cleaners._normalize_english(text)
+    text = cleaners._general_normalization(text)
+    cleaners.group_product_info(text)
+    return normalize_whitespace(text)
+
+
+def _per_call(func, calls: int, purge: bool = False) -> float:
+    total = 0.0
+    for _ in range(calls):
+        if purge:
+            re.purge()
+        start = time.perf_counter()
+        func(TEXT)
+        total += time.perf_counter() - start
+    return total / calls
+
+
+def main():
+    """Run the benchmark."""
+    calls = 2000
+    compiled = _per_call(_compiled_patterns, calls)
+    warm = _per_call(_string_patterns, calls)
+    evicted = _per_call(_string_patterns, calls // 10, purge=True)
+
+    print(f"compiled at import:        {compiled * 1e6:8.1f} us/call")
+    print(f"pattern strings, warm:     {warm * 1e6:8.1f} us/call")
+    print(f"pattern strings, evicted:  {evicted * 1e6:8.1f} us/call")
+    print(f"Speedup: {warm / compiled:.1f}x warm, {evicted / compiled:.1f}x evicted")
+
+
+if __name__ == "__main__":
+    main()
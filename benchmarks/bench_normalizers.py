@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark character replacement normalizers against per-pattern regexes.
+
+The regex versions are the English and Bengali normalizers and the Unicode
+space cleanup as they were before being turned into replacement tables.
+``str.translate()`` with the same table is timed too. ``normalize_language()``
+on auto-detected ASCII text is timed separately, since it no longer runs
+language detection.
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import cleaners
+from html2cleantext.utils import detect_script_language
+
+_PATTERNS = {
+    'en': [(re.compile(r'[“”]'), '"'), (re.compile(r'[‘’]'), "'"),
+           (re.compile(r'[–—]'), '-'), (re.compile(r'…'), '...')],
+    'bn': [(re.compile(r'[\u0964\u0965]+'), '\u0964'), (re.compile(r'[\u09F7\u09F8\u09F9]+'), ''),
+           (re.compile(r'[\u200C\u200D]+'), '')],
+}
+_UNICODE_SPACES_RE = re.compile(r'[\u00A0\u2000-\u200F\u2028-\u202F\u205F-\u206F\uFEFF]')
+
+TEXTS = {
+    'en': ("The “quick” brown fox’s jump — over the lazy dog… and back again. " * 80),
+    'bn': ("আমি বাংলায় গান গাই‌। ঢাকায় বৃষ্টি হয়েছে॥ দাম ৳১২০০ টাকা। " * 80),
+    'ascii': ("Plain ASCII product text with prices like 12.99 EUR and no smart quotes. " * 80),
+}
+
+
+def _regex_normalize(text: str, lang: str) -> str:
+    for pattern, replacement in _PATTERNS.get(lang, ()):
+        text = pattern.sub(replacement, text)
+    return _UNICODE_SPACES_RE.sub(' ', text)
+
+
+_TRANSLATE_TABLES = {
+    'en': str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'", '–': '-', '—': '-', '…': '...'}),
+    'bn': str.maketrans({'\u0965': '\u0964', '\u09F7': None, '\u09F8': None, '\u09F9': None,
+                         '\u200C': None, '\u200D': None}),
+}
+_SPACES_TABLE = str.maketrans({char: ' ' for char in map(chr, range(0x10000)) if _UNICODE_SPACES_RE.match(char)})
+
+
+def _translate_normalize(text: str, lang: str) -> str:
+    if '\u0965' in text or '\u0964\u0964' in text:
+        text = _PATTERNS['bn'][0][0].sub('\u0964', text)
+    return text.translate(_TRANSLATE_TABLES[lang]).translate(_SPACES_TABLE)
+
+
+def _replace_normalize(text: str, lang: str) -> str:
+    text = cleaners._normalize_for_language(text, lang)
+    return cleaners._replace_unicode_spaces(text)
+
+
+def _per_call(func, *args, calls: int = 2000) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(*args)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    """Run the benchmark."""
+    for name, text in TEXTS.items():
+        lang = 'en' if name == 'ascii' else name
+        assert _regex_normalize(text, lang) == _replace_normalize(text, lang) == _translate_normalize(text, lang)
+        regex = _per_call(_regex_normalize, text, lang)
+        translate = _per_call(_translate_normalize, text, lang)
+        replace = _per_call(_replace_normalize, text, lang)
+        print(f"{name:5s} ({len(text)} chars): regexes {regex * 1e6:7.1f} us, "
+              f"str.translate {translate * 1e6:7.1f} us, replacements {replace * 1e6:7.1f} us "
+              f"({regex / replace:.1f}x)")
+
+    text = TEXTS['ascii']
+    detected = _per_call(lambda: _regex_normalize(text, detect_script_language(text)), calls=50)
+    skipped = _per_call(cleaners._apply_language_normalization, text, None, False, None)
+    print(f"auto-detected ASCII text: detect+normalize {detected * 1e6:7.1f} us, "
+          f"fast path {skipped * 1e6:7.1f} us ({detected / skipped:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-paragraph language detection on mixed Bengali/English pages.
+
+Compares detecting one language for the whole page text with
+detect_script_language() against detect_paragraph_languages() on its
+lines, which groups the Latin-script lines into at most three langdetect
+calls.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.utils import detect_language, detect_paragraph_languages, detect_script_language
+
+BENGALI = [
+    "আজকের সংবাদ: ঢাকায় টানা বৃষ্টিতে বিভিন্ন এলাকায় জলাবদ্ধতা দেখা দিয়েছে।",
+    "আমাদের দোকানে সব পণ্য সাশ্রয়ী মূল্যে পাওয়া যায়, আজই অর্ডার করুন।",
+    "ক্রেতাদের সুবিধার জন্য সারা দেশে হোম ডেলিভারি দেওয়া হচ্ছে।",
+]
+ENGLISH = [
+    "Samsung Galaxy A54 5G (8GB RAM, 256GB)",
+    "Apple iPhone 15 Pro Max - Natural Titanium",
+    "Free delivery on all orders over 2000 taka. Terms and conditions apply.",
+    "Breaking: Parliament passes the new budget for the coming fiscal year.",
+]
+
+
+def _page(lines: int, rng: random.Random) -> str:
+    return '\n'.join(rng.choice(BENGALI if rng.random() < 0.6 else ENGLISH) for _ in range(lines))
+
+
+def main():
+    """Run the benchmark."""
+    rng = random.Random(0)
+    detect_language("Load the language profiles before timing anything.")
+    for lines in (20, 100, 500):
+        pages = [_page(lines, rng) for _ in range(20)]
+
+        start = time.perf_counter()
+        for page in pages:
+            detect_script_language(page)
+        whole_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for page in pages:
+            detect_paragraph_languages(page.split('\n'))
+        paragraph_time = time.perf_counter() - start
+
+        print(f"{lines:4d} lines: whole page {whole_time / len(pages) * 1000:6.1f} ms, "
+              f"per paragraph {paragraph_time / len(pages) * 1000:6.1f} ms "
+              f"({paragraph_time / whole_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
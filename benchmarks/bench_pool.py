@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the warm ConversionPool against a plain process pool.
+
+- First result: latency of the first conversion in a fresh pool, where a
+  plain ProcessPoolExecutor loads the langdetect profiles in the worker
+  during the first task and ConversionPool warms up before it.
+- Transfer: round trip of a large HTML string to a worker, pickled into the
+  task vs. passed through a shared memory block.
+- Recycling: throughput and worker counts with and without
+  max_tasks_per_worker.
+"""
+
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import batch, to_markdown
+from html2cleantext.batch import ConversionPool
+from fixtures import product_page
+
+FIRST_PAGE = "<p>Le renard brun rapide saute par-dessus le chien paresseux et s'enfuit vers la forêt.</p>"
+
+
+def _payload_length(items) -> int:
+    """Worker task resolving payloads like _convert_items() does, without converting them."""
+    total = 0
+    for _, payload in items:
+        if isinstance(payload, batch._SharedPayload):
+            payload = batch._read_shared(payload)
+        total += len(payload)
+    return total
+
+
+def _first_result():
+    start = time.perf_counter()
+    with ProcessPoolExecutor(2) as executor:
+        executor.submit(to_markdown, FIRST_PAGE).result()
+        cold = time.perf_counter() - start
+    print(f"first result, ProcessPoolExecutor:  {cold * 1000:7.1f} ms")
+
+    start = time.perf_counter()
+    with ConversionPool(workers=2) as pool:
+        started = time.perf_counter() - start
+        list(pool.convert_many([FIRST_PAGE]))
+        warm = time.perf_counter() - start
+    print(f"first result, ConversionPool:       {warm * 1000:7.1f} ms "
+          f"({started * 1000:.1f} ms starting and warming up, {(warm - started) * 1000:.1f} ms converting)")
+
+
+def _transfer(rounds: int = 20):
+    page = product_page(sections=400, seed=0)
+    with ConversionPool(workers=1, shared_memory_threshold=0, normalize_lang=False) as pool:
+        for megabytes in (1, 4, 16):
+            html = (page * (megabytes * (1 << 20) // len(page) + 1))[:megabytes << 20]
+            timings = {}
+            for name, threshold in (('pickled', None), ('shared memory', 0)):
+                pool.shared_memory_threshold = threshold
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    items, blocks = pool._payloads([(0, html)])
+                    assert pool._pool.apply(_payload_length, (items,)) == len(html)
+                    batch._release(blocks)
+                timings[name] = (time.perf_counter() - start) / rounds
+            print(f"transfer {megabytes:2d} MiB: pickled {timings['pickled'] * 1000:6.1f} ms, "
+                  f"shared memory {timings['shared memory'] * 1000:6.1f} ms "
+                  f"({timings['pickled'] / timings['shared memory']:.1f}x)")
+
+
+def _recycling():
+    documents = [product_page(sections=30, seed=seed) for seed in range(200)]
+    for max_tasks in (None, 10):
+        with ConversionPool(workers=2, max_tasks_per_worker=max_tasks) as pool:
+            start = time.perf_counter()
+            results = list(pool.convert_many(documents, chunksize=2))
+            elapsed = time.perf_counter() - start
+            assert all(result.ok for result in results)
+            stats = pool.stats()
+        print(f"max_tasks_per_worker={max_tasks}: {len(documents) / elapsed:6.1f} docs/s, "
+              f"{stats.workers_started} workers started, {stats.workers_recycled} recycled")
+
+
+def main():
+    """Run the benchmark."""
+    _first_result()
+    _transfer()
+    _recycling()
+
+
+if __name__ == "__main__":
+    main()
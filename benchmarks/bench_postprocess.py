@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark text post-processing on 1 MB inputs.
+
+Compares normalize_language(), format_readable_text() and
+group_product_info() run one after another with the fused single-pass
+postprocess_text(). Language detection is skipped by passing 'en'.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.cleaners import normalize_language, group_product_info, postprocess_text
+from html2cleantext.utils import format_readable_text
+from fixtures import WORDS
+
+
+def _product_text(size: int, seed: int = 0) -> str:
+    """Short lines with prices and links, as extracted from shop pages."""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    i = 0
+    while total < size:
+        line = rng.choice([
+            f"Product {i} {rng.choice(WORDS)} {rng.choice(WORDS)}",
+            f"ab {rng.randint(1, 999)},{rng.randint(10, 99)} EUR *",
+            f"see https://shop.example.com/p/{i} for details",
+            "",
+        ])
+        parts.append(line)
+        total += len(line) + 1
+        i += 1
+    return '\n'.join(parts)
+
+
+def _merged_text(size: int, seed: int = 0) -> str:
+    """Long paragraphs of continuation lines that all merge into one line."""
+    rng = random.Random(seed)
+    parts = ["This paragraph starts with a long enough first line"]
+    total = len(parts[0])
+    while total < size:
+        line = ' '.join(rng.choice(WORDS) for _ in range(8))
+        parts.append(line)
+        total += len(line) + 1
+    return '\n'.join(parts)
+
+
+def _separate(text: str) -> str:
+    text = normalize_language(text, 'en')
+    text = format_readable_text(text)
+    return group_product_info(text)
+
+
+def _fused(text: str) -> str:
+    return postprocess_text(text, 'en')
+
+
+def _time(func, text: str) -> float:
+    start = time.perf_counter()
+    func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    size = 1024 * 1024
+    for name, text in (("product lines", _product_text(size)), ("merged paragraph", _merged_text(size))):
+        assert _fused(text) == _separate(text), f"{name}: outputs differ"
+        separate_time = min(_time(_separate, text) for _ in range(3))
+        fused_time = min(_time(_fused, text) for _ in range(3))
+        print(f"{name:17s} ({len(text) / 1024:.0f} KB): separate {separate_time * 1000:8.1f} ms, "
+              f"fused {fused_time * 1000:7.1f} ms ({separate_time / fused_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
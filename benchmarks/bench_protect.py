@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark URL and image placeholder protection on link-heavy text.
+
+Compares protecting with the URL and ``[IMAGE:...]`` regexes and restoring
+with one ``str.replace`` per item against the linear-time tokenizer and
+single-pass restore.
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.utils import protect_items, restore_items
+
+URL_RE = re.compile(r'(https?://[^\s\]]+|[^\s\]]*\.[a-zA-Z]{2,}[^\s\]]*)')
+IMAGE_RE = re.compile(r'(\[IMAGE:[^\]]+\])')
+
+
+def _regex_round_trip(text: str) -> str:
+    items = []
+
+    def protect(match):
+        items.append(match.group(0))
+        return f"__PROTECTED_ITEM_{len(items) - 1}__"
+
+    text = URL_RE.sub(protect, text)
+    text = IMAGE_RE.sub(protect, text)
+    for i, item in enumerate(items):
+        text = text.replace(f"__PROTECTED_ITEM_{i}__", item)
+    return text
+
+
+def _tokenizer_round_trip(text: str) -> str:
+    text, items = protect_items(text)
+    return restore_items(text, items)
+
+
+def _time(func, text: str) -> float:
+    start = time.perf_counter()
+    func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    for links in (1000, 5000, 10000):
+        text = ''.join(
+            f"Product {i} see https://shop.example.com/p/{i} [IMAGE:https://cdn.example.com/{i}.jpg]\n"
+            for i in range(links)
+        )
+        assert _tokenizer_round_trip(text) == _regex_round_trip(text)
+        regex_time = _time(_regex_round_trip, text)
+        tokenizer_time = _time(_tokenizer_round_trip, text)
+        print(f"{links:6d} links: regex + replace {regex_time * 1000:8.1f} ms, "
+              f"tokenizer {tokenizer_time * 1000:6.1f} ms ({regex_time / tokenizer_time:.0f}x)")
+
+    text = "a" * 20000
+    print(f"20000-char token: regex {_time(_regex_round_trip, text) * 1000:.0f} ms, "
+          f"tokenizer {_time(_tokenizer_round_trip, text) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark pruning scripts, styles, SVG, comments and data URIs before parsing.
+
+Compares converting a script-heavy page as is with pruning the markup first.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import to_markdown
+from html2cleantext.parsing import prune_html
+from fixtures import script_heavy_page
+
+
+def _best_of(func, runs: int = 3) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    html = script_heavy_page(sections=600)
+    pruned, removed = prune_html(html)
+    print(f"Page size: {len(html) / 1024:.0f} KB, pruned {removed / 1024:.0f} KB "
+          f"({removed / len(html):.0%})")
+
+    prune_time = _best_of(lambda: prune_html(html))
+    plain_time = _best_of(lambda: to_markdown(html))
+    pruned_time = _best_of(lambda: to_markdown(html, prune=True))
+
+    print(f"prune_html alone:        {prune_time * 1000:8.1f} ms")
+    print(f"to_markdown:             {plain_time * 1000:8.1f} ms")
+    print(f"to_markdown(prune=True): {pruned_time * 1000:8.1f} ms")
+    print(f"Speedup: {plain_time / pruned_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Unicode-script front end to language detection.
+
+Times detect_language() against detect_script_language() on a mix of
+Bengali, English and mixed-script page texts and reports the share of
+documents that skipped langdetect.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.utils import (
+    detect_language, detect_script_language, reset_script_detection_info, script_detection_info
+)
+
+BENGALI = "আমি বাংলায় গান গাই, আমি বাংলার গান গাই। দাম ৳১২০০, আজই অর্ডার করুন। "
+ENGLISH = "The quick brown fox jumps over the lazy dog and runs across the field. "
+
+
+def _documents(count: int = 200, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            documents.append(BENGALI * rng.randint(5, 100))
+        elif kind < 0.9:
+            documents.append(ENGLISH * rng.randint(5, 100))
+        else:
+            documents.append(ENGLISH * rng.randint(1, 10) + BENGALI * rng.randint(1, 10))
+    return documents
+
+
+def main():
+    """Run the benchmark."""
+    documents = _documents()
+    detect_language("Load the language profiles before timing anything.")
+
+    start = time.perf_counter()
+    langdetect_answers = [detect_language(text) for text in documents]
+    langdetect_time = time.perf_counter() - start
+
+    reset_script_detection_info()
+    start = time.perf_counter()
+    script_answers = [detect_script_language(text) for text in documents]
+    script_time = time.perf_counter() - start
+
+    assert script_answers == langdetect_answers
+    info = script_detection_info()
+    print(f"{len(documents)} documents: langdetect {langdetect_time * 1000:7.1f} ms, "
+          f"script front end {script_time * 1000:6.1f} ms ({langdetect_time / script_time:.1f}x), "
+          f"{info.skip_rate:.0%} skipped langdetect")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark streamed Fetcher responses against fetch_url()'s response.text.
+
+- Decoding: a 1 MB UTF-8 page with a <meta> charset, one whose
+  Content-Type has no charset, and one served without a Content-Type,
+  which makes requests guess the charset. Reports fetch time,
+  fetch-and-parse time and whether the text survived.
+- Rejection: a 20 MB PDF, downloaded (and charset-guessed) in full by
+  fetch_url() and rejected from its Content-Type by the Fetcher.
+- Size cap: a 20 MB chunked HTML response without a Content-Length,
+  abandoned by a Fetcher with max_bytes of 1 MB.
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext.fetching import Fetcher
+from html2cleantext.parsing import parse_html
+from html2cleantext.utils import fetch_url
+from fixtures import product_page
+
+MARKER = "বাংলা café — “quoted”"
+PAGE = product_page(sections=400, seed=0).replace("<p>", f"<p>{MARKER} ", 200)
+PAGE = (PAGE * (1_000_000 // len(PAGE) + 1)).encode("utf-8")
+LARGE = b"\0" * (20 << 20)
+ROUTES = {
+    "/meta": ("text/html", b'<meta charset="utf-8">' + PAGE, False),
+    "/no-charset": ("text/html", PAGE, False),
+    "/no-type": (None, PAGE, False),
+    "/report.pdf": ("application/pdf", LARGE, False),
+    "/huge": ("text/html", b"<p>" + LARGE, True),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        content_type, body, chunked = ROUTES[self.path]
+        self.send_response(200)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        try:
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(body), 1 << 16):
+                    chunk = body[start:start + (1 << 16)]
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+            else:
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _timed(function, rounds: int = 5):
+    """Return the result of function and its average run time in ms."""
+    function()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = function()
+    return result, (time.perf_counter() - start) / rounds * 1000
+
+
+def _decoding(base: str, fetcher: Fetcher):
+    for path in ("/meta", "/no-charset", "/no-type"):
+        url = base + path
+        text, text_ms = _timed(lambda: fetch_url(url))
+        _, text_parse_ms = _timed(lambda: parse_html(fetch_url(url)))
+        markup, markup_ms = _timed(lambda: fetcher.fetch_markup(url))
+        root, markup_parse_ms = _timed(lambda: parse_html(fetcher.fetch_markup(url)))
+        print(f"{path:11s} fetch_url: {text_ms:6.1f} ms fetch, {text_parse_ms:6.1f} ms with parsing, "
+              f"text {'intact' if MARKER in text else 'garbled'}")
+        print(f"{'':11s} Fetcher:   {markup_ms:6.1f} ms fetch, {markup_parse_ms:6.1f} ms with parsing, "
+              f"text {'intact' if MARKER in root.text_content() else 'garbled'} "
+              f"({type(markup).__name__} to the parser)")
+
+
+def _rejection(base: str, fetcher: Fetcher, capped: Fetcher):
+    for path, name, client in (("/report.pdf", "20 MB PDF", fetcher), ("/huge", "20 MB chunked", capped)):
+        url = base + path
+        start = time.perf_counter()
+        fetch_url(url)
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        try:
+            client.fetch_markup(url)
+        except requests.RequestException as e:
+            error = type(e).__name__
+        aborted = time.perf_counter() - start
+        print(f"{name:13s}: fetch_url {full * 1000:7.1f} ms, Fetcher {aborted * 1000:6.1f} ms ({error})")
+
+
+def main():
+    """Run the benchmark."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"page: {len(PAGE) / 1e6:.1f} MB of UTF-8")
+    try:
+        with Fetcher() as fetcher, Fetcher(max_bytes=1 << 20) as capped:
+            _decoding(base, fetcher)
+            _rejection(base, fetcher, capped)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark convert_many(executor='thread') against serial and process-pool conversion.
+
+lxml releases the GIL while it parses, so only that part of the pipeline
+can run in parallel threads. The benchmark times parsing on its own to get
+the parallel fraction, prints the speedup Amdahl's law allows for it next
+to the measured thread-pool speedup, and compares the proportional set size
+(PSS, Linux only) of the thread pool's process with the process pool's
+parent and workers together.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html2cleantext import convert_many, to_markdown
+from html2cleantext.batch import ConversionPool
+from html2cleantext.parsing import parse_html
+from fixtures import product_page
+
+
+def _pss_kib(pid: int) -> int:
+    """Return the proportional set size of a process in KiB, or 0 if unknown."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as rollup:
+            for line in rollup:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def main():
+    """Run the benchmark."""
+    documents = [product_page(sections=60, seed=seed) for seed in range(200)]
+    cpus = os.cpu_count() or 1
+    workers = max(2, min(cpus, 8))
+
+    to_markdown(documents[0])
+    start = time.perf_counter()
+    expected = [to_markdown(document) for document in documents]
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    for document in documents:
+        parse_html(document)
+    parallel_fraction = (time.perf_counter() - start) / serial
+    print(f"{cpus} CPUs, {len(documents)} documents; serial {len(documents) / serial:.1f} docs/s, "
+          f"lxml parsing {parallel_fraction:.0%} of the time")
+
+    for threads in sorted({2, workers}):
+        start = time.perf_counter()
+        outputs = [result.output for result in convert_many(documents, workers=threads, executor='thread')]
+        elapsed = time.perf_counter() - start
+        assert outputs == expected
+        bound = 1 / (1 - parallel_fraction + parallel_fraction / threads)
+        print(f"{threads} threads:   {len(documents) / elapsed:6.1f} docs/s ({serial / elapsed:.2f}x, "
+              f"Amdahl bound on {threads} CPUs {bound:.2f}x)")
+    thread_pss = _pss_kib(os.getpid())
+
+    with ConversionPool(workers=workers) as pool:
+        start = time.perf_counter()
+        outputs = [result.output for result in pool.convert_many(documents)]
+        elapsed = time.perf_counter() - start
+        assert outputs == expected
+        process_pss = _pss_kib(os.getpid()) + sum(_pss_kib(worker.pid) for worker in pool._pool._pool)
+    print(f"{workers} processes: {len(documents) / elapsed:6.1f} docs/s ({serial / elapsed:.2f}x)")
+
+    if thread_pss and process_pss:
+        print(f"memory (PSS): threads {thread_pss / 1024:.0f} MiB, "
+              f"processes {process_pss / 1024:.0f} MiB ({process_pss / thread_pss:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
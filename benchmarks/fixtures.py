@@ -0,0 +1,117 @@
+"""
+Synthetic HTML fixtures shared by the benchmark scripts.
+"""
+
+import random
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog market price offer shipping "
+    "quality product review customer service delivery"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + rng.choice([".", "!", "?", ""])
+
+
+def product_page(sections: int = 500, seed: int = 0) -> str:
+    """
+    Build a large e-commerce style page with navigation, product cards,
+    tables, lists and tracking attributes.
+
+    Args:
+        sections: Number of content blocks in the main article
+        seed: Random seed for reproducible output
+
+    Returns:
+        str: HTML document
+    """
+    rng = random.Random(seed)
+    parts = [
+        '<!DOCTYPE html><html lang="en"><head><title>Shop</title>',
+        '<style>.card{margin:0}</style><script>window.dataLayer=[];</script></head><body>',
+        '<nav class="navbar" id="nav"><ul>',
+    ]
+    parts.extend('<li><a href="/c/%d" data-track="nav-%d">Category %d</a></li>' % (i, i, i) for i in range(20))
+    parts.append('</ul></nav><main><article class="content">')
+    for i in range(sections):
+        kind = i % 6
+        if kind == 0:
+            parts.append('<h2 class="section-title">Section %d</h2>' % i)
+        elif kind == 1:
+            parts.append(
+                '<div class="card" data-sku="%d" data-pos="%d"><div class="inner">'
+                '<a href="/p/%d"><img src="/img/%d.jpg" alt="Product %d" data-lazy="1"></a>'
+                '<p class="name">Product %d</p><span class="price">ab 1.299,00 EUR *</span>'
+                '</div></div>' % (i, i, i, i, i, i)
+            )
+        elif kind == 2:
+            parts.append('<ul>%s</ul>' % ''.join(
+                '<li>%s <a href="https://shop.example.com/p/%d">link</a></li>' % (_sentence(rng, 5), j)
+                for j in range(4)))
+        elif kind == 3:
+            parts.append('<table><tr><th>Name</th><th>Price</th></tr>'
+                         '<tr><td>Item %d</td><td>12,99 €</td></tr></table>' % i)
+        elif kind == 4:
+            parts.append('<blockquote><p>%s</p></blockquote><pre>code %d\n  indented\n</pre>' % (_sentence(rng), i))
+        else:
+            parts.append('<p>%s <strong>%s</strong> <em>%s</em><br>%s</p>' % (
+                _sentence(rng), _sentence(rng, 3), _sentence(rng, 3), _sentence(rng, 20)))
+    parts.append('</article></main><footer id="footer"><p>Copyright</p></footer></body></html>')
+    return ''.join(parts)
+
+
+def nested_page(depth: int = 200, breadth: int = 3, seed: int = 0) -> str:
+    """
+    Build a page made of deeply nested div/section wrappers.
+
+    Args:
+        depth: Nesting depth of each wrapper chain
+        breadth: Number of wrapper chains
+        seed: Random seed for reproducible output
+
+    Returns:
+        str: HTML document
+    """
+    rng = random.Random(seed)
+    parts = ['<html><body>']
+    for _ in range(breadth):
+        for level in range(depth):
+            parts.append('<div><section>' if level % 2 else '<div>')
+            if level % 10 == 0:
+                parts.append('<span>%s</span>' % _sentence(rng, 3))
+        parts.append('<p>%s</p>' % _sentence(rng, 30))
+        for level in reversed(range(depth)):
+            parts.append('</section></div>' if level % 2 else '</div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def script_heavy_page(sections: int = 500, seed: int = 0) -> str:
+    """
+    Build a product page where most of the markup is scripts, styles,
+    inline SVG icons, comments and base64 data URIs.
+
+    Args:
+        sections: Number of content blocks in the main article
+        seed: Random seed for reproducible output
+
+    Returns:
+        str: HTML document
+    """
+    rng = random.Random(seed)
+    payload = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')
+                      for _ in range(2000))
+    script = '<script>window.__STATE__={"html":"<div>\\u003c/script>","items":[%s]};</script>' % ','.join(
+        str(i) for i in range(300))
+    icon = ('<svg viewBox="0 0 24 24" class="icon"><title>icon</title>'
+            '<path d="M12 2L2 7l10 5 10-5-10-5zm0 9l2.5-1.25L12 8.5l-2.5 1.25L12 11z"/></svg>')
+    parts = []
+    for part in product_page(sections, seed).split('</h2>'):
+        parts.append(part)
+        parts.append('</h2>%s<!-- tracking: %s -->%s<style>.x%d{color:red}</style>'
+                     '<img src="data:image/png;base64,%s" alt="badge">' % (
+                         script, _sentence(rng), icon, len(parts), payload))
+    parts.pop()
+    return ''.join(parts)
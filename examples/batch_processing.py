@@ -54,6 +54,31 @@ def process_html_files_in_directory(input_dir: str, output_dir: str, mode: str =
             print(f"❌ Error processing {html_file}: {e}")
 
 
+def convert_directory_in_parallel(input_dir: str, output_dir: str, mode: str = 'markdown'):
+    """
+    Convert all HTML files in a directory across worker processes.
+
+    Args:
+        input_dir: Directory containing HTML files
+        output_dir: Directory to save converted files
+        mode: Output mode ('markdown' or 'text')
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    html_files = sorted(glob.glob(os.path.join(input_dir, "*.html")) +
+                        glob.glob(os.path.join(input_dir, "*.htm")))
+    suffix = '.md' if mode == 'markdown' else '.txt'
+
+    # Results arrive as they complete; a failing file does not stop the batch
+    for result in html2cleantext.convert_many(html_files, mode=mode, ordered=False):
+        if not result.ok:
+            print(f"❌ Error processing {result.input}: {result.error}")
+            continue
+        output_file = os.path.join(output_dir, Path(result.input).stem + suffix)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(result.output)
+        print(f"✅ Processed: {result.input} -> {output_file}")
+
+
 def create_sample_files():
     """Create some sample HTML files for demonstration."""
     sample_files = {
@@ -134,11 +159,17 @@ def main():
     print("Processing to Text...")
     process_html_files_in_directory(input_dir, "output_text", mode='text')
     print()
+
+    # Process to Text using all CPU cores
+    print("Processing to Text in parallel...")
+    convert_directory_in_parallel(input_dir, "output_text_parallel", mode='text')
+    print()
     
     print("✅ Batch processing completed!")
     print(f"\\nCheck the output directories:")
     print(f"  - output_markdown/ (Markdown files)")
     print(f"  - output_text/ (Text files)")
+    print(f"  - output_text_parallel/ (Text files converted in parallel)")
     
     # Clean up sample files
     print("\\nCleaning up sample files...")
@@ -5,11 +5,14 @@ A Python package for extracting readable content from HTML sources with robust
 boilerplate removal, language-specific normalization, and flexible output formats.
 """
 
-from .core import to_markdown, to_text
+from .core import Converter, to_markdown, to_text
+from .batch import BatchResult, ConversionPool, convert_many
+from .aio import aconvert_many, ato_markdown, ato_text
 
 __version__ = "0.1.5"
 __author__ = "Md Al Mahmud Imran"
 __email__ = "md.almahmudimran@gmail.com"
 
 # Expose the main API functions
-__all__ = ["to_markdown", "to_text"]
+__all__ = ["Converter", "to_markdown", "to_text", "convert_many", "BatchResult", "ConversionPool",
+           "ato_markdown", "ato_text", "aconvert_many"]
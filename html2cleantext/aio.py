@@ -0,0 +1,193 @@
+"""
+Asyncio API for converting HTML, mainly from URLs.
+
+Fetches run concurrently: each runs the converter's Fetcher on a thread of
+a fetch pool, awaited from the event loop, so network waits overlap
+instead of adding up. Conversion is CPU-bound and runs in an executor, by default the
+event loop's thread pool; pass a ProcessPoolExecutor to convert on several
+cores while other pages are still downloading.
+
+With a ProcessPoolExecutor the converter is pickled into every conversion
+task, so its options must be picklable. A language_cache is rejected, since
+the processes could not share it. Fetches stay on threads of the calling
+process, so a fetcher keeps its pooled connections, but each task also
+unpickles an unused copy of it.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Optional, Union
+
+from .batch import BatchResult
+from .core import Converter, _get_html_content
+from .utils import is_file_path, is_url
+
+# Inputs fetched and converted at once by aconvert_many()
+DEFAULT_CONCURRENCY = 16
+# Inputs started or waiting to be yielded per unit of concurrency, so later
+# inputs keep downloading while an earlier one is slow in ordered mode
+PENDING_PER_SLOT = 2
+
+
+async def ato_markdown(html_input: Union[str, os.PathLike], executor: Optional[Executor] = None,
+                       **options) -> str:
+    """
+    Convert HTML to clean Markdown without blocking the event loop.
+
+    Args:
+        html_input: HTML string, file path, or URL
+        executor: Executor for the conversion (default: the event loop's default executor)
+        **options: Same options as to_markdown()
+
+    Returns:
+        str: Clean Markdown text
+
+    Raises:
+        ValueError: If an option is invalid, or a language_cache is given with a
+            ProcessPoolExecutor
+        FileNotFoundError: If file path doesn't exist
+        requests.RequestException: If URL fetching fails
+    """
+    _check_executor(executor, options)
+    return await _aconvert(Converter('markdown', **options), html_input, None, executor)
+
+
+async def ato_text(html_input: Union[str, os.PathLike], executor: Optional[Executor] = None,
+                   **options) -> str:
+    """
+    Convert HTML to clean plain text without blocking the event loop.
+
+    Args:
+        html_input: HTML string, file path, or URL
+        executor: Executor for the conversion (default: the event loop's default executor)
+        **options: Same options as to_text()
+
+    Returns:
+        str: Clean plain text
+
+    Raises:
+        ValueError: If an option is invalid, or a language_cache is given with a
+            ProcessPoolExecutor
+        FileNotFoundError: If file path doesn't exist
+        requests.RequestException: If URL fetching fails
+    """
+    _check_executor(executor, options)
+    return await _aconvert(Converter('text', **options), html_input, None, executor)
+
+
+def _check_executor(executor: Optional[Executor], options: dict) -> None:
+    """Reject options a process executor would have to pickle into every task but cannot share."""
+    if isinstance(executor, ProcessPoolExecutor) and options.get('language_cache') is not None:
+        raise ValueError("language_cache cannot be shared with a ProcessPoolExecutor; "
+                         "convert in threads or pass language instead")
+
+
+async def _aconvert(converter: Converter, html_input: Union[str, os.PathLike],
+                    fetch_executor: Optional[Executor], executor: Optional[Executor]) -> str:
+    """Read or fetch an input in fetch_executor, then convert it in executor."""
+    loop = asyncio.get_running_loop()
+    html_input_str = str(html_input)
+    base_url = html_input_str if is_url(html_input_str) else ""
+    if base_url or is_file_path(html_input_str):
+        html_content = await loop.run_in_executor(fetch_executor, _get_html_content, html_input,
+                                                  converter.fetcher)
+    else:
+        html_content = _get_html_content(html_input)
+    return await loop.run_in_executor(executor, converter.convert_html, html_content, base_url)
+
+
+def aconvert_many(
+    inputs: Iterable[Union[str, os.PathLike]],
+    mode: str = 'markdown',
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+    **options
+) -> AsyncIterator[BatchResult]:
+    """
+    Fetch and convert many inputs concurrently.
+
+    A semaphore lets at most concurrency inputs be fetched or converted at
+    a time, and at most PENDING_PER_SLOT times as many are started or
+    waiting to be yielded. Fetches run on a pool of concurrency threads,
+    and at most the fetcher's pool_connections_per_host of them reach one
+    host at once; conversions run in executor. A failing input does not
+    stop the batch: its result carries the error message instead of output.
+
+    Example:
+        >>> async for result in aconvert_many(urls, mode='text', concurrency=32):
+        ...     print(result.input, result.ok)
+
+    Args:
+        inputs: URLs, HTML strings, or file paths; read lazily
+        mode: 'markdown' or 'text' (default: 'markdown')
+        concurrency: Maximum number of inputs in flight (default: DEFAULT_CONCURRENCY)
+        ordered: Whether to yield results in input order; if False, results are
+            yielded as they complete (default: True)
+        executor: Executor for the conversions (default: the event loop's default
+            executor); a ProcessPoolExecutor converts on several cores, with the
+            converter and its options pickled into every task
+        **options: Converter options, such as keep_links, language or fetcher. With a
+            ProcessPoolExecutor they must be picklable and language_cache is not allowed.
+
+    Returns:
+        async iterator: BatchResult with the index, input, output and error of each input
+
+    Raises:
+        ValueError: If mode, concurrency or an option is invalid, or a language_cache
+            is given with a ProcessPoolExecutor
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1: {concurrency}")
+    _check_executor(executor, options)
+    converter = Converter(mode, **options)
+    return _aconvert_many(inputs, converter, concurrency, ordered, executor)
+
+
+async def _aconvert_many(inputs: Iterable, converter: Converter, concurrency: int, ordered: bool,
+                         executor: Optional[Executor]) -> AsyncIterator[BatchResult]:
+    """Run bounded conversion tasks and yield their results."""
+    semaphore = asyncio.Semaphore(concurrency)
+    fetch_executor = ThreadPoolExecutor(concurrency, thread_name_prefix='html2cleantext-fetch')
+    max_pending = concurrency * PENDING_PER_SLOT
+    pending = []
+    try:
+        for index, html_input in enumerate(inputs):
+            pending.append(asyncio.ensure_future(
+                _aconvert_item(converter, index, html_input, semaphore, fetch_executor, executor)))
+            if len(pending) >= max_pending:
+                for result in await _next_async_results(pending, ordered):
+                    yield result
+        while pending:
+            for result in await _next_async_results(pending, ordered):
+                yield result
+    finally:
+        # Stop in-flight inputs if the caller stops iterating early
+        for task in pending:
+            task.cancel()
+        fetch_executor.shutdown(wait=False)
+
+
+async def _next_async_results(pending: list, ordered: bool) -> list:
+    """Remove the oldest pending task, or every finished one if not ordered, and return its results."""
+    if ordered:
+        result = await pending[0]
+        pending.pop(0)
+        return [result]
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    for task in done:
+        pending.remove(task)
+    return sorted((task.result() for task in done), key=lambda result: result.index)
+
+
+async def _aconvert_item(converter: Converter, index: int, html_input: Union[str, os.PathLike],
+                         semaphore: asyncio.Semaphore, fetch_executor: Executor,
+                         executor: Optional[Executor]) -> BatchResult:
+    """Convert one input of a batch once the semaphore admits it, capturing its error."""
+    try:
+        async with semaphore:
+            output = await _aconvert(converter, html_input, fetch_executor, executor)
+    except Exception as e:
+        return BatchResult(index, html_input, None, f"{type(e).__name__}: {e}")
+    return BatchResult(index, html_input, output, None)
@@ -0,0 +1,539 @@
+"""
+Batch conversion of many HTML documents across worker processes or threads.
+"""
+
+import os
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import count, islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .core import Converter
+from .utils import detect_language
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python 3.7
+    shared_memory = None
+
+logger = logging.getLogger(__name__)
+
+# Chunks submitted to the pool per worker before waiting for results, which
+# bounds memory when converting long input iterables
+PENDING_CHUNKS_PER_WORKER = 4
+# HTML strings at least this long are sent to workers through shared memory
+# instead of being pickled into the task
+SHARED_MEMORY_THRESHOLD = 1 << 16
+# Seconds between checks for worker processes that exited while converting a
+# chunk, and seconds a dead worker's last result is given to arrive
+WORKER_CHECK_INTERVAL = 0.5
+WORKER_EXIT_GRACE = 1.0
+EXECUTORS = ('process', 'thread')
+
+_WARM_UP_HTML = (
+    "<html><head><title>Warm up</title></head><body><nav><a href='/'>Home</a></nav>"
+    "<article><h1>Warm up</h1><p>This page loads the parser, the cleaners and the renderers "
+    "before the first document arrives.</p><img src='/a.png' alt='A'></article></body></html>"
+)
+
+
+class BatchResult(NamedTuple):
+    """Outcome of converting one input of a batch."""
+
+    index: int
+    input: Union[str, os.PathLike]
+    output: Optional[str]
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the input was converted without an error."""
+        return self.error is None
+
+
+class PoolStats(NamedTuple):
+    """Task, worker and payload transfer counts of a ConversionPool."""
+
+    tasks: int
+    documents: int
+    workers_started: int
+    workers_recycled: int
+    shared_payloads: int
+    shared_bytes: int
+    pickled_payloads: int
+
+
+class _SharedPayload(NamedTuple):
+    """Reference to an HTML string a worker reads from a shared memory block."""
+
+    name: str
+    size: int
+
+
+# Converter of the current worker process, built once by _init_worker(), the
+# number of tasks the worker has run and the queue it announces each job on
+_worker_converter: Optional[Converter] = None
+_worker_tasks = 0
+_worker_started = None
+
+
+def _init_worker(mode: str, options: dict, started) -> None:
+    """Build and warm up the converter a worker process uses for all of its tasks."""
+    global _worker_converter, _worker_started
+    _worker_converter = Converter(mode, **options)
+    _worker_started = started
+    _warm_up(_worker_converter, options)
+
+
+def _warm_up(converter: Converter, options: dict) -> None:
+    """Import, compile and load everything a conversion with these options needs."""
+    try:
+        converter.convert(_WARM_UP_HTML)
+        if options.get('language') is None and options.get('normalize_lang', True):
+            # ASCII text skips detection, so load the language profiles explicitly
+            detect_language("Chargement des profils de langue avant le premier document.",
+                            detector=options.get('language_detector'))
+    except Exception as e:
+        logger.warning(f"Worker warm-up failed: {e}")
+
+
+def _convert_items(items: List[Tuple[int, Any]], converter: Converter) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Convert (index, input) pairs, returning the output and error message of each."""
+    results = []
+    for index, html_input in items:
+        try:
+            if isinstance(html_input, _SharedPayload):
+                html_input = _read_shared(html_input)
+            results.append((converter.convert(html_input), None))
+        except Exception as e:
+            logger.warning(f"Conversion of input {index} failed: {e}")
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _run_task(job_id: int, items: List[Tuple[int, Any]]) -> Tuple[int, int, List[Tuple[Optional[str], Optional[str]]]]:
+    """Convert a chunk in a worker process and return the worker's pid and task count with the results."""
+    global _worker_tasks
+    _worker_tasks += 1
+    pid = os.getpid()
+    # Tells the parent which chunk is lost if this process dies converting it
+    _worker_started.put((pid, job_id))
+    return pid, _worker_tasks, _convert_items(items, _worker_converter)
+
+
+def _read_shared(payload: _SharedPayload) -> str:
+    """Decode an HTML string from its shared memory block."""
+    block = shared_memory.SharedMemory(payload.name)
+    try:
+        return bytes(block.buf[:payload.size]).decode('utf-8', 'surrogatepass')
+    finally:
+        block.close()
+
+
+def _release(blocks: list) -> None:
+    """Close and remove shared memory blocks."""
+    for block in blocks:
+        block.close()
+        block.unlink()
+    blocks.clear()
+
+
+def _job_done(finished: queue.Queue, job_id: int, _result: Any) -> None:
+    """Pool callback recording that a job finished, with a result or an error."""
+    finished.put(job_id)
+
+
+def _chunks(inputs: Iterable, chunksize: int) -> Iterator[List[Tuple[int, Any]]]:
+    """Split inputs into lists of up to chunksize (index, input) pairs."""
+    iterator = enumerate(inputs)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ConversionPool:
+    """
+    Pool of warm worker processes for converting batches of HTML.
+
+    Each worker builds one Converter and warms it up when it starts:
+    modules are imported, patterns compiled and langdetect profiles loaded
+    before the first document. With the fork start method the parent warms
+    up first, so new and recycled workers inherit the loaded state.
+
+    HTML strings of at least shared_memory_threshold characters reach the
+    workers through multiprocessing.shared_memory blocks instead of being
+    pickled into the task, and results carry only the output, not the
+    input. Workers are replaced after max_tasks_per_worker tasks, which
+    bounds memory growth from lxml and other long-lived caches. A worker
+    that dies while converting, from a crash in lxml or being killed, is
+    replaced too, and each input of its chunk gets an error result.
+
+    The pool can convert several batches; close it when done, or use it as
+    a context manager.
+
+    Example:
+        >>> with ConversionPool('text', workers=4, max_tasks_per_worker=200) as pool:
+        ...     for result in pool.convert_many(pages, chunksize=8):
+        ...         print(result.index, result.ok)
+        ...     print(pool.stats())
+    """
+
+    def __init__(self, mode: str = 'markdown', workers: Optional[int] = None,
+                 max_tasks_per_worker: Optional[int] = None,
+                 shared_memory_threshold: Optional[int] = SHARED_MEMORY_THRESHOLD, **options):
+        """
+        Args:
+            mode: 'markdown' or 'text' (default: 'markdown')
+            workers: Number of worker processes (default: os.cpu_count())
+            max_tasks_per_worker: Tasks (chunks) a worker runs before it is replaced
+                (default: None, never replace)
+            shared_memory_threshold: Length from which HTML strings are passed through
+                shared memory; None pickles every input (default: SHARED_MEMORY_THRESHOLD)
+            **options: Converter options. They are sent to every worker process, so
+                they must be picklable.
+
+        Raises:
+            ValueError: If mode, workers, max_tasks_per_worker or an option is invalid
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1: {workers}")
+        if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+            raise ValueError(f"max_tasks_per_worker must be at least 1: {max_tasks_per_worker}")
+        # Validate the options in the calling process rather than in every worker
+        converter = Converter(mode, **options)
+
+        self.mode = mode
+        self.workers = workers
+        self.max_tasks_per_worker = max_tasks_per_worker
+        # Shared memory needs Python 3.8
+        self.shared_memory_threshold = shared_memory_threshold if shared_memory is not None else None
+        self._tasks = 0
+        self._documents = 0
+        self._pids = set()
+        self._recycled = 0
+        self._job_ids = count()
+        # Submitted jobs whose results were not collected, the job each worker
+        # started last, and error messages of jobs lost with their worker
+        self._jobs: Dict[int, Any] = {}
+        self._running: Dict[int, int] = {}
+        self._lost: Dict[int, str] = {}
+        self._shared_payloads = 0
+        self._shared_bytes = 0
+        self._pickled_payloads = 0
+
+        context = multiprocessing.get_context()
+        if context.get_start_method() == 'fork':
+            _warm_up(converter, options)
+        if self.shared_memory_threshold is not None:
+            # Workers share the parent's resource tracker instead of starting
+            # their own, which would remove the blocks they read when they exit
+            resource_tracker.ensure_running()
+        self._started = context.SimpleQueue()
+        self._pool = context.Pool(workers, initializer=_init_worker, initargs=(mode, options, self._started),
+                                  maxtasksperchild=max_tasks_per_worker)
+
+    def convert_many(self, inputs: Iterable[Union[str, os.PathLike]], chunksize: int = 1,
+                     ordered: bool = True) -> Iterator[BatchResult]:
+        """
+        Convert many HTML inputs on the pool's workers.
+
+        A failing input does not stop the batch: its result carries the
+        error message instead of output. If iteration stops early, chunks
+        already submitted still run before those of the next batch.
+
+        Args:
+            inputs: HTML strings, file paths, or URLs; read lazily
+            chunksize: Number of inputs sent to a worker per task (default: 1)
+            ordered: Whether to yield results in input order; if False, results
+                are yielded as they complete (default: True)
+
+        Returns:
+            iterator: BatchResult with the index, input, output and error of each input
+
+        Raises:
+            ValueError: If chunksize is less than 1
+        """
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be at least 1: {chunksize}")
+        return self._run(_chunks(inputs, chunksize), ordered)
+
+    def _run(self, chunks: Iterator[List[Tuple[int, Any]]], ordered: bool) -> Iterator[BatchResult]:
+        """Submit chunks with a bounded number in flight and yield their results."""
+        max_pending = self.workers * PENDING_CHUNKS_PER_WORKER
+        # Ids of finished jobs, in completion order
+        finished = queue.Queue()
+        pending: Dict[int, tuple] = {}
+        try:
+            for chunk in chunks:
+                job_id = next(self._job_ids)
+                items, blocks = self._payloads(chunk)
+                done = partial(_job_done, finished, job_id)
+                try:
+                    job = self._pool.apply_async(_run_task, (job_id, items), callback=done, error_callback=done)
+                except BaseException:
+                    _release(blocks)
+                    raise
+                self._jobs[job_id] = job
+                pending[job_id] = (job, chunk, blocks)
+                if len(pending) >= max_pending:
+                    yield from self._next_results(pending, finished, ordered)
+            while pending:
+                yield from self._next_results(pending, finished, ordered)
+        finally:
+            for _, _, blocks in pending.values():
+                _release(blocks)
+
+    def _next_results(self, pending: Dict[int, tuple], finished: queue.Queue,
+                      ordered: bool) -> Iterator[BatchResult]:
+        """Wait for the oldest pending chunk, or the next to finish if not ordered, and yield its results."""
+        # Workers block once the pipe their job announcements go through is full
+        self._read_started()
+        if ordered:
+            job_id = next(iter(pending))
+            job = pending[job_id][0]
+            while not job.ready() and job_id not in self._lost:
+                job.wait(WORKER_CHECK_INTERVAL)
+                self._check_workers()
+        else:
+            job_id = None
+            while job_id is None:
+                try:
+                    job_id = finished.get(timeout=WORKER_CHECK_INTERVAL)
+                except queue.Empty:
+                    self._check_workers()
+                    job_id = next((lost for lost in self._lost if lost in pending), None)
+        job, chunk, blocks = pending.pop(job_id)
+        del self._jobs[job_id]
+        try:
+            if job_id in self._lost:
+                results = [(None, self._lost.pop(job_id))] * len(chunk)
+            else:
+                pid, worker_tasks, results = job.get()
+                self._pids.add(pid)
+                # The pool replaces a worker once it has run max_tasks_per_worker tasks
+                if worker_tasks == self.max_tasks_per_worker:
+                    self._recycled += 1
+        finally:
+            _release(blocks)
+        self._tasks += 1
+        self._documents += len(chunk)
+        for (index, html_input), (output, error) in zip(chunk, results):
+            yield BatchResult(index, html_input, output, error)
+
+    def _read_started(self) -> None:
+        """Note the job each worker process announced it started last."""
+        while not self._started.empty():
+            pid, job_id = self._started.get()
+            self._running[pid] = job_id
+
+    def _check_workers(self) -> None:
+        """Record the jobs of worker processes that exited without returning their results."""
+        self._read_started()
+        alive = {process.pid for process in multiprocessing.active_children()}
+        for pid, job_id in list(self._running.items()):
+            if pid in alive:
+                continue
+            del self._running[pid]
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            # A recycled worker exits right after sending its last result
+            job.wait(WORKER_EXIT_GRACE)
+            if job.ready():
+                continue
+            logger.warning(f"Worker process {pid} exited while converting chunk {job_id}")
+            self._lost[job_id] = f"WorkerExited: worker process {pid} exited while converting this input"
+            # The pool never finishes a lost job, and would wait for it when closed
+            self._pool._cache.pop(job._job, None)
+
+    def _payloads(self, chunk: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, Any]], list]:
+        """Move the long HTML strings of a chunk into shared memory blocks."""
+        threshold = self.shared_memory_threshold
+        items = []
+        blocks = []
+        try:
+            for index, html_input in chunk:
+                if threshold is not None and isinstance(html_input, str) and len(html_input) >= threshold:
+                    # Lone surrogates reach the worker as they would pickled, so
+                    # their conversion fails there and only for that input
+                    data = html_input.encode('utf-8', 'surrogatepass')
+                    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+                    blocks.append(block)
+                    block.buf[:len(data)] = data
+                    items.append((index, _SharedPayload(block.name, len(data))))
+                    self._shared_payloads += 1
+                    self._shared_bytes += len(data)
+                else:
+                    items.append((index, html_input))
+                    self._pickled_payloads += 1
+        except BaseException:
+            _release(blocks)
+            raise
+        return items, blocks
+
+    def stats(self) -> PoolStats:
+        """
+        Report task, worker and payload transfer counts.
+
+        Counts cover the tasks whose results were collected.
+
+        Returns:
+            PoolStats: tasks and documents converted, worker processes that ran
+            tasks, workers that reached max_tasks_per_worker and were replaced,
+            inputs passed through shared memory and their size, and inputs
+            pickled into tasks
+        """
+        return PoolStats(self._tasks, self._documents, len(self._pids), self._recycled,
+                         self._shared_payloads, self._shared_bytes, self._pickled_payloads)
+
+    def close(self) -> None:
+        """Wait for submitted tasks to finish and stop the workers."""
+        self._pool.close()
+        # Batches stopped early leave jobs behind, whose workers may still die
+        for job_id, job in self._jobs.items():
+            while not job.ready() and job_id not in self._lost:
+                job.wait(WORKER_CHECK_INTERVAL)
+                self._check_workers()
+        self._jobs.clear()
+        self._lost.clear()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        """Stop the workers immediately, abandoning submitted tasks."""
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self) -> 'ConversionPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+
+def convert_many(
+    inputs: Iterable[Union[str, os.PathLike]],
+    mode: str = 'markdown',
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    max_tasks_per_worker: Optional[int] = None,
+    executor: str = 'process',
+    **options
+) -> Iterator[BatchResult]:
+    """
+    Convert many HTML inputs to Markdown or plain text in parallel.
+
+    With the process executor, runs a ConversionPool for the duration of
+    the batch, started when the first result is requested: each worker
+    process builds and warms up one Converter with the given options and
+    converts chunks of inputs with it. A worker that dies while converting
+    is replaced, and each input of its chunk gets an error result. The thread
+    executor converts chunks with one shared Converter on a thread pool;
+    lxml releases the GIL while parsing, and options such as a
+    HostLanguageCache need not be picklable. A failing input does not stop
+    the batch: its result carries the error message instead of output.
+
+    Example:
+        >>> for result in convert_many(paths, mode='text', workers=4):
+        ...     if result.ok:
+        ...         print(result.input, len(result.output))
+
+    Args:
+        inputs: HTML strings, file paths, or URLs; read lazily
+        mode: 'markdown' or 'text' (default: 'markdown')
+        workers: Number of worker processes or threads (default: os.cpu_count());
+            1 converts in the calling thread
+        chunksize: Number of inputs sent to a worker per task; larger chunks
+            lower the per-task overhead for small documents (default: 1)
+        ordered: Whether to yield results in input order; if False, results are
+            yielded as they complete (default: True)
+        max_tasks_per_worker: Tasks (chunks) a worker process runs before it is
+            replaced; ignored by the thread executor (default: None, never replace)
+        executor: 'process' or 'thread' (default: 'process')
+        **options: Converter options, such as keep_links or language. With the
+            process executor they are sent to every worker, so they must be picklable.
+
+    Returns:
+        iterator: BatchResult with the index, input, output and error of each input
+
+    Raises:
+        ValueError: If mode, workers, chunksize, executor or an option is invalid
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1: {workers}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1: {chunksize}")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
+    if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+        raise ValueError(f"max_tasks_per_worker must be at least 1: {max_tasks_per_worker}")
+    converter = Converter(mode, **options)
+    if workers > 1 and executor == 'process':
+        return _convert_in_pool(mode, workers, max_tasks_per_worker, options, inputs, chunksize, ordered)
+
+    chunks = _chunks(inputs, chunksize)
+    if workers == 1:
+        return (BatchResult(index, html_input, output, error)
+                for chunk in chunks
+                for (index, html_input), (output, error) in zip(chunk, _convert_items(chunk, converter)))
+    return _convert_in_threads(chunks, converter, options, workers, ordered)
+
+
+def _convert_in_pool(mode: str, workers: int, max_tasks_per_worker: Optional[int], options: dict,
+                     inputs: Iterable, chunksize: int, ordered: bool) -> Iterator[BatchResult]:
+    """Convert a batch on a pool started on the first read, and stop its workers afterwards."""
+    pool = ConversionPool(mode, workers, max_tasks_per_worker, **options)
+    completed = False
+    try:
+        yield from pool.convert_many(inputs, chunksize, ordered)
+        completed = True
+    finally:
+        if completed:
+            pool.close()
+        else:
+            pool.terminate()
+
+
+def _convert_in_threads(chunks: Iterator[List[Tuple[int, Any]]], converter: Converter, options: dict,
+                        workers: int, ordered: bool) -> Iterator[BatchResult]:
+    """Convert chunks with one shared converter on a thread pool."""
+    # Load the language profiles before the threads need them
+    _warm_up(converter, options)
+    max_pending = workers * PENDING_CHUNKS_PER_WORKER
+    pending = {}
+    with ThreadPoolExecutor(workers, thread_name_prefix='html2cleantext') as executor:
+        try:
+            for chunk in chunks:
+                pending[executor.submit(_convert_items, chunk, converter)] = chunk
+                if len(pending) >= max_pending:
+                    yield from _next_thread_results(pending, ordered)
+            while pending:
+                yield from _next_thread_results(pending, ordered)
+        finally:
+            # Stop queued chunks if the caller stops iterating early
+            for future in pending:
+                future.cancel()
+
+
+def _next_thread_results(pending: dict, ordered: bool) -> Iterator[BatchResult]:
+    """Remove the oldest pending chunk, or every finished one if not ordered, and yield its results."""
+    if ordered:
+        done = [next(iter(pending))]
+    else:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        chunk = pending.pop(future)
+        for (index, html_input), (output, error) in zip(chunk, future.result()):
+            yield BatchResult(index, html_input, output, error)
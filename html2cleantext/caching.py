@@ -0,0 +1,254 @@
+"""
+Persistent HTTP cache for fetched pages.
+
+A FetchCache keeps response bodies with their ETag and Last-Modified
+validators in a SQLite database. A Fetcher given the cache sends them back
+as If-None-Match and If-Modified-Since, so an unchanged page costs a 304
+response instead of a download. The database is bounded by size, evicting
+the least recently used pages, and can be shared by several processes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Mapping, NamedTuple, Optional, Union
+
+# Total size of cached bodies, in bytes
+CACHE_MAX_BYTES = 256 << 20
+# File name used when the cache path is a directory
+CACHE_FILE_NAME = 'fetch_cache.sqlite3'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    charset TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL);
+INSERT OR IGNORE INTO totals VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+    BEGIN UPDATE totals SET size = size + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+    BEGIN UPDATE totals SET size = size - OLD.size; END;
+'''
+
+
+class CachedResponse(NamedTuple):
+    """A cached response body with its validators."""
+    body: bytes
+    charset: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored: float
+
+
+class FetchCacheInfo(NamedTuple):
+    """Lookup counts and size of a FetchCache."""
+    hits: int
+    revalidations: int
+    misses: int
+    entries: int
+    size: int
+
+
+class FetchCache:
+    """
+    Size-bounded SQLite cache of fetched pages, revalidated with their validators.
+
+    Pages are keyed by URL. A page younger than max_age seconds is served
+    without a request (a hit); an older one is requested conditionally and
+    served from the cache on a 304 response (a revalidation). Every full
+    download counts as a miss and is stored if it has a validator, or
+    max_age is set, and the response does not forbid it with
+    ``Cache-Control: no-store``. Safe to share between threads; pickling a
+    FetchCache keeps its path and settings but not its counts.
+
+    Example:
+        >>> cache = FetchCache("~/.cache/html2cleantext")
+        >>> converter = Converter('text', fetcher=Fetcher(cache=cache))
+        >>> text = converter.convert("https://example.com/")
+        >>> cache.cache_info()
+        FetchCacheInfo(hits=0, revalidations=0, misses=1, entries=1, size=1256)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], max_bytes: int = CACHE_MAX_BYTES, max_age: float = 0):
+        """
+        Args:
+            path: SQLite database file, created if missing, or a directory to
+                keep CACHE_FILE_NAME in
+            max_bytes: Total size of cached bodies; the least recently used pages
+                are evicted beyond it (default: CACHE_MAX_BYTES)
+            max_age: Seconds a stored page is served without revalidating it
+                (default: 0, revalidate every time)
+
+        Raises:
+            ValueError: If max_bytes or max_age is invalid
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1: {max_bytes}")
+        if max_age < 0:
+            raise ValueError(f"max_age must not be negative: {max_age}")
+        path = os.path.expanduser(os.fspath(path))
+        if os.path.isdir(path):
+            path = os.path.join(path, CACHE_FILE_NAME)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._revalidations = 0
+        self._misses = 0
+        self._db = None
+        self._pid = None
+        with self._lock:
+            self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's database connection, opening it if needed; call with the lock held."""
+        if self._pid != os.getpid():
+            # A forked process opens its own connection
+            self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._db
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """
+        Return the cached response for a URL, counting a hit if it is fresh.
+
+        Args:
+            url: The URL to look up
+
+        Returns:
+            CachedResponse or None: The stored response, if any
+        """
+        with self._lock:
+            db = self._connection()
+            row = db.execute('SELECT body, charset, etag, last_modified, stored FROM entries WHERE url = ?',
+                             (url,)).fetchone()
+            if row is None:
+                return None
+            db.execute('UPDATE entries SET accessed = ? WHERE url = ?', (time.time(), url))
+            entry = CachedResponse(*row)
+            if self.is_fresh(entry):
+                self._hits += 1
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Return whether a cached response can be served without revalidating it."""
+        return time.time() - entry.stored < self.max_age
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> dict:
+        """Return the If-None-Match and If-Modified-Since headers revalidating a cached response."""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self, url: str, entry: CachedResponse, headers: Mapping[str, str]) -> None:
+        """
+        Record a 304 response for a cached URL, refreshing its age and validators.
+
+        Args:
+            url: The revalidated URL
+            entry: Its cached response
+            headers: Headers of the 304 response
+        """
+        now = time.time()
+        with self._lock:
+            self._revalidations += 1
+            self._connection().execute(
+                'UPDATE entries SET etag = ?, last_modified = ?, stored = ?, accessed = ? WHERE url = ?',
+                (headers.get('ETag', entry.etag), headers.get('Last-Modified', entry.last_modified),
+                 now, now, url))
+
+    def update(self, url: str, body: bytes, charset: Optional[str], headers: Mapping[str, str]) -> None:
+        """
+        Record a full download, storing it if the response allows it.
+
+        Args:
+            url: The downloaded URL
+            body: The response body
+            charset: The charset of its Content-Type header, or None
+            headers: The response headers
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        storable = ((etag or last_modified or self.max_age) and len(body) <= self.max_bytes
+                    and 'no-store' not in headers.get('Cache-Control', '').lower())
+        now = time.time()
+        with self._lock:
+            self._misses += 1
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.execute('DELETE FROM entries WHERE url = ?', (url,))
+                if storable:
+                    db.execute('INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                               (url, body, charset, etag, last_modified, len(body), now, now))
+                    self._evict(db)
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Delete the least recently used pages until the cache fits in max_bytes."""
+        excess = db.execute('SELECT size FROM totals').fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        rows = db.execute('SELECT url, size FROM entries ORDER BY accessed')
+        for url, size in rows:
+            evicted.append((url,))
+            excess -= size
+            if excess <= 0:
+                break
+        rows.close()
+        db.executemany('DELETE FROM entries WHERE url = ?', evicted)
+
+    def cache_info(self) -> FetchCacheInfo:
+        """
+        Report lookup counts and the current size of the cache.
+
+        Returns:
+            FetchCacheInfo: Hits served without a request, revalidations served
+            from a 304 response, misses downloaded in full, and the number and
+            total size of stored pages
+        """
+        with self._lock:
+            db = self._connection()
+            entries = db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            size = db.execute('SELECT size FROM totals').fetchone()[0]
+            return FetchCacheInfo(self._hits, self._revalidations, self._misses, entries, size)
+
+    def clear(self) -> None:
+        """Delete every stored page."""
+        with self._lock:
+            self._connection().execute('DELETE FROM entries')
+
+    def close(self) -> None:
+        """Close the database connection; it is reopened on the next use."""
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
+            self._pid = None
+
+    def __getstate__(self) -> dict:
+        return {'path': self.path, 'max_bytes': self.max_bytes, 'max_age': self.max_age}
+
+    def __setstate__(self, settings: dict) -> None:
+        self.__init__(**settings)
@@ -4,22 +4,77 @@ HTML cleaning and language normalization functions.
 
 import re
 import logging
-from bs4 import BeautifulSoup, Tag
+import threading
+from functools import lru_cache
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup, Tag, NavigableString, CData
+from bs4.element import AttributeValueWithCharsetSubstitution
 from readability import Document
-from typing import Optional
-from .utils import detect_language
+from typing import Callable, Dict, Iterable, List, Optional
+from .parsing import soup_from_tree
+from .utils import (
+    detect_paragraph_languages, detect_script_language, protect_items, restore_items, LanguageDetector
+)
 
 logger = logging.getLogger(__name__)
 
 CURRENCY_SYMBOLS_AND_CODES = [
     # Common currency symbols
-    "€", "$", "£", "¥", "₹", "₽", "₩", "₺", "₫", "฿", "₴", "₦", "₲", "₡", "₵", "₸", "₭", "₠", "₢", "₳", "₥", "₧", "₯", "₰", "₱", "₲", "₳", "₴", "₵", "₸", "₺", "₼", "₾", "₿", "៛", "₪", "₠", "₡", "₢", "₣", "₤", "₥", "₦", "₧", "₨", "₩", "₪", "₫", "₭", "₮", "₯", "₰", "₱", "₲", "₳", "₴", "₵", "₸", "₺", "₼", "₾", "₿", "৳", "¤",
+    "€", "$", "£", "¥", "₹", "₽", "₩", "₺", "₫", "฿", "₴", "₦", "₲", "₡", "₵", "₸", "₭", "₠", "₢", "₳", "₥", "₧", "₯", "₰", "₱", "₼", "₾", "₿", "៛", "₪", "₣", "₤", "₨", "₮", "৳", "¤",
     # ISO 4217 currency codes
     "AED", "AFN", "ALL", "AMD", "ANG", "AOA", "ARS", "AUD", "AWG", "AZN", "BAM", "BBD", "BDT", "BGN", "BHD", "BIF", "BMD", "BND", "BOB", "BRL", "BSD", "BTN", "BWP", "BYN", "BZD", "CAD", "CDF", "CHF", "CLP", "CNY", "COP", "CRC", "CUC", "CUP", "CVE", "CZK", "DJF", "DKK", "DOP", "DZD", "EGP", "ERN", "ETB", "EUR", "FJD", "FKP", "GBP", "GEL", "GGP", "GHS", "GIP", "GMD", "GNF", "GTQ", "GYD", "HKD", "HNL", "HRK", "HTG", "HUF", "IDR", "ILS", "IMP", "INR", "IQD", "IRR", "ISK", "JMD", "JOD", "JPY", "KES", "KGS", "KHR", "KMF", "KPW", "KRW", "KWD", "KYD", "KZT", "LAK", "LBP", "LKR", "LRD", "LSL", "LYD", "MAD", "MDL", "MGA", "MKD", "MMK", "MNT", "MOP", "MRU", "MUR", "MVR", "MWK", "MXN", "MYR", "MZN", "NAD", "NGN", "NIO", "NOK", "NPR", "NZD", "OMR", "PAB", "PEN", "PGK", "PHP", "PKR", "PLN", "PYG", "QAR", "RON", "RSD", "RUB", "RWF", "SAR", "SBD", "SCR", "SDG", "SEK", "SGD", "SHP", "SLL", "SOS", "SPL", "SRD", "STN", "SVC", "SYP", "SZL", "THB", "TJS", "TMT", "TND", "TOP", "TRY", "TTD", "TVD", "TWD", "TZS", "UAH", "UGX", "USD", "UYU", "UZS", "VEF", "VES", "VND", "VUV", "WST", "XAF", "XAG", "XAU", "XCD", "XDR", "XOF", "XPD", "XPF", "XPT", "YER", "ZAR", "ZMW", "ZWD"
     # Add more as needed
 ]
 currency_regex = "|".join([re.escape(c) for c in CURRENCY_SYMBOLS_AND_CODES])
 
+# German-style prices ("1.299,00 €", "ab 12,99 EUR *", "Statt: 15,00") that mark product card lines
+_PRICE_RE = re.compile(
+    rf"(\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?|ab\s?\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?|Statt:\s?\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?)"
+)
+
+# Language normalization patterns
+_BENGALI_DANDA_RE = re.compile(r'[\u0964\u0965]+')
+# Per-paragraph normalization splits after line breaks and sentence ends
+_SEGMENT_END_RE = re.compile(r'(?<=[\n.!?\u0964\u0965])')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_SPACES_RE = re.compile(r'[ \t]+')
+# Sentence spacing, as in utils.format_readable_text()
+_MISSING_SPACE_RE = re.compile(r'([.?!])(\w)')
+_SPACE_RUNS_RE = re.compile(r' +')
+_WHITESPACE_RE = re.compile(r'\s+')
+_BACKGROUND_IMAGE_RE = re.compile(r'background-image\s*:\s*url\s*\(\s*["\']?([^"\')\s]+)["\']?\s*\)', re.IGNORECASE)
+
+# Attributes to keep for semantic meaning
+KEEP_ATTRIBUTES = ['href', 'src', 'alt', 'title', 'colspan', 'rowspan']
+
+# Boilerplate removed by manual cleaning. Supports tag names, .class, #id and
+# [attribute=value] selectors, which are matched together in one traversal;
+# other CSS selectors fall back to a separate soup.select() each.
+BOILERPLATE_SELECTORS = [
+    'nav', 'header', 'footer', 'aside', 'sidebar',
+    '.nav', '.navigation', '.navbar', '.menu',
+    '.header', '.footer', '.sidebar', '.aside',
+    '.advertisement', '.ads', '.ad', '.banner',
+    '.social', '.share', '.sharing',
+    '.comments', '.comment-section',
+    '.breadcrumb', '.breadcrumbs',
+    '#nav', '#navigation', '#navbar', '#menu',
+    '#header', '#footer', '#sidebar', '#aside',
+    '#advertisement', '#ads', '#ad', '#banner',
+    '#social', '#share', '#sharing',
+    '#comments', '#comment-section',
+    '#breadcrumb', '#breadcrumbs',
+    '[role=navigation]', '[role=banner]', '[role=contentinfo]', '[role=complementary]',
+    'script', 'style', 'noscript',
+]
+
+# Containers checked by the text-to-HTML ratio filter
+LOW_CONTENT_TAGS = ['div', 'section', 'article']
+
+# String types counted by Tag.get_text()
+_TEXT_STRING_TYPES = (NavigableString, CData)
+
 
 def remove_links(soup: BeautifulSoup) -> BeautifulSoup:
     """
@@ -68,13 +123,15 @@ def remove_images(soup: BeautifulSoup) -> BeautifulSoup:
     return soup
 
 
-def strip_boilerplate(soup: BeautifulSoup, use_readability: bool = True) -> BeautifulSoup:
+def strip_boilerplate(soup: BeautifulSoup, use_readability: bool = True,
+                      selectors: Optional[Iterable[str]] = None) -> BeautifulSoup:
     """
     Remove boilerplate content like navigation, footers, sidebars, and ads.
     
     Args:
         soup (BeautifulSoup): Parsed HTML document
         use_readability (bool): Whether to use readability-lxml for content extraction
+        selectors (list, optional): Selectors for manual cleaning. Defaults to BOILERPLATE_SELECTORS.
 
     Returns:
         BeautifulSoup: Modified soup with boilerplate removed
@@ -88,83 +145,285 @@ def strip_boilerplate(soup: BeautifulSoup, use_readability: bool = True) -> Beau
             soup = BeautifulSoup(clean_html, 'lxml')
         except Exception as e:
             logger.warning(f"Readability extraction failed, using manual cleaning: {e}")
-            soup = _manual_boilerplate_removal(soup)
+            soup = _manual_boilerplate_removal(soup, selectors)
     else:
-        soup = _manual_boilerplate_removal(soup)
+        soup = _manual_boilerplate_removal(soup, selectors)
 
     return soup
 
 
-def _manual_boilerplate_removal(soup: BeautifulSoup) -> BeautifulSoup:
+def strip_boilerplate_tree(root: lxml.html.HtmlElement, use_readability: bool = True,
+                           selectors: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """
+    Remove boilerplate from an lxml document tree without re-parsing it.
+
+    readability scores and extracts the main content directly on the parsed
+    tree, and only the extracted article is turned into a BeautifulSoup tree.
+
+    Args:
+        root (lxml.html.HtmlElement): Parsed HTML document
+        use_readability (bool): Whether to use readability-lxml for content extraction
+        selectors (list, optional): Selectors for manual cleaning. Defaults to BOILERPLATE_SELECTORS.
+
+    Returns:
+        BeautifulSoup: Soup containing the main content with boilerplate removed
+    """
+    if use_readability:
+        try:
+            doc = _TreeDocument(root)
+            doc.summary()
+            return soup_from_tree(doc.article)
+        except Exception as e:
+            logger.warning(f"Readability extraction failed, using manual cleaning: {e}")
+
+    return _manual_boilerplate_removal(soup_from_tree(root), selectors)
+
+
+class _TreeDocument(Document):
+    """
+    readability Document that keeps the extracted article as an lxml tree.
+
+    readability only uses the serialized summary to decide whether to retry
+    with a less aggressive pass, so the string is not parsed again.
+    """
+
+    article = None
+
+    def get_clean_html(self):
+        self.article = self.html
+        return etree.tounicode(self.html, method="html")
+
+
+def _manual_boilerplate_removal(soup: BeautifulSoup, selectors: Optional[Iterable[str]] = None) -> BeautifulSoup:
     """
     Manually remove common boilerplate elements.
 
     Args:
         soup (BeautifulSoup): Parsed HTML document
-        
+        selectors (list, optional): Boilerplate selectors. Defaults to BOILERPLATE_SELECTORS.
+
     Returns:
         BeautifulSoup: Modified soup with boilerplate removed
     """
-    # Common boilerplate selectors
-    boilerplate_selectors = [
-        'nav', 'header', 'footer', 'aside', 'sidebar',
-        '.nav', '.navigation', '.navbar', '.menu',
-        '.header', '.footer', '.sidebar', '.aside',
-        '.advertisement', '.ads', '.ad', '.banner',
-        '.social', '.share', '.sharing',
-        '.comments', '.comment-section',
-        '.breadcrumb', '.breadcrumbs',
-        '#nav', '#navigation', '#navbar', '#menu',
-        '#header', '#footer', '#sidebar', '#aside',
-        '#advertisement', '#ads', '#ad', '#banner',
-        '#social', '#share', '#sharing',
-        '#comments', '#comment-section',
-        '#breadcrumb', '#breadcrumbs'
-    ]
-    
-    # Remove elements by selector
-    for selector in boilerplate_selectors:
+    if selectors is None:
+        selectors = BOILERPLATE_SELECTORS
+    matcher = _compile_selectors(tuple(selectors))
+
+    # Remove matching elements in one traversal, skipping removed subtrees
+    removed = []
+    stack = [iter(soup.children)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, Tag):
+            if matcher.matches(node):
+                removed.append(node)
+            else:
+                stack.append(iter(node.children))
+    for element in removed:
+        element.decompose()
+
+    for selector in matcher.other_selectors:
         for element in soup.select(selector):
             element.decompose()
 
-    # Remove elements by common attributes
-    for element in soup.find_all(attrs={'role': ['navigation', 'banner', 'contentinfo', 'complementary']}):
-        element.decompose()
-
-    # Remove script and style tags
-    for script in soup.find_all(['script', 'style', 'noscript']):
-        script.decompose()
-    
     # Remove elements with low text-to-html ratio (likely boilerplate)
     _remove_low_content_elements(soup)
 
     return soup
 
 
+class _SelectorMatcher:
+    """
+    Boilerplate selectors compiled into lookup sets.
+
+    Attributes:
+        tags (frozenset): Tag names
+        classes (frozenset): Class names
+        ids (frozenset): Element ids
+        attributes (dict): Attribute name to the set of matching values
+        other_selectors (list): Selectors that need soup.select()
+    """
+
+    _TAG_RE = re.compile(r'^[a-zA-Z][\w-]*$')
+    _CLASS_RE = re.compile(r'^\.(-?[_a-zA-Z][\w-]*)$')
+    _ID_RE = re.compile(r'^#([\w-]+)$')
+    _ATTRIBUTE_RE = re.compile(r'^\[\s*([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([\w-]+))\s*\]$')
+
+    def __init__(self, selectors: Iterable[str]):
+        tags, classes, ids = set(), set(), set()
+        attributes = {}
+        self.other_selectors: List[str] = []
+        for selector in selectors:
+            selector = selector.strip()
+            match = self._ATTRIBUTE_RE.match(selector)
+            if self._TAG_RE.match(selector):
+                tags.add(selector.lower())
+            elif self._CLASS_RE.match(selector):
+                classes.add(selector[1:])
+            elif self._ID_RE.match(selector):
+                ids.add(selector[1:])
+            elif match:
+                name, *values = match.groups()
+                value = next(v for v in values if v is not None)
+                attributes.setdefault(name.lower(), set()).add(value)
+            else:
+                self.other_selectors.append(selector)
+        self.tags = frozenset(tags)
+        self.classes = frozenset(classes)
+        self.ids = frozenset(ids)
+        self.attributes = {name: frozenset(values) for name, values in attributes.items()}
+
+    def matches(self, tag: Tag) -> bool:
+        """Return whether a tag matches any of the compiled selectors."""
+        if tag.name in self.tags:
+            return True
+        attrs = tag.attrs
+        if not attrs:
+            return False
+        if self.classes:
+            class_names = attrs.get('class')
+            if class_names:
+                if isinstance(class_names, str):
+                    class_names = class_names.split()
+                if not self.classes.isdisjoint(class_names):
+                    return True
+        if self.ids and attrs.get('id') in self.ids:
+            return True
+        for name, values in self.attributes.items():
+            value = attrs.get(name)
+            if value is None:
+                continue
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if value in values:
+                return True
+        return False
+
+
+@lru_cache(maxsize=32)
+def _compile_selectors(selectors: tuple) -> _SelectorMatcher:
+    return _SelectorMatcher(selectors)
+
+
 def _remove_low_content_elements(soup: BeautifulSoup, threshold: float = 0.3) -> None:
     """
     Remove elements that have a low text-to-HTML ratio, indicating they're likely boilerplate.
 
+    Text and markup lengths are computed for every element in one bottom-up
+    pass, summing the children's totals, instead of calling ``get_text()`` and
+    ``str()`` on each container. An element is removed when its stripped text
+    is shorter than 50 characters and less than ``threshold`` times the length
+    of its markup; elements inside a removed element are not checked.
+
     Args:
         soup (BeautifulSoup): Parsed HTML document
         threshold (float): Minimum text-to-HTML ratio to keep an element
     """
-    for element in soup.find_all(['div', 'section', 'article']):
-        if isinstance(element, Tag):
-            text_length = len(element.get_text().strip())
-            html_length = len(str(element))
-            
-            if html_length > 0 and text_length / html_length < threshold and text_length < 50:
-                element.decompose()
+    low_content = _find_low_content_elements(soup, threshold)
+    if not low_content:
+        return
+
+    # Remove the outermost flagged elements, in document order
+    removed = []
+    stack = [iter(soup.children)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, Tag):
+            if id(node) in low_content:
+                removed.append(node)
+            else:
+                stack.append(iter(node.children))
+    for element in removed:
+        element.decompose()
+
+
+def _find_low_content_elements(soup: BeautifulSoup, threshold: float) -> set:
+    """
+    Return the ids of the containers that fail the text-to-HTML ratio check.
+
+    Every element's text is tracked as ``(length, leading, trailing)``
+    whitespace counts so the stripped length of a concatenation can be derived
+    from its parts. Markup lengths match ``len(str(element))``.
+    """
+    formatter = soup.formatter_for_name('minimal')
+    low_content = set()
+    # Frame: [tag, children, text length, leading ws, trailing ws, markup length]
+    stack = [[soup, iter(soup.children), 0, 0, 0, 0]]
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is None:
+            stack.pop()
+            tag, _, length, lead, trail, markup = frame
+            if not stack:
+                break
+            markup += _tag_markup_length(tag, formatter)
+            if tag.name in LOW_CONTENT_TAGS:
+                text_length = length - lead - trail if lead < length else 0
+                if markup > 0 and text_length / markup < threshold and text_length < 50:
+                    low_content.add(id(tag))
+        elif isinstance(child, Tag):
+            stack.append([child, iter(child.children), 0, 0, 0, 0])
+            continue
+        else:
+            markup = len(child.output_ready(formatter))
+            if type(child) in _TEXT_STRING_TYPES:
+                length = len(child)
+                lead = length - len(child.lstrip())
+                trail = length - len(child.rstrip())
+            else:
+                length = lead = trail = 0
+
+        # Append this child's totals to its parent's
+        parent = stack[-1]
+        if parent[3] == parent[2]:
+            parent[3] += lead
+        if trail == length:
+            parent[4] += trail
+        else:
+            parent[4] = trail
+        parent[2] += length
+        parent[5] += markup
+    return low_content
+
+
+def _tag_markup_length(tag: Tag, formatter) -> int:
+    """Return the length of a tag's own start and end tags as ``str(tag)`` renders them."""
+    if tag.hidden:
+        return 0
+    name = tag.prefix + ':' + tag.name if tag.prefix else tag.name
+    length = len(name) + 2
+    for key, value in formatter.attributes(tag):
+        length += len(str(key)) + 1
+        if value is not None:
+            if isinstance(value, (list, tuple)):
+                value = ' '.join(value)
+            elif isinstance(value, AttributeValueWithCharsetSubstitution):
+                value = value.substitute_encoding('utf-8')
+            else:
+                value = str(value)
+            length += len(formatter.quoted_attribute_value(formatter.attribute_value(value))) + 1
+    if tag.is_empty_element:
+        return length + len(getattr(formatter, 'void_element_close_prefix', '/') or '')
+    return length + len(name) + 3
 
 
-def normalize_language(text: str, lang: Optional[str] = None) -> str:
+def normalize_language(text: str, lang: Optional[str] = None, per_paragraph: bool = False,
+                       detector: Optional[LanguageDetector] = None) -> str:
     """
     Normalize text based on language-specific rules.
     
     Args:
         text (str): Text to normalize
         lang (str, optional): Language code. If None, will auto-detect.
+        per_paragraph (bool): Detect the language of each line and sentence
+            separately and normalize it on its own, for pages that mix
+            languages. Ignored if lang is given (default: False)
+        detector (LanguageDetector, optional): Detector used when auto-detecting
         
     Returns:
         str: Normalized text
@@ -174,14 +433,7 @@ def normalize_language(text: str, lang: Optional[str] = None) -> str:
     
     try:
         # Auto-detect language if not provided
-        if lang is None:
-            lang = detect_language(text)
-        
-        # Apply language-specific normalization
-        if lang == 'bn':  # Bengali
-            text = _normalize_bengali(text)
-        elif lang == 'en':  # English
-            text = _normalize_english(text)
+        text = _apply_language_normalization(text, lang, per_paragraph, detector)
         
         # General normalization for all languages
         text = _general_normalization(text)
@@ -194,6 +446,101 @@ def normalize_language(text: str, lang: Optional[str] = None) -> str:
     return text
 
 
+def _apply_language_normalization(text: str, lang: Optional[str], per_paragraph: bool,
+                                  detector: Optional[LanguageDetector]) -> str:
+    """Apply the normalization for the given language, or for the detected one(s) if lang is None."""
+    if lang is not None:
+        return _normalize_for_language(text, lang)
+    # No language needs detecting when no normalizer would change the text
+    if _skip_language_normalization(text):
+        return text
+    if per_paragraph:
+        return _normalize_paragraphs(text, detector)
+    return _normalize_for_language(text, detect_script_language(text, detector, _detect_other_scripts()))
+
+
+def _normalize_for_language(text: str, lang: Optional[str]) -> str:
+    """Apply the language-specific normalization for a language code, if there is one."""
+    normalizer = _LANGUAGE_NORMALIZERS.get(lang)
+    if normalizer is None:
+        return text
+    return normalizer(text)
+
+
+def _skip_language_normalization(text: str) -> bool:
+    """Whether no registered normalizer can change text, so its language need not be detected."""
+    return text.isascii() and _ASCII_SAFE_LANGUAGES.issuperset(_LANGUAGE_NORMALIZERS)
+
+
+def _detect_other_scripts() -> bool:
+    """Whether a normalizer is registered for a language that may be written in neither Bengali nor Latin letters."""
+    return not _SCRIPT_DECIDED_LANGUAGES.issuperset(_LANGUAGE_NORMALIZERS)
+
+
+def _normalize_paragraphs(text: str, detector: Optional[LanguageDetector] = None) -> str:
+    """
+    Normalize each line and sentence of text according to its own language.
+
+    Plain text output puts a whole document on one line, so lines are
+    also split after sentence-ending punctuation. Consecutive segments in
+    the same language are normalized together.
+    """
+    segments = _SEGMENT_END_RE.split(text)
+    languages = detect_paragraph_languages(segments, detector, detect_other=_detect_other_scripts())
+    pieces = []
+    start = 0
+    for index in range(1, len(segments) + 1):
+        if index == len(segments) or languages[index] != languages[start]:
+            pieces.append(_normalize_for_language(''.join(segments[start:index]), languages[start]))
+            start = index
+    return ''.join(pieces)
+
+
+def character_normalizer(replacements: Dict[str, Optional[str]]) -> Callable[[str], str]:
+    """
+    Build a normalizer that replaces single characters.
+
+    The replacement table is built once. Each character present in the text
+    is replaced with one str.replace() call, which is faster in CPython
+    than both a regex and str.translate() on non-ASCII text. If no replaced
+    character is ASCII, pure ASCII text is returned without being scanned.
+
+    Args:
+        replacements (dict): Maps each character to its replacement string,
+            or to None to remove it. Replacements must not contain replaced
+            characters.
+
+    Returns:
+        callable: Function normalizing a string
+
+    Raises:
+        ValueError: If a key is not a single character, or a replacement
+            contains a replaced character
+    """
+    items = tuple((char, replacement or '') for char, replacement in replacements.items())
+    for char, replacement in items:
+        if len(char) != 1 or any(other in replacement for other in replacements):
+            raise ValueError(f"Invalid character replacement: {char!r} -> {replacement!r}")
+    ascii_safe = all(ord(char) >= 128 for char in replacements)
+
+    def normalize(text: str) -> str:
+        if ascii_safe and text.isascii():
+            return text
+        for char, replacement in items:
+            if char in text:
+                text = text.replace(char, replacement)
+        return text
+
+    return normalize
+
+
+_replace_bengali_characters = character_normalizer({
+    '\u0965': '\u0964',  # Double danda to danda
+    '\u09F7': None, '\u09F8': None, '\u09F9': None,  # Bengali currency numerators
+    '\u200C': None, '\u200D': None,  # Zero-width non-joiner/joiner
+})
+
+
 def _normalize_bengali(text: str) -> str:
     """
     Apply Bengali-specific text normalization.
@@ -204,33 +551,69 @@ def _normalize_bengali(text: str) -> str:
     Returns:
         str: Normalized Bengali text
     """
-    # Normalize Bengali punctuation and spacing
-    text = re.sub(r'[\u0964\u0965]+', '।', text)  # Normalize devanagari punctuation
-    text = re.sub(r'[\u09F7\u09F8\u09F9]+', '', text)  # Remove Bengali currency symbols
-    
-    # Normalize zero-width characters common in Bengali
-    text = re.sub(r'[\u200C\u200D]+', '', text)  # Remove zero-width non-joiner/joiner
-    
-    return text
+    # Runs of dandas collapse to one danda before any characters between them
+    # are removed, so only scan for runs when two dandas can be adjacent
+    if '\u0965' in text or '\u0964\u0964' in text:
+        text = _BENGALI_DANDA_RE.sub('\u0964', text)
+    return _replace_bengali_characters(text)
+
+
+_normalize_english = character_normalizer({
+    '“': '"', '”': '"',  # Smart quotes to regular quotes
+    '‘': "'", '’': "'",  # Smart apostrophes to regular apostrophes
+    '–': '-', '—': '-',  # Em/en dashes to hyphens
+    '…': '...',  # Ellipsis character to three dots
+})
+
+# Language code -> normalizer applied before general normalization. Registering
+# replaces the dict instead of changing it, so conversions running in other
+# threads never see it change size.
+_LANGUAGE_NORMALIZERS: Dict[str, Callable[[str], str]] = {}
+# Languages whose normalizer leaves pure ASCII text unchanged
+_ASCII_SAFE_LANGUAGES = frozenset()
+# Languages detect_script_language() finds without detecting text in other scripts
+_SCRIPT_DECIDED_LANGUAGES = frozenset(('bn', 'en'))
+_registry_lock = threading.Lock()
+
+
+def register_normalizer(lang: str, normalizer: Optional[Callable[[str], str]],
+                        ascii_safe: bool = False) -> None:
+    """
+    Register the language-specific normalizer for a language code.
 
+    Replaces any normalizer registered for the code. Only the normalizer of
+    the detected or given language runs. Text with neither Bengali nor Latin
+    letters is only detected, with langdetect, once a language other than
+    'bn' or 'en' is registered. Safe to call while other threads convert.
 
-def _normalize_english(text: str) -> str:
-    """
-    Apply English-specific text normalization.
-    
     Args:
-        text (str): English text to normalize
-        
-    Returns:
-        str: Normalized English text
+        lang (str): Language code, as returned by language detection
+        normalizer (callable, optional): Function taking and returning a
+            string, or None to unregister the language
+        ascii_safe (bool): Whether the normalizer never changes pure ASCII
+            text. When every registered normalizer is, language detection is
+            skipped for ASCII text (default: False)
     """
-    # Normalize common English punctuation issues
-    text = re.sub(r'[“”]', '"', text)  # Smart quotes to regular quotes
-    text = re.sub(r'[‘’]', "'", text)  # Smart apostrophes to regular apostrophes
-    text = re.sub(r'[–—]', '-', text)  # Em/en dashes to hyphens
-    text = re.sub(r'…', '...', text)  # Ellipsis character to three dots
-    
-    return text
+    global _LANGUAGE_NORMALIZERS, _ASCII_SAFE_LANGUAGES
+    with _registry_lock:
+        normalizers = dict(_LANGUAGE_NORMALIZERS)
+        ascii_safe_languages = set(_ASCII_SAFE_LANGUAGES)
+        normalizers.pop(lang, None)
+        ascii_safe_languages.discard(lang)
+        if normalizer is not None:
+            normalizers[lang] = normalizer
+            if ascii_safe:
+                ascii_safe_languages.add(lang)
+        _LANGUAGE_NORMALIZERS, _ASCII_SAFE_LANGUAGES = normalizers, frozenset(ascii_safe_languages)
+
+
+register_normalizer('bn', _normalize_bengali, ascii_safe=True)
+register_normalizer('en', _normalize_english, ascii_safe=True)
+
+# Unicode spaces, zero-width and directional characters become regular spaces
+_replace_unicode_spaces = character_normalizer({
+    chr(code): ' ' for code in (0x00A0, 0xFEFF, *range(0x2000, 0x2010), *range(0x2028, 0x2030), *range(0x205F, 0x2070))
+})
 
 
 def _general_normalization(text: str) -> str:
@@ -245,35 +628,20 @@ def _general_normalization(text: str) -> str:
         str: Normalized text
     """
     # Protect URLs and image placeholders from normalization
-    url_pattern = r'(https?://[^\s\]]+|[^\s\]]*\.[a-zA-Z]{2,}[^\s\]]*)'
-    image_pattern = r'(\[IMAGE:[^\]]+\])'
-    
-    protected_items = []
-    
-    def protect_item(match):
-        item = match.group(0)
-        placeholder = f"__PROTECTED_ITEM_{len(protected_items)}__"
-        protected_items.append(item)
-        return placeholder
-    
-    # Protect URLs and image placeholders
-    text = re.sub(url_pattern, protect_item, text)
-    text = re.sub(image_pattern, protect_item, text)
+    text, protected_items = protect_items(text)
     
     # Remove excessive whitespace
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)  # Multiple newlines to double newlines
-    text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces/tabs to single space
+    text = _BLANK_LINES_RE.sub('\n\n', text)  # Multiple newlines to double newlines
+    text = _SPACES_RE.sub(' ', text)  # Multiple spaces/tabs to single space
     
     # Remove trailing whitespace from lines
     text = '\n'.join(line.rstrip() for line in text.split('\n'))
     
     # Remove common Unicode control characters
-    text = re.sub(r'[\u00A0\u2000-\u200F\u2028-\u202F\u205F-\u206F\uFEFF]', ' ', text)
+    text = _replace_unicode_spaces(text)
     
     # Restore protected URLs and image placeholders
-    for i, item in enumerate(protected_items):
-        placeholder = f"__PROTECTED_ITEM_{i}__"
-        text = text.replace(placeholder, item)
+    text = restore_items(text, protected_items)
     
     return text.strip()
 
@@ -295,7 +663,7 @@ def replace_images_with_text(soup: BeautifulSoup, base_url: str = "") -> Beautif
         if not url:
             return ""
         # Remove spaces from URLs (including before file extensions)
-        url = re.sub(r'\s+', '', url)
+        url = _WHITESPACE_RE.sub('', url)
         # Handle relative URLs
         if base_url and not url.startswith(('http://', 'https://', '//')):
             if url.startswith('/'):
@@ -401,7 +769,7 @@ def _extract_css_background_images(soup: BeautifulSoup, base_url: str = "") -> N
         style = element.get('style', '')
         
         # Extract background-image URLs using regex
-        bg_matches = re.findall(r'background-image\s*:\s*url\s*\(\s*["\']?([^"\')\s]+)["\']?\s*\)', style, re.IGNORECASE)
+        bg_matches = _BACKGROUND_IMAGE_RE.findall(style)
         
         for bg_url in bg_matches:
             normalized_url = _normalize_bg_url(bg_url)
@@ -428,8 +796,7 @@ def clean_html_attributes(soup: BeautifulSoup) -> BeautifulSoup:
     Returns:
         BeautifulSoup: Modified soup with cleaned attributes
     """
-    # Attributes to keep for semantic meaning
-    keep_attributes = ['href', 'src', 'alt', 'title', 'colspan', 'rowspan']
+    keep_attributes = KEEP_ATTRIBUTES
 
     for element in soup.find_all(True):  # Find all tags
         if hasattr(element, 'attrs'):
@@ -452,17 +819,41 @@ def clean_html_attributes(soup: BeautifulSoup) -> BeautifulSoup:
     return soup
 
 
+def clean_tree_attributes(root: lxml.html.HtmlElement,
+                          keep_attributes: Optional[Iterable[str]] = None) -> lxml.html.HtmlElement:
+    """
+    Remove unnecessary HTML attributes from an lxml document tree.
+
+    Equivalent to clean_html_attributes(), operating on the lxml tree used by
+    the single-parse pipeline.
+
+    Args:
+        root (lxml.html.HtmlElement): Parsed HTML document
+        keep_attributes (list, optional): Attribute names to keep. Defaults to KEEP_ATTRIBUTES.
+
+    Returns:
+        lxml.html.HtmlElement: The same tree with cleaned attributes
+    """
+    keep_attributes = set(KEEP_ATTRIBUTES if keep_attributes is None else keep_attributes)
+
+    for element in root.iter(etree.Element):
+        attrib = element.attrib
+        if attrib:
+            for attr in attrib.keys():
+                if attr not in keep_attributes:
+                    del attrib[attr]
+
+    return root
+
+
 def group_product_info(text: str) -> str:
     """Group product/category/brand info into paragraphs based on repetitive patterns and any currency."""
     lines = [line.strip() for line in text.split('\n') if line.strip()]
     product_cards = []
     current_card = []
-    price_pattern = re.compile(
-        rf"(\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?|ab\s?\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?|Statt:\s?\d{{1,3}}(?:\.\d{{3}})*,\d{{2}}\s?(?:{currency_regex})?\s?\*?)"
-    )
     last_was_price = False
     for line in lines:
-        if price_pattern.search(line):
+        if _PRICE_RE.search(line):
             current_card.append(line)
             last_was_price = True
         else:
@@ -474,3 +865,96 @@ def group_product_info(text: str) -> str:
     if current_card:
         product_cards.append(' '.join(current_card))
     return '\n\n'.join(product_cards)
+
+
+def postprocess_text(text: str, lang: Optional[str] = None, normalize_lang: bool = True,
+                     group_products: bool = True, per_paragraph: bool = False,
+                     detector: Optional[LanguageDetector] = None) -> str:
+    """
+    Normalize, format and group extracted text in one pass over its lines.
+
+    Gives the same result as normalize_language() (if normalize_lang),
+    then format_readable_text(), then group_product_info() (if
+    group_products), but protects URLs once, builds merged lines from lists
+    of parts instead of repeated string concatenation, and splits the text
+    into lines only once.
+
+    Args:
+        text (str): Text to process
+        lang (str, optional): Language code. If None, will auto-detect.
+        normalize_lang (bool): Whether to apply language normalization
+        group_products (bool): Whether to group product card lines into paragraphs
+        per_paragraph (bool): Detect and normalize the language of each line
+            and sentence separately; see normalize_language() (default: False)
+        detector (LanguageDetector, optional): Detector used when auto-detecting
+
+    Returns:
+        str: Processed text
+    """
+    if not text or not isinstance(text, str):
+        return ""
+
+    if normalize_lang:
+        try:
+            text = _apply_language_normalization(text, lang, per_paragraph, detector)
+        except Exception as e:
+            logger.warning(f"Language normalization failed: {e}")
+
+    text, protected_items = protect_items(text)
+    if normalize_lang:
+        text = _replace_unicode_spaces(text)
+    text = _SPACES_RE.sub(' ', text)
+
+    # Merge each line into the previous one unless that one is short or ends
+    # a sentence, or the line starts with a capital; blank lines end paragraphs
+    paragraphs = []
+    lines = []
+    parts = []
+    length = 0
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            if parts:
+                lines.append(' '.join(parts))
+                parts = []
+            if lines:
+                paragraphs.append('\n'.join(lines))
+                lines = []
+        elif parts and length > 20 and not line[0].isupper() and parts[-1][-1] not in '.!?:':
+            parts.append(line)
+            length += len(line) + 1
+        else:
+            if parts:
+                lines.append(' '.join(parts))
+            parts = [line]
+            length = len(line)
+    if parts:
+        lines.append(' '.join(parts))
+    if lines:
+        paragraphs.append('\n'.join(lines))
+
+    text = _SPACE_RUNS_RE.sub(' ', _MISSING_SPACE_RE.sub(r'\1 \2', '\n\n'.join(paragraphs)))
+    text = restore_items(text, protected_items).strip()
+    if not group_products:
+        return text
+
+    # Lines up to and including a price line form one product card
+    cards = []
+    card = []
+    last_was_price = False
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if _PRICE_RE.search(line):
+            card.append(line)
+            last_was_price = True
+        else:
+            if last_was_price and card:
+                cards.append(' '.join(card))
+                card = []
+            card.append(line)
+            last_was_price = False
+    if card:
+        cards.append(' '.join(card))
+    return '\n\n'.join(cards)
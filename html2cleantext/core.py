@@ -4,24 +4,242 @@ Core functions for converting HTML to clean Markdown or plain text.
 
 import os
 import logging
+from functools import lru_cache, partial
 from bs4 import BeautifulSoup
 from markdownify import markdownify
-from typing import Union, Optional
+from typing import Callable, Dict, Iterable, List, Union, Optional
 
-from .utils import fetch_url, is_url, is_file_path, normalize_whitespace, format_readable_text
+from .utils import (
+    is_url, is_file_path, normalize_whitespace, format_readable_text, HostLanguageCache,
+    LanguageDetector
+)
+from .fetching import Fetcher, get_default_fetcher
+from .parsing import decode_html, parse_html, parse_soup, prune_html, soup_from_tree
+from .renderers import render_markdown, extract_text
 from .cleaners import (
     remove_links, 
     remove_images, 
     strip_boilerplate, 
+    strip_boilerplate_tree,
     normalize_language,
-    clean_html_attributes,
+    clean_tree_attributes,
     replace_images_with_text,
-    group_product_info
+    group_product_info,
+    postprocess_text,
+    KEEP_ATTRIBUTES,
+    _detect_other_scripts,
+    _skip_language_normalization
 )
 
 logger = logging.getLogger(__name__)
 
 
+MARKDOWN_STAGES = ('prune', 'parse', 'links', 'images', 'render', 'normalize', 'format')
+TEXT_STAGES = ('prune', 'parse', 'images', 'links', 'render', 'normalize', 'format', 'group')
+
+
+class Converter:
+    """
+    Reusable HTML converter with a fixed set of options.
+
+    The options are resolved into a list of stage functions once, so
+    converting many documents with the same options skips the per-call
+    setup of to_markdown() and to_text(). Stages run in order:
+
+    - ``prune`` (str or bytes -> str): strip scripts, styles, SVG and comments before parsing
+    - ``parse`` (str or bytes -> BeautifulSoup): parse, clean attributes and remove boilerplate
+    - ``links``, ``images`` (BeautifulSoup, base_url -> BeautifulSoup): rewrite or remove links and images
+    - ``render`` (BeautifulSoup -> str): produce Markdown or plain text
+    - ``normalize``, ``format``, ``group`` (str -> str): text post-processing
+
+    URL inputs reach the markup stages as undecoded bytes when the parser
+    can decode them itself. Any stage can be replaced with another callable
+    of the same signature, or turned off with None, through the ``stages``
+    argument. ``parse`` and ``render`` cannot be turned off.
+
+    Example:
+        >>> converter = Converter('text', keep_links=True, stages={'group': None})
+        >>> text = converter.convert('<p>Hello <a href="/x">world</a></p>')
+    """
+
+    def __init__(
+        self,
+        output_format: str = 'markdown',
+        keep_links: Optional[bool] = None,
+        keep_images: Optional[bool] = None,
+        remove_boilerplate: bool = True,
+        normalize_lang: bool = True,
+        language: Optional[str] = None,
+        readable_format: bool = True,
+        single_parse: bool = True,
+        native_markdown: bool = True,
+        keep_attributes: Optional[Iterable[str]] = None,
+        prune: bool = False,
+        language_cache: Optional[HostLanguageCache] = None,
+        paragraph_lang: bool = False,
+        language_detector: Optional[LanguageDetector] = None,
+        fetcher: Optional[Fetcher] = None,
+        stages: Optional[Dict[str, Optional[Callable]]] = None
+    ):
+        """
+        Args:
+            output_format: 'markdown' or 'text' (default: 'markdown')
+            keep_links: Whether to preserve links (default: True for Markdown, False for text)
+            keep_images: Whether to preserve images (default: True for Markdown, False for text)
+            remove_boilerplate: Whether to remove navigation, footers, etc. (default: True)
+            normalize_lang: Whether to apply language-specific normalization (default: True)
+            language: Language code for normalization (auto-detected if None)
+            readable_format: Whether to format for human readability with proper paragraphs (default: True)
+            single_parse: Whether to parse once into an lxml tree and clean it in place (default: True)
+            native_markdown: Whether to render Markdown by walking the cleaned tree (default: True)
+            keep_attributes: HTML attributes to keep while parsing (default: KEEP_ATTRIBUTES)
+            prune: Whether to strip scripts, styles, inline SVG, comments and base64 data URIs
+                from the markup before parsing it (default: False)
+            language_cache: Per-host language cache used to detect the language of URL
+                inputs when language is None (default: None, detect every page)
+            paragraph_lang: Whether to detect and normalize the language of each line and sentence
+                separately, for mixed-language pages, when language is None (default: False)
+            language_detector: Detector restricted to candidate languages, used for all
+                language detection (default: None, all langdetect languages)
+            fetcher: Fetcher for URL inputs (default: None, the shared get_default_fetcher())
+            stages: Stage name to replacement callable, or None to turn the stage off
+
+        Raises:
+            ValueError: If the output format or a stage name is unknown
+        """
+        if output_format == 'markdown':
+            names = MARKDOWN_STAGES
+            defaults = (True, True)
+        elif output_format == 'text':
+            names = TEXT_STAGES
+            defaults = (False, False)
+        else:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.output_format = output_format
+        self.fetcher = fetcher
+        self.keep_links = defaults[0] if keep_links is None else keep_links
+        self.keep_images = defaults[1] if keep_images is None else keep_images
+        self.keep_attributes = frozenset(KEEP_ATTRIBUTES if keep_attributes is None else keep_attributes)
+
+        markdown = output_format == 'markdown'
+        if markdown:
+            links = _markdown_links if self.keep_links else _remove_links
+            images = None if self.keep_images else _remove_images
+            render = render_markdown if native_markdown else _markdownify
+        else:
+            links = _text_links if self.keep_links else _remove_links
+            images = replace_images_with_text if self.keep_images else _remove_images
+            render = extract_text if readable_format else _joined_text
+
+        default_stages = {
+            'prune': _prune_html_content if prune else None,
+            'parse': partial(_parse_document, remove_boilerplate=remove_boilerplate,
+                             single_parse=single_parse, keep_attributes=self.keep_attributes),
+            'links': links,
+            'images': images,
+            'render': render,
+            'normalize': partial(normalize_language, lang=language, per_paragraph=paragraph_lang,
+                                 detector=language_detector) if normalize_lang else None,
+            'format': format_readable_text if readable_format else normalize_whitespace,
+            'group': group_product_info,
+        }
+        for name, stage in (stages or {}).items():
+            if name not in names:
+                raise ValueError(f"Unknown {output_format} stage: {name}")
+            if stage is None and name in ('parse', 'render'):
+                raise ValueError(f"Stage cannot be turned off: {name}")
+            default_stages[name] = stage
+
+        self.stages = {name: default_stages[name] for name in names}
+        # Split into the stages run on the markup, the tree and the output text
+        render_index = names.index('render')
+        self._markup_stages = [s for s in (self.stages['prune'],) if s is not None]
+        self._parse = self.stages['parse']
+        self._document_stages = [self.stages[name] for name in names[2:render_index]
+                                 if self.stages[name] is not None]
+        self._render = self.stages['render']
+        self._text_stages = [self.stages[name] for name in names[render_index + 1:]
+                             if self.stages[name] is not None]
+
+        # The built-in text stages run fused in a single pass over the lines
+        replaced = {name for name, stage in (stages or {}).items() if stage is not None}
+        if readable_format and not replaced & {'normalize', 'format', 'group'}:
+            self._text_stages = [partial(
+                postprocess_text,
+                lang=language,
+                normalize_lang=self.stages['normalize'] is not None,
+                group_products=self.stages.get('group') is not None,
+                per_paragraph=paragraph_lang,
+                detector=language_detector
+            )]
+
+        # The built-in normalization stage takes the language of URL inputs
+        # from the per-host cache
+        self.language_cache = language_cache
+        self._language_stage = None
+        if (language_cache is not None and language is None and not paragraph_lang
+                and normalize_lang and 'normalize' not in replaced and self.stages['normalize'] is not None):
+            self._language_stage = self._text_stages[0]
+
+    def convert(self, html_input: Union[str, os.PathLike]) -> str:
+        """
+        Convert HTML to clean Markdown or plain text.
+
+        Args:
+            html_input: HTML string, file path, or URL
+
+        Returns:
+            str: Clean Markdown or plain text
+
+        Raises:
+            FileNotFoundError: If file path doesn't exist
+            requests.RequestException: If URL fetching fails
+        """
+        html_content = _get_html_content(html_input, self.fetcher)
+        # Image placeholders in text output resolve relative URLs against the input URL
+        html_input_str = str(html_input)
+        return self.convert_html(html_content, html_input_str if is_url(html_input_str) else "")
+
+    __call__ = convert
+
+    def convert_html(self, html_content: Union[str, bytes], base_url: str = "") -> str:
+        """
+        Convert HTML markup that has already been read or fetched.
+
+        Args:
+            html_content: HTML markup, or undecoded bytes that the parser
+                decodes from their byte order mark or <meta> charset
+            base_url: URL the markup was fetched from, used to resolve relative
+                image URLs and to look up the per-host language (default: "")
+
+        Returns:
+            str: Clean Markdown or plain text
+        """
+        for stage in self._markup_stages:
+            html_content = stage(html_content)
+
+        soup = self._parse(html_content)
+        for stage in self._document_stages:
+            soup = stage(soup, base_url)
+
+        text = self._render(soup)
+        language_stage = self._language_stage
+        # Text no normalizer changes needs no language, so the cache is not consulted
+        if language_stage is not None and base_url and not _skip_language_normalization(text):
+            language = self.language_cache.detect(text, base_url, _detect_other_scripts())
+            language_stage = partial(language_stage, lang=language)
+        for stage in self._text_stages:
+            text = language_stage(text) if stage is self._language_stage else stage(text)
+        return text
+
+
+@lru_cache(maxsize=32)
+def _get_converter(output_format: str, *options) -> Converter:
+    """Return the shared converter for a set of to_markdown()/to_text() options."""
+    return Converter(output_format, *options)
+
+
 def to_markdown(
     html_input: Union[str, os.PathLike], 
     keep_links: bool = True,
@@ -29,10 +247,21 @@ def to_markdown(
     remove_boilerplate: bool = True,
     normalize_lang: bool = True,
     language: Optional[str] = None,
-    readable_format: bool = True
+    readable_format: bool = True,
+    single_parse: bool = True,
+    native_markdown: bool = True,
+    keep_attributes: Optional[List[str]] = None,
+    prune: bool = False,
+    language_cache: Optional[HostLanguageCache] = None,
+    paragraph_lang: bool = False,
+    language_detector: Optional[LanguageDetector] = None,
+    fetcher: Optional[Fetcher] = None
 ) -> str:
     """
     Convert HTML to clean Markdown format.
+
+    Uses a cached Converter for each distinct set of options; create a
+    Converter directly to replace or turn off individual stages.
     
     Args:
         html_input: HTML string, file path, or URL
@@ -42,6 +271,20 @@ def to_markdown(
         normalize_lang: Whether to apply language-specific normalization (default: True)
         language: Language code for normalization (auto-detected if None)
         readable_format: Whether to format for human readability with proper paragraphs (default: True)
+        single_parse: Whether to parse once into an lxml tree and clean it in place; set to False
+            to use the reference BeautifulSoup pipeline (default: True)
+        native_markdown: Whether to render Markdown by walking the cleaned tree; set to False to
+            serialize it and convert with markdownify (default: True)
+        keep_attributes: HTML attributes to keep while parsing (default: KEEP_ATTRIBUTES)
+        prune: Whether to strip scripts, styles, inline SVG, comments and base64 data URIs
+            from the markup before parsing it (default: False)
+        language_cache: Per-host language cache used to detect the language of URL
+            inputs when language is None (default: None, detect every page)
+        paragraph_lang: Whether to detect and normalize the language of each line and sentence
+            separately, for mixed-language pages, when language is None (default: False)
+        language_detector: Detector restricted to candidate languages, used for all
+            language detection (default: None, all langdetect languages)
+        fetcher: Fetcher for URL inputs (default: None, the shared get_default_fetcher())
         
     Returns:
         str: Clean Markdown text
@@ -51,51 +294,13 @@ def to_markdown(
         FileNotFoundError: If file path doesn't exist
         requests.RequestException: If URL fetching fails
     """
-    # Get HTML content
-    html_content = _get_html_content(html_input)
-    
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'lxml')
-    
-    # Clean HTML attributes first
-    soup = clean_html_attributes(soup)
-
-    # Apply cleaning options
-    if remove_boilerplate:
-        soup = strip_boilerplate(soup)
-
-    if not keep_links:
-        soup = remove_links(soup)
-    else:
-        # If keep_links is True, convert <a> tags to Markdown links [text](URL)
-        for a_tag in soup.find_all('a', href=True):
-            link_text = a_tag.get_text().strip()
-            link_url = a_tag['href']
-            # Replace with Markdown link format
-            replacement = f"[{link_text}]({link_url})" if link_text else f"[{link_url}]({link_url})"
-            a_tag.replace_with(replacement)
-
-    if not keep_images:
-        soup = remove_images(soup)
-
-    # Convert to Markdown
-    markdown_text = markdownify(
-        str(soup), 
-        heading_style="ATX",  # Use # style headers
-        bullets="*"  # Use * for bullet points
+    converter = _get_converter(
+        'markdown', keep_links, keep_images, remove_boilerplate, normalize_lang, language,
+        readable_format, single_parse, native_markdown,
+        None if keep_attributes is None else tuple(keep_attributes), prune, language_cache,
+        paragraph_lang, language_detector, fetcher
     )
-    
-    # Apply language normalization
-    if normalize_lang:
-        markdown_text = normalize_language(markdown_text, language)
-    
-    # Final cleanup
-    if readable_format:
-        markdown_text = format_readable_text(markdown_text)
-    else:
-        markdown_text = normalize_whitespace(markdown_text)
-    
-    return markdown_text
+    return converter.convert(html_input)
 
 
 def to_text(
@@ -105,10 +310,20 @@ def to_text(
     remove_boilerplate: bool = True,
     normalize_lang: bool = True,
     language: Optional[str] = None,
-    readable_format: bool = True
+    readable_format: bool = True,
+    single_parse: bool = True,
+    keep_attributes: Optional[List[str]] = None,
+    prune: bool = False,
+    language_cache: Optional[HostLanguageCache] = None,
+    paragraph_lang: bool = False,
+    language_detector: Optional[LanguageDetector] = None,
+    fetcher: Optional[Fetcher] = None
 ) -> str:
     """
     Convert HTML to clean plain text format.
+
+    Uses a cached Converter for each distinct set of options; create a
+    Converter directly to replace or turn off individual stages.
     
     Args:
         html_input: HTML string, file path, or URL
@@ -118,6 +333,18 @@ def to_text(
         normalize_lang: Whether to apply language-specific normalization (default: True)
         language: Language code for normalization (auto-detected if None)
         readable_format: Whether to format for human readability with proper paragraphs (default: True)
+        single_parse: Whether to parse once into an lxml tree and clean it in place; set to False
+            to use the reference BeautifulSoup pipeline (default: True)
+        keep_attributes: HTML attributes to keep while parsing (default: KEEP_ATTRIBUTES)
+        prune: Whether to strip scripts, styles, inline SVG, comments and base64 data URIs
+            from the markup before parsing it (default: False)
+        language_cache: Per-host language cache used to detect the language of URL
+            inputs when language is None (default: None, detect every page)
+        paragraph_lang: Whether to detect and normalize the language of each line and sentence
+            separately, for mixed-language pages, when language is None (default: False)
+        language_detector: Detector restricted to candidate languages, used for all
+            language detection (default: None, all langdetect languages)
+        fetcher: Fetcher for URL inputs (default: None, the shared get_default_fetcher())
         
     Returns:
         str: Clean plain text
@@ -127,93 +354,129 @@ def to_text(
         FileNotFoundError: If file path doesn't exist
         requests.RequestException: If URL fetching fails
     """
-    # Get HTML content
-    html_content = _get_html_content(html_input)
-    
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'lxml')
-    
-    # Clean HTML attributes first
-    soup = clean_html_attributes(soup)
-    
-    # Apply cleaning options
+    converter = _get_converter(
+        'text', keep_links, keep_images, remove_boilerplate, normalize_lang, language,
+        readable_format, single_parse, True,
+        None if keep_attributes is None else tuple(keep_attributes), prune, language_cache,
+        paragraph_lang, language_detector, fetcher
+    )
+    return converter.convert(html_input)
+
+
+def _markdown_links(soup: BeautifulSoup, base_url: str = "") -> BeautifulSoup:
+    """Replace <a> tags with Markdown links [text](URL)."""
+    for a_tag in soup.find_all('a', href=True):
+        link_text = a_tag.get_text().strip()
+        link_url = a_tag['href']
+        # Replace with Markdown link format
+        replacement = f"[{link_text}]({link_url})" if link_text else f"[{link_url}]({link_url})"
+        a_tag.replace_with(replacement)
+    return soup
+
+
+def _text_links(soup: BeautifulSoup, base_url: str = "") -> BeautifulSoup:
+    """Replace <a> tags with their text and URL in [Link:URL] format."""
+    for a_tag in soup.find_all('a', href=True):
+        link_text = a_tag.get_text().strip()
+        link_url = a_tag['href']
+        if link_text:
+            replacement = f"{link_text} [Link:{link_url}]"
+        else:
+            replacement = f"[Link:{link_url}]"
+        a_tag.replace_with(replacement)
+    return soup
+
+
+def _remove_links(soup: BeautifulSoup, base_url: str = "") -> BeautifulSoup:
+    """Document stage wrapper for remove_links()."""
+    return remove_links(soup)
+
+
+def _remove_images(soup: BeautifulSoup, base_url: str = "") -> BeautifulSoup:
+    """Document stage wrapper for remove_images()."""
+    return remove_images(soup)
+
+
+def _markdownify(soup: BeautifulSoup) -> str:
+    """Serialize the document and convert it with markdownify."""
+    return markdownify(
+        str(soup), 
+        heading_style="ATX",  # Use # style headers
+        bullets="*"  # Use * for bullet points
+    )
+
+
+def _joined_text(soup: BeautifulSoup) -> str:
+    """Join all text in the document with single spaces."""
+    return soup.get_text(separator=' ', strip=True)
+
+
+def _parse_document(html_content: Union[str, bytes], remove_boilerplate: bool, single_parse: bool,
+                    keep_attributes: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """
+    Parse HTML, clean its attributes and optionally remove boilerplate.
+
+    Attributes are dropped while the BeautifulSoup tree is built. readability
+    runs on the lxml tree, so that tree is cleaned first when boilerplate is
+    removed.
+
+    Args:
+        html_content: HTML content to parse
+        remove_boilerplate: Whether to remove navigation, footers, etc.
+        single_parse: Whether to parse once into an lxml tree and run attribute
+            cleaning and boilerplate extraction on that tree
+        keep_attributes: HTML attributes to keep (default: KEEP_ATTRIBUTES)
+
+    Returns:
+        BeautifulSoup: Cleaned document
+    """
+    if keep_attributes is None:
+        keep_attributes = KEEP_ATTRIBUTES
+
+    if not single_parse:
+        # Reference pipeline: the boilerplate stage serializes the soup and
+        # parses it again
+        soup = parse_soup(html_content, keep_attributes)
+        if remove_boilerplate:
+            soup = strip_boilerplate(soup)
+        return soup
+
+    root = parse_html(html_content)
     if remove_boilerplate:
-        soup = strip_boilerplate(soup)
+        clean_tree_attributes(root, keep_attributes)
+        return strip_boilerplate_tree(root)
+    return soup_from_tree(root, keep_attributes)
 
-    # FIXED: Handle images properly based on keep_images flag
-    if keep_images:
-        # Replace images with text placeholders instead of removing them
-        # Extract base URL if input was a URL
-        base_url = ""
-        if is_url(str(html_input)):
-            base_url = str(html_input)
 
-        soup = replace_images_with_text(soup, base_url)
-    else:
-        # Remove images completely
-        soup = remove_images(soup)
+def _prune_html_content(html_content: Union[str, bytes]) -> str:
+    """
+    Strip regions that never reach the output before the document is parsed.
 
-    if not keep_links:
-        soup = remove_links(soup)
-    else:
-        # If keep_links is True, replace <a> tags with their text and URL in [Link:URL] format
-        for a_tag in soup.find_all('a', href=True):
-            link_text = a_tag.get_text().strip()
-            link_url = a_tag['href']
-            if link_text:
-                replacement = f"{link_text} [Link:{link_url}]"
-            else:
-                replacement = f"[Link:{link_url}]"
-            a_tag.replace_with(replacement)
-
-    # image_urls = [img.get("src") for img in soup.find_all("img") if img.get("src")]
-    # for url in image_urls:
-    #     print(url)
-
-    # Extract text content with better paragraph preservation
-    if readable_format:
-        # Replace block elements with their text + appropriate newlines
-        block_elements = ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'article', 'section', 'br']
-        found_blocks = soup.find_all(block_elements)
-
-        for tag in found_blocks:
-            if tag.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                # Headers get double newlines before and after
-                tag.replace_with(f"\n\n{tag.get_text().strip()}\n\n")
-            elif tag.name in ['p', 'div', 'li', 'blockquote', 'article', 'section']:
-                # Paragraphs get newlines after
-                tag.replace_with(f"{tag.get_text().strip()}\n\n")
-            elif tag.name == 'br':
-                tag.replace_with("\n")
-
-        text = soup.get_text(separator=' ', strip=True)
-    else:
-        text = soup.get_text(separator=' ', strip=True)
-    
-    # Apply language normalization
-    if normalize_lang:
-        text = normalize_language(text, language)
-    
-    # Final cleanup
-    if readable_format:
-        text = format_readable_text(text)
-    else:
-        text = normalize_whitespace(text)
-    # Group product/category/brand info into paragraphs
-    text = group_product_info(text)
+    Args:
+        html_content: HTML content to prune; bytes are decoded first
 
-    return text
+    Returns:
+        str: Pruned HTML content
+    """
+    if isinstance(html_content, bytes):
+        html_content = decode_html(html_content)
+    html_content, removed = prune_html(html_content)
+    logger.info(f"Pruned {removed} bytes of scripts, styles, SVG, comments and data URIs")
+    return html_content
 
 
-def _get_html_content(html_input: Union[str, os.PathLike]) -> str:
+def _get_html_content(html_input: Union[str, os.PathLike],
+                      fetcher: Optional[Fetcher] = None) -> Union[str, bytes]:
     """
     Get HTML content from string, file, or URL.
     
     Args:
         html_input: HTML string, file path, or URL
+        fetcher: Fetcher for URLs (default: None, the shared get_default_fetcher())
         
     Returns:
-        str: HTML content
+        str or bytes: HTML content; URL responses stay bytes when the parser
+        can decode them itself (see Fetcher.fetch_markup())
         
     Raises:
         ValueError: If input type is not supported
@@ -228,7 +491,7 @@ def _get_html_content(html_input: Union[str, os.PathLike]) -> str:
     # Check if it's a URL
     if is_url(html_input_str):
         logger.info(f"Fetching HTML from URL: {html_input_str}")
-        return fetch_url(html_input_str)
+        return (fetcher or get_default_fetcher()).fetch_markup(html_input_str)
     
     # Check if it's a file path
     elif is_file_path(html_input_str) and os.path.exists(html_input_str):
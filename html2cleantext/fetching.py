@@ -0,0 +1,358 @@
+"""
+Pooled HTTP fetching for URL inputs.
+
+A Fetcher keeps one requests Session, so the TCP and TLS connections to a
+host stay open between pages and the headers are built once. URL inputs
+use a shared Fetcher per process unless a Converter is given its own.
+
+Responses are streamed: a non-HTML Content-Type is rejected before the
+body is read, and a body over the size cap is abandoned as soon as it
+passes it. The body is kept as bytes, so the parser can decode it from its
+byte order mark or ``<meta>`` charset instead of requests guessing. With a
+caching.FetchCache, unchanged pages are revalidated instead of downloaded.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, Iterable, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .caching import FetchCache
+from .parsing import decode_html, html_markup
+from .utils import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# Hosts whose connection pools are kept, and connections kept per host
+POOL_HOSTS = 10
+POOL_CONNECTIONS_PER_HOST = 10
+# Retries of failed connections and of these statuses, waiting
+# BACKOFF_FACTOR * 2 ** (retry - 1) seconds or the server's Retry-After,
+# but never more than MAX_RETRY_WAIT seconds before a retry
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_RETRY_WAIT = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Largest response body read, in bytes after content decoding
+MAX_BYTES = 32 << 20
+# Media types fetched; responses without a Content-Type are fetched too
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+# Bytes read from the response stream at a time
+CHUNK_SIZE = 1 << 16
+
+
+class UnsupportedContentType(requests.RequestException):
+    """The response's Content-Type is not one the fetcher accepts."""
+
+
+class ResponseTooLarge(requests.RequestException):
+    """The response body is larger than the fetcher's max_bytes."""
+
+
+class FetchStats(NamedTuple):
+    """Request and connection counts of a Fetcher."""
+    fetches: int
+    requests: int
+    connections_opened: int
+    connections_reused: int
+
+
+class Fetcher:
+    """
+    Fetch URLs over pooled keep-alive connections, retrying with backoff.
+
+    Safe to share between threads. With pool_block, at most
+    pool_connections_per_host requests run against one host at a time and
+    further ones wait for a free connection. Pickling a Fetcher keeps its
+    settings but not its connections or counts.
+
+    Example:
+        >>> with Fetcher(pool_connections_per_host=4) as fetcher:
+        ...     html = fetcher.fetch("https://example.com/")
+        ...     print(fetcher.stats().connections_reused)
+    """
+
+    def __init__(self, timeout: float = 30, headers: Optional[dict] = None, pool_hosts: int = POOL_HOSTS,
+                 pool_connections_per_host: int = POOL_CONNECTIONS_PER_HOST, pool_block: bool = True,
+                 retries: int = RETRIES, backoff_factor: float = BACKOFF_FACTOR,
+                 max_retry_wait: float = MAX_RETRY_WAIT, max_bytes: Optional[int] = MAX_BYTES,
+                 content_types: Optional[Iterable[str]] = HTML_CONTENT_TYPES,
+                 cache: Optional[FetchCache] = None):
+        """
+        Args:
+            timeout: Connect and read timeout in seconds (default: 30)
+            headers: Headers added to the defaults for every request
+            pool_hosts: Number of hosts whose connections are kept open (default: POOL_HOSTS)
+            pool_connections_per_host: Connections kept open per host (default: POOL_CONNECTIONS_PER_HOST)
+            pool_block: Whether requests wait for a free connection instead of
+                opening more than pool_connections_per_host to a host (default: True)
+            retries: Retries of failed connections and RETRY_STATUSES responses (default: RETRIES)
+            backoff_factor: Base of the exponential wait between retries in seconds
+                (default: BACKOFF_FACTOR)
+            max_retry_wait: Longest wait before a retry in seconds, capping both the
+                backoff and a server's Retry-After; a URL waits at most retries times
+                this on top of its requests (default: MAX_RETRY_WAIT)
+            max_bytes: Largest body read; larger responses raise ResponseTooLarge,
+                None reads any size (default: MAX_BYTES)
+            content_types: Media types accepted; others raise UnsupportedContentType
+                before the body is read, None accepts any (default: HTML_CONTENT_TYPES)
+            cache: Persistent cache whose pages are served or revalidated instead of
+                downloaded again (default: None)
+
+        Raises:
+            ValueError: If a pool size, the number of retries, max_retry_wait or max_bytes is invalid
+        """
+        if pool_hosts < 1:
+            raise ValueError(f"pool_hosts must be at least 1: {pool_hosts}")
+        if pool_connections_per_host < 1:
+            raise ValueError(f"pool_connections_per_host must be at least 1: {pool_connections_per_host}")
+        if retries < 0:
+            raise ValueError(f"retries must not be negative: {retries}")
+        if max_retry_wait < 0:
+            raise ValueError(f"max_retry_wait must not be negative: {max_retry_wait}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1: {max_bytes}")
+        self._settings = dict(timeout=timeout, headers=headers, pool_hosts=pool_hosts,
+                              pool_connections_per_host=pool_connections_per_host, pool_block=pool_block,
+                              retries=retries, backoff_factor=backoff_factor, max_retry_wait=max_retry_wait,
+                              max_bytes=max_bytes,
+                              content_types=content_types, cache=cache)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.content_types = None if content_types is None else frozenset(t.lower() for t in content_types)
+        self._lock = threading.Lock()
+        self._fetches = 0
+        self._requests = 0
+        self._reused = 0
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+        retry = _CappedRetry(total=retries, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+                             raise_on_status=False, max_wait=max_retry_wait)
+        adapter = _CountingAdapter(self._record_request, pool_connections=pool_hosts,
+                                   pool_maxsize=pool_connections_per_host, pool_block=pool_block,
+                                   max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str, headers: Optional[dict] = None) -> str:
+        """
+        Fetch HTML content from a URL.
+
+        Args:
+            url: The URL to fetch
+            headers: Headers added to the fetcher's headers for this request
+
+        Returns:
+            str: HTML content, decoded as parsing.decode_html() does
+
+        Raises:
+            requests.RequestException: If the request fails after its retries, or
+                with UnsupportedContentType or ResponseTooLarge
+            ValueError: If the URL is invalid
+        """
+        return decode_html(*self.fetch_bytes(url, headers))
+
+    def fetch_markup(self, url: str, headers: Optional[dict] = None) -> Union[str, bytes]:
+        """
+        Fetch HTML content from a URL for parsing.
+
+        Args:
+            url: The URL to fetch
+            headers: Headers added to the fetcher's headers for this request
+
+        Returns:
+            str or bytes: The body as parsing.html_markup() prepares it, bytes
+            whenever the parser will find the right encoding itself
+
+        Raises:
+            requests.RequestException: If the request fails after its retries, or
+                with UnsupportedContentType or ResponseTooLarge
+            ValueError: If the URL is invalid
+        """
+        return html_markup(*self.fetch_bytes(url, headers))
+
+    def fetch_bytes(self, url: str, headers: Optional[dict] = None) -> Tuple[bytes, Optional[str]]:
+        """
+        Stream the raw body of a URL, or take it from the cache.
+
+        Args:
+            url: The URL to fetch
+            headers: Headers added to the fetcher's headers for this request
+
+        Returns:
+            tuple: The body and the charset of the Content-Type header, or None
+
+        Raises:
+            requests.RequestException: If the request fails after its retries, or
+                with UnsupportedContentType or ResponseTooLarge
+            ValueError: If the URL is invalid
+        """
+        if not url or not isinstance(url, str):
+            raise ValueError("URL must be a non-empty string")
+        with self._lock:
+            self._fetches += 1
+        cache = self.cache
+        entry = None
+        if cache is not None:
+            entry = cache.lookup(url)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    return entry.body, entry.charset
+                headers = {**cache.conditional_headers(entry), **(headers or {})}
+        try:
+            with self.session.get(url, timeout=self.timeout, headers=headers, stream=True) as response:
+                if entry is not None and response.status_code == 304:
+                    # Read the empty body so the connection goes back to the pool
+                    response.content
+                    cache.revalidated(url, entry, response.headers)
+                    return entry.body, entry.charset
+                response.raise_for_status()
+                body, charset = self._read_body(response)
+                if cache is not None:
+                    cache.update(url, body, charset, response.headers)
+                return body, charset
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch URL {url}: {e}")
+            raise
+
+    def _read_body(self, response: requests.Response) -> Tuple[bytes, Optional[str]]:
+        """Check a streamed response's headers, then read its body up to max_bytes."""
+        media_type, charset = _parse_content_type(response.headers.get('Content-Type', ''))
+        if self.content_types is not None and media_type and media_type not in self.content_types:
+            raise UnsupportedContentType(f"Unsupported Content-Type {media_type}: {response.url}",
+                                         response=response)
+        max_bytes = self.max_bytes
+        if max_bytes is not None:
+            length = response.headers.get('Content-Length', '')
+            # Content-Length counts encoded bytes, so it only rules out larger bodies
+            if length.isdigit() and int(length) > max_bytes:
+                raise ResponseTooLarge(f"Content-Length {length} exceeds {max_bytes} bytes: {response.url}",
+                                       response=response)
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise ResponseTooLarge(f"Body exceeds {max_bytes} bytes: {response.url}", response=response)
+            chunks.append(chunk)
+        return b''.join(chunks), charset
+
+    def _record_request(self, reused: bool) -> None:
+        """Count an HTTP request sent by the connection pools."""
+        with self._lock:
+            self._requests += 1
+            self._reused += reused
+
+    def stats(self) -> FetchStats:
+        """
+        Report how many URLs were fetched and how often connections were reused.
+
+        Returns:
+            FetchStats: fetch() calls, HTTP requests sent including retries and
+            redirects, and the requests that opened or reused a connection
+        """
+        with self._lock:
+            return FetchStats(self._fetches, self._requests, self._requests - self._reused, self._reused)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'Fetcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        return self._settings
+
+    def __setstate__(self, settings: dict) -> None:
+        self.__init__(**settings)
+
+
+def _parse_content_type(content_type: str) -> Tuple[str, Optional[str]]:
+    """Split a Content-Type header into its lowercase media type and its charset, or None."""
+    media_type, _, parameters = content_type.partition(';')
+    charset = None
+    for parameter in parameters.split(';'):
+        name, _, value = parameter.partition('=')
+        if name.strip().lower() == 'charset':
+            charset = value.strip().strip('"\'') or None
+    return media_type.strip().lower(), charset
+
+
+class _CappedRetry(Retry):
+    """Retry that waits at most max_wait seconds, whatever the backoff or Retry-After header asks for."""
+
+    def __init__(self, *args, max_wait: float = MAX_RETRY_WAIT, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_wait = max_wait
+
+    def new(self, **kwargs) -> '_CappedRetry':
+        retry = super().new(**kwargs)
+        retry.max_wait = self.max_wait
+        return retry
+
+    def get_backoff_time(self) -> float:
+        return min(super().get_backoff_time(), self.max_wait)
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_wait)
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every request they send."""
+
+    def __init__(self, record: Callable[[bool], None], **kwargs):
+        self._record = record
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _counting_pool(pool_class, self._record)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+def _counting_pool(pool_class: type, record: Callable[[bool], None]) -> type:
+    """Subclass a urllib3 connection pool to report whether each request reuses an open connection."""
+    class CountingPool(pool_class):
+        def _make_request(self, conn, *args, **kwargs):
+            # Connections connect lazily, so an open socket means a reused one
+            record(getattr(conn, 'sock', None) is not None)
+            return super()._make_request(conn, *args, **kwargs)
+
+    CountingPool.__name__ = CountingPool.__qualname__ = f"Counting{pool_class.__name__}"
+    return CountingPool
+
+
+_default_lock = threading.Lock()
+_default_fetcher = None
+_default_pid = None
+
+
+def get_default_fetcher() -> Fetcher:
+    """
+    Return the Fetcher shared by URL inputs in this process, creating it on first use.
+
+    A forked process creates its own instead of sharing the parent's connections.
+    """
+    global _default_fetcher, _default_pid
+    pid = os.getpid()
+    if _default_pid != pid:
+        with _default_lock:
+            if _default_pid != pid:
+                _default_fetcher = Fetcher()
+                _default_pid = pid
+    return _default_fetcher
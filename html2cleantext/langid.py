@@ -0,0 +1,277 @@
+"""
+Batch language identification with NumPy.
+
+langdetect scores a document by repeatedly sampling its character n-grams
+in a pure-Python loop. BatchLanguageDetector extracts the same n-grams
+from the same langdetect profiles, but scores every document of a batch
+at once: the n-gram counts of a group of documents are gathered against a
+matrix of log n-gram probabilities and summed per document with NumPy.
+The highest scoring language is the one langdetect's sampling converges
+to for all but borderline texts.
+
+Requires NumPy (``pip install html2cleantext[batch]``).
+"""
+
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("html2cleantext.langid requires NumPy: pip install html2cleantext[batch]") from e
+
+from langdetect import detector_factory
+from langdetect.detector import Detector
+from langdetect.utils.ngram import NGram
+
+from .utils import (
+    DETECTION_CONFIDENCE, DETECTION_SAMPLE_SIZE, LanguageDetector, _detection_samples, _load_langdetect_profiles
+)
+
+# Documents are scored in groups of about this many n-gram rows, which
+# bounds the size of the gathered probability matrix
+GROUP_ROWS = 1 << 16
+# Words whose n-gram ids are remembered before the word caches are emptied
+WORD_CACHE_SIZE = 200000
+
+# Characters langdetect counts as Latin and as non-Latin when deciding
+# whether to drop the Latin ones from mostly non-Latin text
+_LATIN_RE = re.compile(r'[A-z]')
+_NON_LATIN_RE = re.compile('[\u0300-\U0010FFFF]')
+# langdetect only reads this many characters of a text
+_MAX_TEXT_LENGTH = 10000
+
+
+class _NormalizationTable(dict):
+    """str.translate table applying langdetect's per-character normalization."""
+
+    def __missing__(self, code: int) -> str:
+        normalized = self[code] = NGram.normalize(chr(code))
+        return normalized
+
+
+_normalization_table = _NormalizationTable()
+
+
+class BatchLanguageDetector:
+    """
+    Vectorized language detector for many documents at once.
+
+    Each document is sampled like detect_language() does, cleaned and split
+    into the 1-3 character n-grams langdetect uses. Instead of langdetect's
+    randomized sampling, every n-gram contributes the log of its smoothed
+    probability in each language, and the language with the highest sum
+    wins.
+
+    Args:
+        detector (LanguageDetector, optional): Detector whose candidate
+            languages to choose between; all langdetect languages if None
+        sample_size (int, optional): Character budget passed to the same
+            sampling as detect_language(); None reads the whole text
+            (default: DETECTION_SAMPLE_SIZE)
+        confidence (float): Probability of the start and middle slices'
+            best language above which the end slice is not read
+            (default: DETECTION_CONFIDENCE)
+    """
+
+    def __init__(self, detector: Optional[LanguageDetector] = None,
+                 sample_size: Optional[int] = DETECTION_SAMPLE_SIZE,
+                 confidence: float = DETECTION_CONFIDENCE):
+        if detector is None:
+            _load_langdetect_profiles()
+            factory = detector_factory._factory
+        else:
+            factory = detector._factory
+
+        self.languages = tuple(factory.langlist)
+        self.sample_size = sample_size
+        self.confidence = confidence
+        self._vocabulary = {word: index for index, word in enumerate(factory.word_lang_prob_map)}
+        # langdetect multiplies by (alpha / BASE_FREQ + p) for each sampled n-gram
+        smoothing = Detector.ALPHA_DEFAULT / Detector.BASE_FREQ
+        self._log_probabilities = np.log(
+            np.array(list(factory.word_lang_prob_map.values()), dtype=np.float64) + smoothing
+        )
+        # word -> n-gram ids, for words followed by a space and words ending the text
+        self._word_ngrams: Dict[str, np.ndarray] = {}
+        self._final_word_ngrams: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def detect(self, texts: Iterable[str]) -> List[Optional[str]]:
+        """
+        Detect the language of each text.
+
+        Args:
+            texts (iterable): Texts to analyze
+
+        Returns:
+            list: Language code for each text, or None where detect_language()
+            would return None (non-strings, text under 10 characters, or no n-grams)
+        """
+        results = []
+        first_samples = []
+        full_samples = {}
+        for index, text in enumerate(texts):
+            results.append(None)
+            if not text or not isinstance(text, str):
+                continue
+            samples = _detection_samples(text, self.sample_size)
+            first_samples.append((index, samples[0]))
+            if len(samples) > 1:
+                full_samples[index] = samples[-1]
+
+        # Like detect_language(), only add the end slice to long texts when
+        # the start and middle slices are not confident enough
+        for index, best, probability in self._score_samples(first_samples):
+            if index not in full_samples or probability >= self.confidence:
+                results[index] = self.languages[best]
+                full_samples.pop(index, None)
+        for index, best, _ in self._score_samples(full_samples.items()):
+            results[index] = self.languages[best]
+        return results
+
+    def _score_samples(self, samples: Iterable[Tuple[int, str]]) -> Iterator[Tuple[int, int, float]]:
+        """Yield the index, best language index and its probability for each detectable sample."""
+        group_ids = []
+        group_counts = []
+        group_documents = []
+        group_rows = 0
+        for index, sample in samples:
+            ngrams = self._ngram_counts(sample)
+            if ngrams is None:
+                continue
+            ids, counts = ngrams
+            group_ids.append(ids)
+            group_counts.append(counts)
+            group_documents.append(index)
+            group_rows += len(ids)
+            if group_rows >= GROUP_ROWS:
+                yield from self._score_group(group_ids, group_counts, group_documents)
+                group_ids, group_counts, group_documents, group_rows = [], [], [], 0
+        if group_ids:
+            yield from self._score_group(group_ids, group_counts, group_documents)
+
+    def _score_group(self, group_ids: List[np.ndarray], group_counts: List[np.ndarray],
+                     group_documents: List[int]) -> Iterator[Tuple[int, int, float]]:
+        """Sum the weighted log probabilities of each document's n-grams and pick the best language."""
+        ids = np.concatenate(group_ids)
+        counts = np.concatenate(group_counts)
+        starts = np.zeros(len(group_ids), dtype=np.intp)
+        np.cumsum([len(document_ids) for document_ids in group_ids[:-1]], out=starts[1:])
+
+        scores = np.add.reduceat(self._log_probabilities[ids] * counts[:, None], starts, axis=0)
+        best = scores.argmax(axis=1)
+        # Probability of the best language, normalizing the likelihoods over all languages
+        scores -= scores[np.arange(len(best)), best][:, None]
+        probabilities = 1.0 / np.exp(scores).sum(axis=1)
+        yield from zip(group_documents, best.tolist(), probabilities.tolist())
+
+    def _ngram_counts(self, sample: str) -> Optional[tuple]:
+        """Return the n-gram ids of a sample and how often each occurs, or None if there are none."""
+        if len(sample) < 10:
+            return None
+
+        # The cleaning langdetect's Detector.append() and cleaning_text() do
+        sample = Detector.URL_RE.sub(' ', sample)
+        sample = Detector.MAIL_RE.sub(' ', sample)
+        sample = NGram.normalize_vi(sample)[:_MAX_TEXT_LENGTH]
+        non_latin = len(_NON_LATIN_RE.findall(sample))
+        if non_latin and len(_LATIN_RE.findall(sample)) * 2 < non_latin:
+            sample = _LATIN_RE.sub('', sample)
+
+        normalized = sample.translate(_normalization_table)
+        words = normalized.split(' ')
+        # The last word only gets the n-grams ending in a space if one follows it
+        final_word = words.pop()
+
+        word_ngrams = self._word_ngrams
+        ids = []
+        repeats = []
+        lengths = []
+        for word, count in Counter(words).items():
+            if not word:
+                continue
+            word_ids = word_ngrams.get(word)
+            if word_ids is None:
+                word_ids = self._cache_word(word, True)
+            if len(word_ids):
+                ids.append(word_ids)
+                repeats.append(count)
+                lengths.append(len(word_ids))
+        if final_word:
+            word_ids = self._final_word_ngrams.get(final_word)
+            if word_ids is None:
+                word_ids = self._cache_word(final_word, False)
+            if len(word_ids):
+                ids.append(word_ids)
+                repeats.append(1)
+                lengths.append(len(word_ids))
+
+        if not ids:
+            return None
+        return np.concatenate(ids), np.repeat(np.array(repeats, dtype=np.float64), lengths)
+
+    def _cache_word(self, word: str, spaced: bool) -> np.ndarray:
+        """Return and cache the ids of the profile n-grams langdetect extracts from a word."""
+        word_ids = np.array(_word_ngrams(word, spaced, self._vocabulary), dtype=np.intp)
+        cache = self._word_ngrams if spaced else self._final_word_ngrams
+        with self._lock:
+            if len(cache) >= WORD_CACHE_SIZE:
+                cache.clear()
+            cache[word] = word_ids
+        return word_ids
+
+
+def _word_ngrams(word: str, spaced: bool, vocabulary: Dict[str, int]) -> List[int]:
+    """
+    Return the vocabulary ids of the n-grams langdetect's NGram buffer yields for a word.
+
+    The buffer holds the last three characters, starting from the space
+    before the word. After each character it yields the 1, 2 and 3
+    character suffixes, except a lone space, and nothing while the last two
+    characters are both upper case.
+    """
+    padded = f" {word} " if spaced else f" {word}"
+    ids = []
+    for end in range(2, len(padded) + 1):
+        if padded[end - 1].isupper() and padded[end - 2].isupper():
+            continue
+        for n in (1, 2, 3):
+            if n > end:
+                break
+            gram = padded[end - n:end]
+            if gram != ' ':
+                index = vocabulary.get(gram)
+                if index is not None:
+                    ids.append(index)
+    return ids
+
+
+@lru_cache(maxsize=8)
+def _get_batch_detector(detector: Optional[LanguageDetector], sample_size: Optional[int]) -> BatchLanguageDetector:
+    """Return the shared batch detector for a detector and sample size."""
+    return BatchLanguageDetector(detector, sample_size)
+
+
+def detect_languages(texts: Iterable[str], detector: Optional[LanguageDetector] = None,
+                     sample_size: Optional[int] = DETECTION_SAMPLE_SIZE) -> List[Optional[str]]:
+    """
+    Detect the language of many texts at once.
+
+    Uses a shared BatchLanguageDetector for each detector and sample size,
+    so the profile matrix is built once.
+
+    Args:
+        texts (iterable): Texts to analyze
+        detector (LanguageDetector, optional): Detector whose candidate
+            languages to choose between; all langdetect languages if None
+        sample_size (int, optional): Character budget for sampling each text
+            (default: DETECTION_SAMPLE_SIZE)
+
+    Returns:
+        list: Language code for each text, or None if detection fails
+    """
+    return _get_batch_detector(detector, sample_size).detect(texts)
@@ -0,0 +1,403 @@
+"""
+HTML parsing helpers shared by the conversion pipeline.
+
+The single-parse pipeline parses a document once into an lxml tree, runs
+attribute cleaning and boilerplate extraction on that tree, and only then
+builds the BeautifulSoup tree used by the link, image and output stages.
+
+BeautifulSoup trees can drop unwanted attributes while they are built, so
+no separate attribute cleaning walk is needed. Scripts, styles, inline SVG,
+comments and base64 data URIs can also be pruned from the markup before it
+is parsed at all.
+"""
+
+import codecs
+import logging
+import re
+import threading
+from typing import Iterable, Optional, Tuple, Union
+
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup
+from bs4.builder import LXMLTreeBuilder
+
+logger = logging.getLogger(__name__)
+
+# lxml parser objects must not be shared between threads
+_local = threading.local()
+
+# Start of a comment, markup declaration, processing instruction or tag
+_TAG_START = re.compile(r'<(?:(!--)|[!?]|(/?)([a-zA-Z][^\s/>]*))')
+# End of a tag, or the start of a quoted attribute value
+_TAG_STOP = re.compile(r'''>|=\s*["']''')
+# Raw text elements end at the first matching end tag, even inside JS strings
+_RAW_TEXT_END = {
+    'script': re.compile(r'</script[\s/>]', re.I),
+    'style': re.compile(r'</style[\s/>]', re.I),
+}
+# Escapable raw text elements hold text, not markup, up to their end tag
+_RCDATA_END = {
+    'textarea': re.compile(r'</textarea[\s/>]', re.I),
+    'title': re.compile(r'</title[\s/>]', re.I),
+}
+_DATA_URI = re.compile(r'data:', re.I)
+_DATA_URI_PAYLOAD = re.compile(r'(data:[\w.+/-]*(?:;[\w.+-]+=[\w.+-]*)*;base64,)[A-Za-z0-9+/=%]+', re.I)
+# Byte order marks and the encodings they select, which override any declaration
+_BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb'''<meta[^>]*?charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)''', re.I)
+# Bytes searched for a <meta> charset declaration, as in the HTML prescan
+META_PRESCAN_BYTES = 1024
+
+
+def parse_html(html_content: Union[str, bytes]) -> lxml.html.HtmlElement:
+    """
+    Parse HTML content into an lxml document tree.
+
+    Args:
+        html_content (str or bytes): HTML markup to parse
+
+    Returns:
+        lxml.html.HtmlElement: Root ``<html>`` element of the parsed document.
+        Empty documents yield an empty ``<html>`` element.
+    """
+    parser = _get_parser()
+    try:
+        try:
+            root = lxml.html.document_fromstring(html_content, parser=parser)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration are rejected by lxml
+            root = lxml.html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+    except etree.ParserError:
+        return lxml.html.Element('html')
+    # Even with huge_tree, libxml2 stops at a nesting depth of 2048 and
+    # drops the rest of the document
+    error = parser.error_log.last_error
+    if error is not None and error.type_name == 'ERR_RESOURCE_LIMIT':
+        logger.warning(f"HTML truncated while parsing: {error.message}")
+    return root
+
+
+def html_markup(body: bytes, declared_encoding: Optional[str] = None) -> Union[str, bytes]:
+    """
+    Prepare an HTML response body for parse_html() and parse_soup().
+
+    The encoding is taken from a byte order mark, then the declared (HTTP
+    header) charset, then a ``<meta>`` charset in the first
+    META_PRESCAN_BYTES, as browsers do. When the parser would find the same
+    encoding in the markup itself, or the body is ASCII, the bytes are
+    returned unchanged for it to decode. Otherwise the body is decoded once
+    here: with the declared charset, or as UTF-8 falling back to
+    windows-1252 when nothing is declared, instead of the parser's Latin-1.
+
+    Args:
+        body (bytes): Raw HTML response body
+        declared_encoding (str, optional): Charset from the Content-Type header
+
+    Returns:
+        str or bytes: Markup to parse
+    """
+    encoding, in_markup = _markup_encoding(body, declared_encoding)
+    if in_markup or body.isascii():
+        return body
+    return _decode(body, encoding)
+
+
+def decode_html(body: bytes, declared_encoding: Optional[str] = None) -> str:
+    """
+    Decode an HTML response body with the encoding html_markup() would use.
+
+    Args:
+        body (bytes): Raw HTML response body
+        declared_encoding (str, optional): Charset from the Content-Type header
+
+    Returns:
+        str: Decoded markup
+    """
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return body[len(bom):].decode(encoding, 'replace')
+    return _decode(body, _markup_encoding(body, declared_encoding)[0])
+
+
+def _markup_encoding(body: bytes, declared_encoding: Optional[str]) -> Tuple[Optional[str], bool]:
+    """Return the encoding of a body, or None if unknown, and whether the parser would find it in the markup."""
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding, True
+    declared = _codec_name(declared_encoding)
+    match = _META_CHARSET.search(body, 0, META_PRESCAN_BYTES)
+    meta = _codec_name(match.group(1).decode('ascii')) if match else None
+    if declared is not None:
+        return declared, declared == meta
+    return meta, meta is not None
+
+
+def _codec_name(encoding: Optional[str]) -> Optional[str]:
+    """Return the normalized name of a codec, or None if it is unknown or not given."""
+    if not encoding:
+        return None
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+
+def _decode(body: bytes, encoding: Optional[str]) -> str:
+    """Decode a body, as UTF-8 falling back to windows-1252 if the encoding is unknown."""
+    if encoding is not None:
+        return body.decode(encoding, 'replace')
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError:
+        return body.decode('windows-1252', 'replace')
+
+
+def _get_parser() -> lxml.html.HTMLParser:
+    """Return this thread's HTML parser."""
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        # Only keep a doctype that is actually in the document, like BeautifulSoup;
+        # huge_tree lifts libxml2's nesting limit, which silently drops deeper content
+        parser = _local.parser = lxml.html.HTMLParser(default_doctype=False, huge_tree=True)
+    return parser
+
+
+def prune_html(html_content: str) -> Tuple[str, int]:
+    """
+    Strip scripts, styles, inline SVG, comments and base64 data URIs from markup.
+
+    A single left-to-right scan that tokenizes tags the way an HTML parser
+    does: quoted attribute values are skipped, and ``<script>``/``<style>``
+    end at the first ``</script``/``</style`` end tag, so one inside a
+    JavaScript string closes the element just as it does for the parser.
+    ``<title>`` and ``<textarea>`` contents are text to the parser, so
+    comment- or tag-like text in them is kept. Unterminated comments,
+    scripts and styles run to the end of the input.
+    An ``<svg>`` that is never closed is kept, since the parser would wrap
+    the rest of the document in it. Data URIs keep their media type and
+    lose only the base64 payload.
+
+    Args:
+        html_content (str): HTML markup to prune
+
+    Returns:
+        tuple: The pruned markup and the number of UTF-8 bytes removed
+    """
+    pieces = []
+    removed = 0
+    flushed = 0     # html_content[flushed:pos] is kept but not yet copied
+    pos = 0
+    svg_depth = 0
+    svg_start = 0
+    prune_svg = True
+    length = len(html_content)
+
+    while True:
+        match = _TAG_START.search(html_content, pos)
+        if match is None:
+            if svg_depth:
+                # Unclosed <svg>: keep it and rescan after its start tag
+                svg_depth = 0
+                prune_svg = False
+                pos = flushed = svg_start
+                continue
+            break
+        start = match.start()
+
+        if match.group(1):
+            if html_content.startswith('>', start + 4):
+                end = start + 5     # empty <!--> comment
+            elif html_content.startswith('->', start + 4):
+                end = start + 6     # empty <!---> comment
+            else:
+                end = html_content.find('-->', start + 4)
+                end = length if end == -1 else end + 3
+            if not svg_depth:
+                pieces.append(html_content[flushed:start])
+                removed += _utf8_length(html_content[start:end])
+                flushed = end
+            pos = end
+            continue
+
+        name = match.group(3)
+        if name is None:
+            # <!DOCTYPE ...>, <?xml ...?> and bogus comments end at the next '>'
+            end = html_content.find('>', match.end())
+            pos = length if end == -1 else end + 1
+            continue
+
+        end = _find_tag_end(html_content, match.end())
+        if end == -1:
+            # Unterminated tag: leave the rest to the parser
+            pos = length
+            continue
+        name = name.lower()
+        closing = match.group(2)
+
+        if name in _RAW_TEXT_END and not closing:
+            close = _RAW_TEXT_END[name].search(html_content, end)
+            if close is None:
+                end = length
+            else:
+                end = _find_tag_end(html_content, close.end() - 1)
+                if end == -1:
+                    end = length
+            if not svg_depth:
+                pieces.append(html_content[flushed:start])
+                removed += _utf8_length(html_content[start:end])
+                flushed = end
+        elif name in _RCDATA_END and not closing and not svg_depth:
+            # Skip the text; an unterminated element runs to the end of the input
+            close = _RCDATA_END[name].search(html_content, end)
+            end = length if close is None else close.start()
+        elif name == 'svg' and prune_svg:
+            if closing:
+                if svg_depth:
+                    svg_depth -= 1
+                    if not svg_depth:
+                        removed += _utf8_length(html_content[svg_start:end])
+                        flushed = end
+            elif html_content[end - 2] != '/':
+                if not svg_depth:
+                    svg_start = start
+                    pieces.append(html_content[flushed:start])
+                svg_depth += 1
+            elif not svg_depth:
+                pieces.append(html_content[flushed:start])
+                removed += _utf8_length(html_content[start:end])
+                flushed = end
+        elif not svg_depth and _DATA_URI.search(html_content, start, end):
+            tag = html_content[start:end]
+            pruned_tag = _DATA_URI_PAYLOAD.sub(r'\1', tag)
+            if len(pruned_tag) != len(tag):
+                pieces.append(html_content[flushed:start])
+                pieces.append(pruned_tag)
+                removed += len(tag) - len(pruned_tag)
+                flushed = end
+        pos = end
+
+    if not pieces:
+        return html_content, 0
+    pieces.append(html_content[flushed:])
+    return ''.join(pieces), removed
+
+
+def _find_tag_end(html_content: str, pos: int) -> int:
+    """Return the index just past the '>' closing the tag, or -1 if it is unterminated."""
+    while True:
+        match = _TAG_STOP.search(html_content, pos)
+        if match is None:
+            return -1
+        if match.group() == '>':
+            return match.end()
+        close = html_content.find(match.group()[-1], match.end())
+        if close == -1:
+            return -1
+        pos = close + 1
+
+
+def _utf8_length(text: str) -> int:
+    """Return the UTF-8 encoded length of text."""
+    return len(text.encode('utf-8', 'surrogatepass'))
+
+
+def parse_soup(html_content: Union[str, bytes], keep_attributes: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """
+    Parse HTML content into a BeautifulSoup document with the lxml parser.
+
+    Args:
+        html_content (str or bytes): HTML markup to parse
+        keep_attributes (list, optional): Attribute names to keep; all other
+            attributes are dropped as tags are created. Keeps every attribute if None.
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    return BeautifulSoup(html_content, builder=_AttributeFilterBuilder(keep_attributes))
+
+
+def soup_from_tree(element: lxml.html.HtmlElement,
+                   keep_attributes: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup document from an lxml tree without serializing it.
+
+    The tree is replayed through BeautifulSoup's own lxml tree builder, so the
+    result is the same soup that parsing the serialized tree would produce.
+
+    Args:
+        element (lxml.html.HtmlElement): Root of the tree to convert
+        keep_attributes (list, optional): Attribute names to keep; all other
+            attributes are dropped as tags are created. Keeps every attribute if None.
+
+    Returns:
+        BeautifulSoup: Equivalent BeautifulSoup document
+    """
+    return BeautifulSoup("", builder=_TreeReplayBuilder(element, keep_attributes))
+
+
+class _AttributeFilterBuilder(LXMLTreeBuilder):
+    """
+    BeautifulSoup lxml tree builder that only keeps whitelisted attributes.
+
+    The builder is the lxml parser target, so attributes are filtered before
+    BeautifulSoup creates each tag.
+    """
+
+    def __init__(self, keep_attributes: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.keep_attributes = None if keep_attributes is None else frozenset(keep_attributes)
+
+    def start(self, name, attrs, nsmap={}):
+        keep_attributes = self.keep_attributes
+        if keep_attributes is not None and attrs:
+            attrs = {key: value for key, value in attrs.items() if key in keep_attributes}
+        return super().start(name, attrs, nsmap)
+
+
+class _TreeReplayBuilder(_AttributeFilterBuilder):
+    """
+    BeautifulSoup tree builder that replays an existing lxml tree.
+
+    ``LXMLTreeBuilder`` is an lxml parser target; instead of feeding markup to
+    a parser, this builder walks the tree and calls the target callbacks
+    directly.
+    """
+
+    def __init__(self, element: lxml.html.HtmlElement, keep_attributes: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(keep_attributes, **kwargs)
+        self.element = element
+
+    def feed(self, markup) -> None:
+        root = self.element
+        if root.getparent() is None:
+            docinfo = root.getroottree().docinfo
+            if docinfo.doctype:
+                self.doctype(docinfo.root_name, docinfo.public_id, docinfo.system_url)
+
+        self._open(root)
+        stack = [(root, iter(root))]
+        while stack:
+            parent, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                self.end(parent.tag)
+                if stack and parent.tail:
+                    self.data(parent.tail)
+            elif isinstance(child.tag, str):
+                self._open(child)
+                stack.append((child, iter(child)))
+            else:
+                if child.tag is etree.Comment:
+                    self.comment(child.text or "")
+                elif child.tag is etree.ProcessingInstruction:
+                    self.pi(child.target, child.text or "")
+                if child.tail:
+                    self.data(child.tail)
+
+    def _open(self, element: lxml.html.HtmlElement) -> None:
+        self.start(element.tag, dict(element.attrib))
+        if element.text:
+            self.data(element.text)
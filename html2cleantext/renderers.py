@@ -0,0 +1,496 @@
+"""
+Renderers that turn a cleaned BeautifulSoup tree into Markdown or plain text.
+
+The renderers walk the tree that the cleaning stages already built instead of
+serializing it and handing the markup to a second parser.
+"""
+
+import re
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, Tag, NavigableString
+from bs4.element import Comment, Doctype, PreformattedString
+
+# Whitespace handling (mirrors markdownify so the output stays identical)
+_WHITESPACE_RE = re.compile(r'[\t ]+')
+_ALL_WHITESPACE_RE = re.compile(r'[\t \r\n]+')
+_NEWLINE_WHITESPACE_RE = re.compile(r'[\t \r\n]*[\r\n][\t \r\n]*')
+_LINE_WITH_CONTENT_RE = re.compile(r'^(.*)', flags=re.MULTILINE)
+_EXTRACT_NEWLINES_RE = re.compile(r'^(\n*)((?:.*[^\n])?)(\n*)$', flags=re.DOTALL)
+_PRE_LSTRIP_RE = re.compile(r'^[ \n]*\n')
+_PRE_RSTRIP_RE = re.compile(r'[ \n]*$')
+_BACKTICK_RUNS_RE = re.compile(r'`+')
+_HEADING_RE = re.compile(r'h(\d+)')
+
+# Elements whose leading/trailing whitespace is insignificant
+_BLOCK_TAGS = frozenset([
+    'p', 'blockquote', 'article', 'div', 'section', 'ol', 'ul', 'li',
+    'dl', 'dt', 'dd', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th',
+])
+_NOFORMAT_TAGS = frozenset(['pre', 'code', 'kbd', 'samp'])
+_INLINE_MARKUP = {
+    'b': '**', 'strong': '**',
+    'em': '*', 'i': '*',
+    'del': '~~', 's': '~~',
+    'sub': '', 'sup': '',
+}
+
+# Elements that start a new block in readable plain text
+_TEXT_BLOCK_TAGS = frozenset([
+    'p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'article', 'section', 'br',
+])
+
+_Child = Union[Tag, str]
+
+
+def render_markdown(soup: Union[BeautifulSoup, Tag]) -> str:
+    """
+    Render a cleaned HTML tree as Markdown.
+
+    Produces the same output as ``markdownify(str(soup), heading_style="ATX",
+    bullets="*")`` without serializing the tree and parsing it again.
+
+    Args:
+        soup (BeautifulSoup): Cleaned HTML document
+
+    Returns:
+        str: Markdown text
+    """
+    return MarkdownRenderer().render(soup)
+
+
+class MarkdownRenderer:
+    """
+    Tree-walking Markdown emitter.
+
+    Every element renders its children into one shared output buffer and then
+    replaces that slice of the buffer with its own converted text.
+    """
+
+    bullet = '*'
+
+    def __init__(self):
+        self._out: List[str] = []
+
+    def render(self, soup: Union[BeautifulSoup, Tag]) -> str:
+        """
+        Render a tree as Markdown.
+
+        Args:
+            soup (BeautifulSoup): Cleaned HTML document
+
+        Returns:
+            str: Markdown text
+        """
+        self._out = []
+        self._render_tag(soup, False, False, False, False, 0)
+        text = ''.join(self._out)
+        self._out = []
+        if soup.name == BeautifulSoup.ROOT_TAG_NAME:
+            text = text.strip('\n')
+        return text
+
+    def _render_tag(self, node: Tag, inline: bool, noformat: bool, pre: bool, in_li: bool, position: int) -> None:
+        out = self._out
+        start = len(out)
+        name = node.name
+        is_heading = _HEADING_RE.match(name) is not None
+        remove_inside = is_heading or name in _BLOCK_TAGS
+
+        # Context seen by this element's children
+        child_inline = inline or is_heading or name == 'td' or name == 'th'
+        child_noformat = noformat or name in _NOFORMAT_TAGS
+        child_pre = pre or name == 'pre'
+        child_in_li = in_li or name == 'li'
+
+        children = _merged_children(node)
+        last = len(children) - 1
+        li_position = 0
+        for i, child in enumerate(children):
+            if isinstance(child, Tag):
+                self._render_tag(child, child_inline, child_noformat, child_pre, child_in_li, li_position)
+                if child.name == 'li':
+                    li_position += 1
+                continue
+            if isinstance(child, (Comment, Doctype)):
+                continue
+
+            prev_sibling = children[i - 1] if i > 0 else None
+            next_sibling = children[i + 1] if i < last else None
+            if not child.strip():
+                if remove_inside and (not prev_sibling or not next_sibling):
+                    continue
+                if _is_block_outside(prev_sibling) or _is_block_outside(next_sibling):
+                    continue
+
+            text = str(child)
+            if not child_pre:
+                text = _NEWLINE_WHITESPACE_RE.sub('\n', text)
+                text = _WHITESPACE_RE.sub(' ', text)
+            if not child_noformat:
+                text = text.replace('*', r'\*').replace('_', r'\_')
+            if _is_block_outside(prev_sibling) or (remove_inside and not prev_sibling):
+                text = text.lstrip(' \t\r\n')
+            if _is_block_outside(next_sibling) or (remove_inside and not next_sibling):
+                text = text.rstrip()
+            if text:
+                out.append(text)
+
+        child_strings = out[start:]
+        del out[start:]
+        if not child_pre:
+            child_strings = _collapse_newlines(child_strings)
+        text = ''.join(child_strings)
+
+        if is_heading and not hasattr(self, '_convert_' + name):
+            text = self._convert_heading(int(_HEADING_RE.match(name).group(1)), text, inline)
+        else:
+            convert = getattr(self, '_convert_' + name.replace('-', '_').replace(':', '_'), None)
+            if convert is not None:
+                text = convert(node, text, inline, noformat, in_li, position)
+        if text:
+            out.append(text)
+
+    # Block elements
+
+    def _convert_heading(self, level: int, text: str, inline: bool) -> str:
+        if inline:
+            return text
+        level = max(1, min(6, level))
+        text = _ALL_WHITESPACE_RE.sub(' ', text.strip())
+        return '\n\n%s %s\n\n' % ('#' * level, text)
+
+    def _convert_p(self, el, text, inline, noformat, in_li, position):
+        if inline:
+            return ' ' + text.strip(' \t\r\n') + ' '
+        text = text.strip(' \t\r\n')
+        return '\n\n%s\n\n' % text if text else ''
+
+    def _convert_div(self, el, text, inline, noformat, in_li, position):
+        if inline:
+            return ' ' + text.strip() + ' '
+        text = text.strip()
+        return '\n\n%s\n\n' % text if text else ''
+
+    _convert_article = _convert_div
+    _convert_section = _convert_div
+    _convert_dl = _convert_div
+
+    def _convert_blockquote(self, el, text, inline, noformat, in_li, position):
+        text = (text or '').strip(' \t\r\n')
+        if inline:
+            return ' ' + text + ' '
+        if not text:
+            return '\n'
+        text = _LINE_WITH_CONTENT_RE.sub(_indent_for_blockquote, text)
+        return '\n' + text + '\n\n'
+
+    def _convert_pre(self, el, text, inline, noformat, in_li, position):
+        if not text:
+            return ''
+        text = _PRE_LSTRIP_RE.sub('', text)
+        text = _PRE_RSTRIP_RE.sub('', text)
+        return '\n\n```\n%s\n```\n\n' % text
+
+    def _convert_hr(self, el, text, inline, noformat, in_li, position):
+        return '\n\n---\n\n'
+
+    def _convert_br(self, el, text, inline, noformat, in_li, position):
+        if inline:
+            return text + ' ' if text else ' '
+        return '  \n' + text
+
+    def _convert_list(self, el, text, inline, noformat, in_li, position):
+        before_paragraph = False
+        next_sibling = _next_block_content_sibling(el)
+        if next_sibling and next_sibling.name not in ['ul', 'ol']:
+            before_paragraph = True
+        if in_li:
+            return '\n' + text.rstrip()
+        return '\n\n' + text + ('\n' if before_paragraph else '')
+
+    _convert_ul = _convert_list
+    _convert_ol = _convert_list
+
+    def _convert_li(self, el, text, inline, noformat, in_li, position):
+        text = (text or '').strip()
+        if not text:
+            return "\n"
+
+        parent = el.parent
+        if parent is not None and parent.name == 'ol':
+            start = parent.get("start")
+            if start and str(start).isnumeric():
+                start = int(start)
+            else:
+                start = 1
+            bullet = '%s.' % (start + position)
+        else:
+            bullet = self.bullet
+        bullet = bullet + ' '
+        bullet_indent = ' ' * len(bullet)
+
+        def _indent_for_li(match):
+            line_content = match.group(1)
+            return bullet_indent + line_content if line_content else ''
+        text = _LINE_WITH_CONTENT_RE.sub(_indent_for_li, text)
+
+        return '%s%s\n' % (bullet, text[len(bullet):])
+
+    def _convert_dt(self, el, text, inline, noformat, in_li, position):
+        text = _ALL_WHITESPACE_RE.sub(' ', (text or '').strip())
+        if inline:
+            return ' ' + text + ' '
+        if not text:
+            return '\n'
+        return '\n\n%s\n' % text
+
+    def _convert_dd(self, el, text, inline, noformat, in_li, position):
+        text = (text or '').strip()
+        if inline:
+            return ' ' + text + ' '
+        if not text:
+            return '\n'
+        text = _LINE_WITH_CONTENT_RE.sub(_indent_for_dd, text)
+        return ':%s\n' % text[1:]
+
+    def _convert_caption(self, el, text, inline, noformat, in_li, position):
+        return text.strip() + '\n\n'
+
+    def _convert_figcaption(self, el, text, inline, noformat, in_li, position):
+        return '\n\n' + text.strip() + '\n\n'
+
+    def _convert_script(self, el, text, inline, noformat, in_li, position):
+        return ''
+
+    _convert_style = _convert_script
+
+    # Tables
+
+    def _convert_table(self, el, text, inline, noformat, in_li, position):
+        return '\n\n' + text.strip() + '\n\n'
+
+    def _convert_td(self, el, text, inline, noformat, in_li, position):
+        return ' ' + text.strip().replace("\n", " ") + ' |' * _colspan(el)
+
+    _convert_th = _convert_td
+
+    def _convert_tr(self, el, text, inline, noformat, in_li, position):
+        cells = el.find_all(['td', 'th'])
+        parent = el.parent
+        is_first_row = el.find_previous_sibling() is None
+        is_headrow = (
+            all(cell.name == 'th' for cell in cells)
+            or (parent.name == 'thead' and len(parent.find_all('tr')) == 1)
+        )
+        is_head_row_missing = (
+            (is_first_row and not parent.name == 'tbody')
+            or (is_first_row and parent.name == 'tbody' and len(parent.parent.find_all(['thead'])) < 1)
+        )
+        full_colspan = sum(_colspan(cell) for cell in cells)
+
+        overline = ''
+        underline = ''
+        if is_headrow and is_first_row:
+            underline = '| ' + ' | '.join(['---'] * full_colspan) + ' |\n'
+        elif is_head_row_missing or (
+                is_first_row and (parent.name == 'table'
+                                  or (parent.name == 'tbody' and not parent.find_previous_sibling()))):
+            overline = '| ' + ' | '.join([''] * full_colspan) + ' |\n'
+            overline += '| ' + ' | '.join(['---'] * full_colspan) + ' |\n'
+        return overline + '|' + text + '\n' + underline
+
+    # Inline elements
+
+    def _convert_a(self, el, text, inline, noformat, in_li, position):
+        if noformat:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ''
+        href = el.get('href')
+        title = el.get('title')
+        if text.replace(r'\_', '_') == href and not title:
+            return '<%s>' % href
+        title_part = ' "%s"' % title.replace('"', r'\"') if title else ''
+        return '%s[%s](%s%s)%s' % (prefix, text, href, title_part, suffix) if href else text
+
+    def _convert_code(self, el, text, inline, noformat, in_li, position):
+        if noformat:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ''
+        max_backticks = max((len(run) for run in _BACKTICK_RUNS_RE.findall(text)), default=0)
+        delimiter = '`' * (max_backticks + 1)
+        if max_backticks > 0:
+            text = " " + text + " "
+        return '%s%s%s%s%s' % (prefix, delimiter, text, delimiter, suffix)
+
+    _convert_kbd = _convert_code
+    _convert_samp = _convert_code
+
+    def _convert_img(self, el, text, inline, noformat, in_li, position):
+        alt = el.attrs.get('alt', None) or ''
+        src = el.attrs.get('src', None) or ''
+        title = el.attrs.get('title', None) or ''
+        if inline:
+            return alt
+        title_part = ' "%s"' % title.replace('"', r'\"') if title else ''
+        return '![%s](%s%s)' % (alt, src, title_part)
+
+    def _convert_video(self, el, text, inline, noformat, in_li, position):
+        if inline:
+            return text
+        src = el.attrs.get('src', None) or ''
+        if not src:
+            sources = el.find_all('source', attrs={'src': True})
+            if sources:
+                src = sources[0].attrs.get('src', None) or ''
+        poster = el.attrs.get('poster', None) or ''
+        if src and poster:
+            return '[![%s](%s)](%s)' % (text, poster, src)
+        if src:
+            return '[%s](%s)' % (text, src)
+        if poster:
+            return '![%s](%s)' % (text, poster)
+        return text
+
+    def _convert_q(self, el, text, inline, noformat, in_li, position):
+        return '"' + text + '"'
+
+    def _convert_inline_markup(self, el, text, inline, noformat, in_li, position):
+        if noformat:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ''
+        markup = _INLINE_MARKUP[el.name]
+        return '%s%s%s%s%s' % (prefix, markup, text, markup, suffix)
+
+    _convert_b = _convert_strong = _convert_inline_markup
+    _convert_em = _convert_i = _convert_inline_markup
+    _convert_del = _convert_s = _convert_inline_markup
+    _convert_sub = _convert_sup = _convert_inline_markup
+
+
+def extract_text(soup: Union[BeautifulSoup, Tag]) -> str:
+    """
+    Extract readable plain text from a cleaned HTML tree in one traversal.
+
+    The text of each outermost block element (paragraphs, headings, list
+    items, ...) is extracted once as a single stripped piece; text outside
+    blocks is kept as-is. Pieces are joined with single spaces, like
+    ``soup.get_text(separator=' ', strip=True)``.
+
+    Args:
+        soup (BeautifulSoup): Cleaned HTML document
+
+    Returns:
+        str: Plain text
+    """
+    string_types = soup.interesting_string_types
+    pieces = []
+    stack = [iter(soup.children)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, Tag):
+            if node.name in _TEXT_BLOCK_TAGS:
+                # Nested blocks are covered by the outer block's text
+                text = node.get_text().strip()
+                if text:
+                    pieces.append(text)
+            else:
+                stack.append(iter(node.children))
+        elif type(node) in string_types:
+            text = node.strip()
+            if text:
+                pieces.append(text)
+    return ' '.join(pieces)
+
+
+def _merged_children(node: Tag) -> List[_Child]:
+    """
+    Return the children of a node with adjacent text nodes merged.
+
+    Cleaning stages leave runs of separate strings behind (replaced links,
+    removed images); a parser would see each run as a single text node.
+    Empty strings are dropped for the same reason.
+    """
+    children: List[_Child] = []
+    pending: Optional[List[str]] = None
+    for child in node.children:
+        if isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+            if pending is None:
+                pending = [child]
+            else:
+                pending.append(child)
+            continue
+        if pending is not None:
+            text = ''.join(pending)
+            if text:
+                children.append(text)
+            pending = None
+        children.append(child)
+    if pending is not None:
+        text = ''.join(pending)
+        if text:
+            children.append(text)
+    return children
+
+
+def _is_block_outside(el) -> bool:
+    """Return whether whitespace next to this sibling is insignificant."""
+    if not isinstance(el, Tag):
+        return False
+    name = el.name
+    return name in _BLOCK_TAGS or name == 'pre' or _HEADING_RE.match(name) is not None
+
+
+def _collapse_newlines(child_strings: List[str]) -> List[str]:
+    """Collapse newlines at child boundaries to at most two."""
+    updated = ['']
+    for child_string in child_strings:
+        leading_nl, content, trailing_nl = _EXTRACT_NEWLINES_RE.match(child_string).groups()
+        if updated[-1] and leading_nl:
+            prev_trailing_nl = updated.pop()
+            leading_nl = '\n' * min(2, max(len(prev_trailing_nl), len(leading_nl)))
+        updated.extend((leading_nl, content, trailing_nl))
+    return updated
+
+
+def _next_block_content_sibling(el: Tag) -> Optional[Union[Tag, NavigableString]]:
+    """Return the next sibling that is a tag or non-whitespace text."""
+    while el is not None:
+        el = el.next_sibling
+        if isinstance(el, Tag):
+            return el
+        if isinstance(el, NavigableString) and not isinstance(el, (Comment, Doctype)) and el.strip():
+            return el
+    return None
+
+
+def _chomp(text: str):
+    """Move leading/trailing spaces of inline markup outside the markers."""
+    prefix = ' ' if text and text[0] == ' ' else ''
+    suffix = ' ' if text and text[-1] == ' ' else ''
+    return prefix, suffix, text.strip()
+
+
+def _colspan(cell: Tag) -> int:
+    colspan = cell.attrs.get('colspan')
+    if colspan and colspan.isdigit():
+        return max(1, min(1000, int(colspan)))
+    return 1
+
+
+def _indent_for_blockquote(match) -> str:
+    line_content = match.group(1)
+    return '> ' + line_content if line_content else '>'
+
+
+def _indent_for_dd(match) -> str:
+    line_content = match.group(1)
+    return '    ' + line_content if line_content else ''
@@ -2,9 +2,19 @@
 Utility functions for html2cleantext package.
 """
 
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlsplit
 import requests
-from langdetect import detect, DetectorFactory, LangDetectException
-from typing import Optional
+from langdetect import detect, detect_langs, detector_factory, DetectorFactory, LangDetectException
+from langdetect.detector_factory import PROFILES_DIRECTORY
+from langdetect.language import Language
+from langdetect.utils.lang_profile import LangProfile
+from typing import Iterable, List, NamedTuple, Optional, Tuple
 import logging
 
 # Set seed for consistent language detection results
@@ -12,10 +22,48 @@ DetectorFactory.seed = 0
 
 logger = logging.getLogger(__name__)
 
+# Longer documents are detected from slices of the start, middle and end
+# totalling this many characters
+DETECTION_SAMPLE_SIZE = 3000
+# Skip the end slice once the start and middle slices give the top language
+# at least this probability
+DETECTION_CONFIDENCE = 0.9
+# A script decides the language without langdetect once it has at least this
+# share of the letters
+SCRIPT_DOMINANCE = 0.9
+# Paragraph detection runs langdetect on chunks of at least this many
+# characters, and at most this many times per document
+PARAGRAPH_MIN_LENGTH = 1000
+PARAGRAPH_DETECTIONS = 2
+# Character budget shared by the langdetect calls for one document's paragraphs
+PARAGRAPH_SAMPLE_SIZE = 1500
+
+# Headers sent with every URL request, mimicking a browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# Protected URLs are runs of non-separator characters containing a dot and
+# two letters, like a domain or file name, or an http(s):// scheme
+_URL_SEPARATOR_RE = re.compile(r'[\s\]]')
+_URL_HINT_RE = re.compile(r'\.[a-zA-Z]{2}|https?://')
+_URL_DOT_RE = re.compile(r'\.[a-zA-Z]{2}')
+_PROTECTED_PLACEHOLDER_RE = re.compile(r'__PROTECTED_ITEM_(0|[1-9][0-9]*)__')
+_SPACES_RE = re.compile(r'[ \t]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_MISSING_SPACE_RE = re.compile(r'([.?!])(\w)')
+_SPACE_RUNS_RE = re.compile(r' +')
+# Paragraphs are joined with a control character to count their scripts at once
+_PARAGRAPH_SEPARATOR = '\x1f'
+
 
 def fetch_url(url: str, timeout: int = 30, headers: Optional[dict] = None) -> str:
     """
-    Fetch HTML content from a URL.
+    Fetch HTML content from a URL with a one-off connection.
+
+    URL inputs to the converters use fetching.Fetcher, which reuses
+    connections between requests.
     
     Args:
         url (str): The URL to fetch
@@ -32,16 +80,10 @@ def fetch_url(url: str, timeout: int = 30, headers: Optional[dict] = None) -> st
     if not url or not isinstance(url, str):
         raise ValueError("URL must be a non-empty string")
     
-    # Default headers to mimic a browser request
-    default_headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    if headers:
-        default_headers.update(headers)
+    request_headers = {**DEFAULT_HEADERS, **headers} if headers else DEFAULT_HEADERS
     
     try:
-        response = requests.get(url, timeout=timeout, headers=default_headers)
+        response = requests.get(url, timeout=timeout, headers=request_headers)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -49,28 +91,149 @@ def fetch_url(url: str, timeout: int = 30, headers: Optional[dict] = None) -> st
         raise
 
 
-def detect_language(text: str) -> Optional[str]:
+class LanguageDetector:
+    """
+    langdetect detector that only knows a chosen set of candidate languages.
+
+    Only the candidates' profiles are read, once, when the detector is
+    created; langdetect's own functions load all of its ~55 profiles on
+    first use. The profiles are never modified afterwards, so one detector
+    can be shared between threads. Results are seeded per detector instead
+    of by the global ``DetectorFactory.seed``.
+
+    Args:
+        languages (iterable): Language codes to choose between, e.g. ``['en', 'bn']``
+        seed (int): Seed for langdetect's random sampling (default: 0)
+
+    Raises:
+        ValueError: If fewer than two languages are given, or langdetect
+            has no profile for one of them
+    """
+
+    def __init__(self, languages: Iterable[str], seed: int = 0):
+        languages = tuple(dict.fromkeys(languages))
+        if len(languages) < 2:
+            raise ValueError("LanguageDetector needs at least two candidate languages")
+
+        factory = DetectorFactory()
+        for index, language in enumerate(languages):
+            path = os.path.join(PROFILES_DIRECTORY, language)
+            if not os.path.isfile(path):
+                raise ValueError(f"No langdetect profile for language: {language}")
+            with open(path, encoding='utf-8') as profile:
+                factory.add_profile(LangProfile(**json.load(profile)), index, len(languages))
+        factory.set_seed(seed)
+
+        self.languages = languages
+        self._factory = factory
+
+    def detect(self, text: str) -> str:
+        """
+        Return the most likely candidate language of text.
+
+        Raises:
+            LangDetectException: If the text has no features to detect from
+        """
+        detector = self._factory.create()
+        detector.append(text)
+        return detector.detect()
+
+    def detect_langs(self, text: str) -> List[Language]:
+        """
+        Return the candidate languages of text with their probabilities, most likely first.
+
+        Raises:
+            LangDetectException: If the text has no features to detect from
+        """
+        detector = self._factory.create()
+        detector.append(text)
+        return detector.get_probabilities()
+
+
+_profiles_lock = threading.Lock()
+_profiles_loaded = False
+
+
+def _load_langdetect_profiles() -> None:
+    """
+    Load all of langdetect's profiles once, holding a lock.
+
+    langdetect publishes its shared factory before the profiles are loaded
+    into it, so threads calling detect() concurrently on first use could
+    read a half-loaded factory.
+    """
+    global _profiles_loaded
+    if _profiles_loaded:
+        return
+    with _profiles_lock:
+        if not _profiles_loaded:
+            detector_factory.init_factory()
+            _profiles_loaded = True
+
+
+@lru_cache(maxsize=8)
+def get_language_detector(languages: Tuple[str, ...], seed: int = 0) -> LanguageDetector:
+    """
+    Return the shared LanguageDetector for a tuple of candidate languages.
+
+    Args:
+        languages (tuple): Language codes to choose between
+        seed (int): Seed for langdetect's random sampling (default: 0)
+
+    Returns:
+        LanguageDetector: Detector created on the first call with these arguments
+    """
+    return LanguageDetector(languages, seed)
+
+
+def detect_language(text: str, sample_size: Optional[int] = DETECTION_SAMPLE_SIZE,
+                    confidence: float = DETECTION_CONFIDENCE,
+                    detector: Optional[LanguageDetector] = None) -> Optional[str]:
     """
     Detect the language of the given text.
+
+    Text longer than sample_size is not passed to langdetect whole. The
+    start and middle slices are tried first, and the end slice is only added
+    if their top language is below the confidence threshold.
     
     Args:
         text (str): Text to analyze for language detection
+        sample_size (int, optional): Character budget for the sampled slices;
+            None detects from the whole text (default: DETECTION_SAMPLE_SIZE)
+        confidence (float): Probability at which sampling stops early
+            (default: DETECTION_CONFIDENCE)
+        detector (LanguageDetector, optional): Detector restricted to
+            candidate languages; uses langdetect with all its languages if None
         
     Returns:
         str or None: Language code (e.g., 'en', 'bn') or None if detection fails
     """
     if not text or not isinstance(text, str):
         return None
-    
+
+    if detector is None:
+        _load_langdetect_profiles()
+    samples = _detection_samples(text, sample_size)
+    for sample in samples[:-1]:
+        if len(sample) < 10:
+            continue
+        try:
+            languages = detector.detect_langs(sample) if detector else detect_langs(sample)
+        except LangDetectException:
+            continue
+        if languages and languages[0].prob >= confidence:
+            logger.debug(f"Detected language: {languages[0].lang} from {len(sample)} characters")
+            return languages[0].lang
+
     # Clean text for better detection - remove extra whitespace
-    cleaned_text = ' '.join(text.split())
+    cleaned_text = samples[-1]
     
     # Need at least some text for reliable detection
-    if len(cleaned_text.strip()) < 10:
+    if len(cleaned_text) < 10:
         return None
     
     try:
-        detected_lang = detect(cleaned_text)
+        detected_lang = detector.detect(cleaned_text) if detector else detect(cleaned_text)
         logger.debug(f"Detected language: {detected_lang}")
         return detected_lang
     except LangDetectException as e:
@@ -78,6 +241,379 @@ def detect_language(text: str) -> Optional[str]:
         return None
 
 
+def _detection_samples(text: str, sample_size: Optional[int]) -> List[str]:
+    """
+    Return the whitespace-normalized texts to try, from smallest to largest.
+
+    Args:
+        text (str): Text to sample
+        sample_size (int, optional): Character budget, or None for the whole text
+
+    Returns:
+        list: The whole text, or the start and middle slices followed by
+        the start, middle and end slices
+    """
+    if sample_size is None or len(text) <= sample_size:
+        return [' '.join(text.split())]
+
+    third = sample_size // 3
+    middle = (len(text) - third) // 2
+    start_words = text[:third].split()
+    middle_words = text[middle:middle + third].split()
+    end_words = text[-third:].split()
+
+    # Drop the words cut in half at the slice edges, unless the text has no
+    # spaces to cut at
+    if len(start_words) > 2:
+        start_words = start_words[:-1]
+    if len(middle_words) > 2:
+        middle_words = middle_words[1:-1]
+    if len(end_words) > 2:
+        end_words = end_words[1:]
+
+    start, middle, end = ' '.join(start_words), ' '.join(middle_words), ' '.join(end_words)
+    return [f"{start} {middle}", f"{start} {middle} {end}"]
+
+
+class ScriptDetectionInfo(NamedTuple):
+    """Counts of documents passed to detect_script_language()."""
+    documents: int
+    skipped: int
+
+    @property
+    def skip_rate(self) -> float:
+        """Fraction of documents decided without langdetect."""
+        return self.skipped / self.documents if self.documents else 0.0
+
+
+_script_stats_lock = threading.Lock()
+_script_documents = 0
+_script_skipped = 0
+
+
+def classify_script(text: str, sample_size: Optional[int] = DETECTION_SAMPLE_SIZE) -> Optional[str]:
+    """
+    Classify text by the Unicode script of its letters.
+
+    Counts Bengali (U+0980-U+09FF) and Latin letters in the same start,
+    middle and end samples that detect_language() reads.
+
+    Args:
+        text (str): Text to classify
+        sample_size (int, optional): Character budget for the sampled slices;
+            None counts the whole text (default: DETECTION_SAMPLE_SIZE)
+
+    Returns:
+        str or None: 'bengali', 'latin' or 'other' if that script has at
+        least SCRIPT_DOMINANCE of the letters, 'mixed' if none does, or None
+        if the text has no letters
+    """
+    if not text or not isinstance(text, str):
+        return None
+    return _classify_sample(_detection_samples(text, sample_size)[-1])
+
+
+def _classify_sample(sample: str) -> Optional[str]:
+    """Classify an already sampled text; see classify_script()."""
+    letters, bengali, latin = _script_counts(sample)
+    if not letters:
+        return None
+    threshold = SCRIPT_DOMINANCE * letters
+    if bengali >= threshold:
+        return 'bengali'
+    if latin >= threshold:
+        return 'latin'
+    if letters - bengali - latin >= threshold:
+        return 'other'
+    return 'mixed'
+
+
+class _ScriptClassTable(dict):
+    """
+    str.translate table mapping each letter to its script class.
+
+    Bengali letters (U+0980-U+09FF) become 'b', Latin letters 'l' and other
+    letters 'o'; digits, underscores and non-word characters are dropped,
+    and the paragraph separator is kept.
+    """
+
+    def __missing__(self, code: int) -> Optional[str]:
+        ch = chr(code)
+        if ch == _PARAGRAPH_SEPARATOR:
+            script = ch
+        elif not ch.isalnum() or ch.isdecimal():
+            script = None
+        elif 0x0980 <= code <= 0x09FF:
+            script = 'b'
+        elif (ch.isascii() or 0x00C0 <= code <= 0x024F or 0x1E00 <= code <= 0x1EFF):
+            script = 'l'
+        else:
+            script = 'o'
+        self[code] = script
+        return script
+
+
+_script_classes = _ScriptClassTable()
+
+
+def _script_counts(text: str) -> Tuple[int, int, int]:
+    """Return the number of letters, Bengali letters and Latin letters in text."""
+    classes = text.replace(_PARAGRAPH_SEPARATOR, '').translate(_script_classes)
+    return len(classes), classes.count('b'), classes.count('l')
+
+
+def detect_script_language(text: str, detector: Optional[LanguageDetector] = None,
+                           detect_other: bool = False) -> Optional[str]:
+    """
+    Detect the language to normalize text as, running langdetect only when needed.
+
+    Bengali-script text is 'bn', and text with neither Bengali nor Latin
+    letters gets no language-specific normalization unless detect_other is
+    set, so neither needs langdetect; nor does text too short to detect.
+    Latin-script and mixed text falls back to detect_language().
+    The share of documents decided from the script alone is reported by
+    script_detection_info().
+
+    Args:
+        text (str): Text to analyze
+        detector (LanguageDetector, optional): Detector passed on to
+            detect_language() for Latin-script and mixed text
+        detect_other (bool): Whether to detect the language of text in other
+            scripts too, for normalizers registered for such languages (default: False)
+
+    Returns:
+        str or None: 'bn', a language code from detect_language(), or None
+        if no language-specific normalization applies or detection fails
+    """
+    global _script_documents, _script_skipped
+
+    if not text or not isinstance(text, str):
+        return None
+
+    sample = _detection_samples(text, DETECTION_SAMPLE_SIZE)[-1]
+    # detect_language() gives up on short text before running langdetect
+    script = _classify_sample(sample) if len(sample) >= 10 else None
+    skipped = script != 'mixed' and script != 'latin' and not (script == 'other' and detect_other)
+    with _script_stats_lock:
+        _script_documents += 1
+        _script_skipped += skipped
+
+    if script is None:
+        return None
+    if script == 'bengali':
+        logger.debug("Detected language: bn from script")
+        return 'bn'
+    if script == 'other' and not detect_other:
+        logger.debug("No Bengali or Latin letters, skipping language detection")
+        return None
+    return detect_language(text, detector=detector)
+
+
+def _paragraph_script_counts(paragraphs: List[str]) -> List[Tuple[int, int, int]]:
+    """Return _script_counts() of each paragraph, counting all paragraphs in one pass."""
+    text = _PARAGRAPH_SEPARATOR.join(paragraphs)
+    if text.count(_PARAGRAPH_SEPARATOR) != len(paragraphs) - 1:
+        return [_script_counts(paragraph) for paragraph in paragraphs]
+    return [(len(classes), classes.count('b'), classes.count('l'))
+            for classes in text.translate(_script_classes).split(_PARAGRAPH_SEPARATOR)]
+
+
+def detect_paragraph_languages(paragraphs: List[str], detector: Optional[LanguageDetector] = None,
+                               min_length: int = PARAGRAPH_MIN_LENGTH,
+                               detect_other: bool = False) -> List[Optional[str]]:
+    """
+    Detect the language of each paragraph of one document.
+
+    Paragraphs mostly in Bengali letters are 'bn', and paragraphs mostly in
+    other non-Latin scripts get no language unless detect_other is set,
+    without langdetect.
+    The remaining paragraphs are grouped in document order into chunks of
+    at least min_length characters, at most PARAGRAPH_DETECTIONS of them,
+    and each chunk is detected once with detect_language(), the chunks
+    sharing the PARAGRAPH_SAMPLE_SIZE character budget. Paragraphs without
+    letters take the language of the paragraph before them, or after them
+    at the start of the document. Each call counts as one document in
+    script_detection_info().
+
+    Args:
+        paragraphs (list): Paragraphs of the document, in order
+        detector (LanguageDetector, optional): Detector passed on to detect_language()
+        min_length (int): Smallest number of characters detected at once
+            (default: PARAGRAPH_MIN_LENGTH)
+        detect_other (bool): Whether to detect paragraphs in other scripts too
+            (default: False)
+
+    Returns:
+        list: Language code or None for each paragraph
+    """
+    global _script_documents, _script_skipped
+
+    languages = [None] * len(paragraphs)
+    # Paragraphs without letters, which take a neighbour's language
+    unknown = [False] * len(paragraphs)
+    pending = []
+    pending_length = 0
+    for index, (letters, bengali, latin) in enumerate(_paragraph_script_counts(paragraphs)):
+        paragraph = paragraphs[index]
+        if not letters:
+            unknown[index] = True
+        elif bengali * 2 >= letters:
+            languages[index] = 'bn'
+        elif detect_other or bengali + latin > (1 - SCRIPT_DOMINANCE) * letters:
+            pending.append(index)
+            pending_length += len(paragraph)
+
+    chunks = min(PARAGRAPH_DETECTIONS, -(-pending_length // max(min_length, 1)))
+    with _script_stats_lock:
+        _script_documents += 1
+        _script_skipped += not chunks
+
+    if chunks:
+        target = pending_length / chunks
+        chunk = []
+        chunk_length = 0
+        for position, index in enumerate(pending):
+            chunk.append(index)
+            chunk_length += len(paragraphs[index])
+            if chunk_length >= target or position == len(pending) - 1:
+                language = detect_language('\n'.join(paragraphs[i] for i in chunk),
+                                           sample_size=PARAGRAPH_SAMPLE_SIZE // chunks,
+                                           detector=detector)
+                for i in chunk:
+                    languages[i] = language
+                chunk = []
+                chunk_length = 0
+
+    previous = None
+    first_known = None
+    for index in range(len(paragraphs)):
+        if unknown[index]:
+            languages[index] = previous
+        else:
+            previous = languages[index]
+            if first_known is None:
+                first_known = index
+    if first_known:
+        languages[:first_known] = [languages[first_known]] * first_known
+    return languages
+
+
+def script_detection_info() -> ScriptDetectionInfo:
+    """
+    Return how many documents detect_script_language() decided without langdetect.
+
+    Returns:
+        ScriptDetectionInfo: Documents seen and documents that skipped langdetect
+    """
+    with _script_stats_lock:
+        return ScriptDetectionInfo(_script_documents, _script_skipped)
+
+
+def reset_script_detection_info() -> None:
+    """Reset the counts reported by script_detection_info()."""
+    global _script_documents, _script_skipped
+
+    with _script_stats_lock:
+        _script_documents = _script_skipped = 0
+
+
+class HostLanguageCacheInfo(NamedTuple):
+    """Hit and miss counts of a HostLanguageCache, like functools' CacheInfo."""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class HostLanguageCache:
+    """
+    Bounded LRU cache of the language of pages from each host.
+
+    Pages from one host nearly always share a language. Once ``confirm``
+    pages of a host in a row are detected as the same language, that
+    language becomes the host's prior and later pages reuse it without
+    detection (hits). Every ``verify_every``-th hit is detected anyway
+    (a miss); if it disagrees, the prior is dropped until the host's pages
+    agree again. The cache is safe to share between threads.
+
+    Args:
+        maxsize (int): Number of hosts to remember (default: 1024)
+        confirm (int): Agreeing detections needed before a prior is used (default: 3)
+        verify_every (int): Re-detect one in this many pages with a prior (default: 10)
+        detector (LanguageDetector, optional): Detector passed on to
+            detect_script_language()
+    """
+
+    def __init__(self, maxsize: int = 1024, confirm: int = 3, verify_every: int = 10,
+                 detector: Optional[LanguageDetector] = None):
+        if maxsize < 1 or confirm < 1 or verify_every < 1:
+            raise ValueError("maxsize, confirm and verify_every must be at least 1")
+        self.maxsize = maxsize
+        self.confirm = confirm
+        self.verify_every = verify_every
+        self.detector = detector
+        # host -> [language, agreeing detections in a row, pages since the last detection]
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def detect(self, text: str, url: str, detect_other: bool = False) -> Optional[str]:
+        """
+        Return the language of a page, reusing its host's prior when confident.
+
+        Args:
+            text (str): Page text
+            url (str): URL the page was fetched from
+            detect_other (bool): Passed on to detect_script_language() (default: False)
+
+        Returns:
+            str or None: Language code as from detect_script_language()
+        """
+        host = urlsplit(url).hostname
+        if not host:
+            return detect_script_language(text, self.detector, detect_other)
+
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is not None:
+                self._hosts.move_to_end(host)
+                if entry[1] >= self.confirm and entry[2] + 1 < self.verify_every:
+                    entry[2] += 1
+                    self._hits += 1
+                    return entry[0]
+            self._misses += 1
+
+        language = detect_script_language(text, self.detector, detect_other)
+        if language is None:
+            return None
+
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is not None and entry[0] == language:
+                entry[1] += 1
+                entry[2] = 0
+            else:
+                if entry is not None and entry[1] >= self.confirm:
+                    logger.debug(f"Language prior for {host} changed from {entry[0]} to {language}")
+                self._hosts[host] = [language, 1, 0]
+                self._hosts.move_to_end(host)
+                if len(self._hosts) > self.maxsize:
+                    self._hosts.popitem(last=False)
+        return language
+
+    def cache_info(self) -> HostLanguageCacheInfo:
+        """Return the hit and miss counts and the number of hosts cached."""
+        with self._lock:
+            return HostLanguageCacheInfo(self._hits, self._misses, self.maxsize, len(self._hosts))
+
+    def cache_clear(self) -> None:
+        """Forget all hosts and reset the counts."""
+        with self._lock:
+            self._hosts.clear()
+            self._hits = self._misses = 0
+
+
 def is_url(text: str) -> bool:
     """
     Check if a string is a valid URL.
@@ -152,11 +688,124 @@ def normalize_whitespace(text: str) -> str:
         return ""
     
     # Replace multiple whitespace characters with single spaces
-    import re
-    normalized = re.sub(r'\s+', ' ', text.strip())
+    normalized = _WHITESPACE_RE.sub(' ', text.strip())
     return normalized
 
 
+def protect_items(text: str) -> Tuple[str, List[str]]:
+    """
+    Replace URLs and image placeholders with ``__PROTECTED_ITEM_n__`` tokens.
+
+    Gives the same result as substituting the URL pattern and then the
+    ``[IMAGE:...]`` pattern with re.sub, in linear time. A URL match always
+    runs to the end of a run of non-space, non-``]`` characters, so only the
+    runs containing a dot and two letters or a scheme are looked at, once,
+    instead of being backtracked over from every position.
+
+    Args:
+        text (str): Text to protect
+
+    Returns:
+        tuple: Text with placeholders, and the protected items in placeholder order
+    """
+    # URL spans in the original text. Only runs containing a hint are
+    # looked at; the reversed text finds where such a run starts.
+    url_spans = []
+    length = len(text)
+    reversed_text = None
+    pos = 0
+    while True:
+        hint = _URL_HINT_RE.search(text, pos)
+        if hint is None:
+            break
+        if reversed_text is None:
+            reversed_text = text[::-1]
+        separator = _URL_SEPARATOR_RE.search(reversed_text, length - hint.start())
+        start = length - separator.start() if separator else 0
+        separator = _URL_SEPARATOR_RE.search(text, hint.end())
+        end = separator.start() if separator else length
+        if hint.group()[0] != '.' and not _URL_DOT_RE.search(text, hint.end(), end):
+            # Only a scheme: the URL starts there and needs one more character
+            start = hint.start() if hint.end() < end else end
+        if start < end:
+            url_spans.append((start, end))
+        pos = end
+
+    # Image placeholders that survive URL protection, in the original text
+    image_spans = []
+    span_index = 0
+    pos = text.find('[IMAGE:')
+    while pos != -1:
+        while span_index < len(url_spans) and url_spans[span_index][1] <= pos:
+            span_index += 1
+        if span_index < len(url_spans) and url_spans[span_index][0] <= pos:
+            # Swallowed by a URL; keep looking after it
+            pos = text.find('[IMAGE:', url_spans[span_index][1])
+            continue
+        close = text.find(']', pos + 7)
+        if close == -1:
+            break
+        if close == pos + 7:
+            pos = text.find('[IMAGE:', pos + 1)
+            continue
+        image_spans.append((pos, close + 1))
+        pos = text.find('[IMAGE:', close + 1)
+
+    # URLs are numbered first, then images, which keep the placeholders of
+    # the URLs inside them
+    items = [text[start:end] for start, end in url_spans]
+    pieces = []
+    last = 0
+    url_iter = iter(enumerate(url_spans))
+    pending = next(url_iter, None)
+    for image_start, image_end in image_spans + [(len(text), len(text))]:
+        while pending is not None and pending[1][1] <= image_start:
+            i, (start, end) = pending
+            pieces.append(text[last:start])
+            pieces.append(f"__PROTECTED_ITEM_{i}__")
+            last = end
+            pending = next(url_iter, None)
+        if image_start == len(text):
+            break
+        image = []
+        image_last = image_start
+        while pending is not None and pending[1][1] <= image_end:
+            i, (start, end) = pending
+            image.append(text[image_last:start])
+            image.append(f"__PROTECTED_ITEM_{i}__")
+            image_last = end
+            pending = next(url_iter, None)
+        image.append(text[image_last:image_end])
+        pieces.append(text[last:image_start])
+        pieces.append(f"__PROTECTED_ITEM_{len(items)}__")
+        items.append(''.join(image))
+        last = image_end
+    pieces.append(text[last:])
+
+    return ''.join(pieces), items
+
+
+def restore_items(text: str, items: List[str]) -> str:
+    """
+    Put the items protected by protect_items() back in a single pass.
+
+    Args:
+        text (str): Text with placeholders
+        items (list): Protected items in placeholder order
+
+    Returns:
+        str: Text with the original items
+    """
+    if not items:
+        return text
+
+    def _restore(match):
+        index = int(match.group(1))
+        return items[index] if index < len(items) else match.group(0)
+
+    return _PROTECTED_PLACEHOLDER_RE.sub(_restore, text)
+
+
 def format_readable_text(text: str) -> str:
     """
     Format text for human readability with proper paragraphs and line breaks.
@@ -171,28 +820,12 @@ def format_readable_text(text: str) -> str:
     if not text:
         return ""
     
-    import re
-    
     # First, protect URLs and image placeholders from space normalization
-    url_pattern = r'(https?://[^\s\]]+|[^\s\]]*\.[a-zA-Z]{2,}[^\s\]]*)'
-    image_pattern = r'(\[IMAGE:[^\]]+\])'
-    
-    # Find all URLs and image placeholders
-    protected_items = []
-    
-    def protect_item(match):
-        item = match.group(0)
-        placeholder = f"__PROTECTED_ITEM_{len(protected_items)}__"
-        protected_items.append(item)
-        return placeholder
-    
-    # Protect URLs and image placeholders
-    text = re.sub(url_pattern, protect_item, text)
-    text = re.sub(image_pattern, protect_item, text)
+    text, protected_items = protect_items(text)
     
     # Now do normal text processing
     # Replace multiple spaces/tabs with single space
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _SPACES_RE.sub(' ', text)
     
     # Convert single newlines within paragraphs to spaces, but preserve double newlines
     lines = text.split('\n')
@@ -220,7 +853,7 @@ def format_readable_text(text: str) -> str:
     text = '\n'.join(processed_lines)
     
     # Normalize line breaks - convert multiple newlines to paragraph breaks
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     
     # Split into paragraphs and clean each one
     paragraphs = text.split('\n\n')
@@ -230,12 +863,11 @@ def format_readable_text(text: str) -> str:
         paragraph = paragraph.strip()
         if paragraph:  # Only keep non-empty paragraphs
             # Ensure sentences are properly spaced (but avoid URLs)
-            paragraph = re.sub(r'\.(\w)', r'. \1', paragraph)  # Add space after period if missing
-            paragraph = re.sub(r'\?(\w)', r'? \1', paragraph)  # Add space after question mark
-            paragraph = re.sub(r'!(\w)', r'! \1', paragraph)   # Add space after exclamation
+            # Add space after period, question mark or exclamation if missing
+            paragraph = _MISSING_SPACE_RE.sub(r'\1 \2', paragraph)
             
             # Remove excessive spaces within the paragraph (but preserve protected items)
-            paragraph = re.sub(r' +', ' ', paragraph)
+            paragraph = _SPACE_RUNS_RE.sub(' ', paragraph)
             
             cleaned_paragraphs.append(paragraph)
     
@@ -243,8 +875,6 @@ def format_readable_text(text: str) -> str:
     result = '\n\n'.join(cleaned_paragraphs)
     
     # Restore protected URLs and image placeholders
-    for i, item in enumerate(protected_items):
-        placeholder = f"__PROTECTED_ITEM_{i}__"
-        result = result.replace(placeholder, item)
+    result = restore_items(result, protected_items)
     
     return result.strip()
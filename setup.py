@@ -41,6 +41,9 @@ setup(
         "test": [
             "pytest>=7.0.0",
         ],
+        "batch": [
+            "numpy>=1.17",
+        ],
     },
     entry_points={
         "console_scripts": [
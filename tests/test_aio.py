@@ -0,0 +1,147 @@
+"""
+Tests for html2cleantext.aio module.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from html2cleantext import aconvert_many, ato_markdown, ato_text, to_markdown, to_text
+from html2cleantext.utils import HostLanguageCache
+
+LATENCY = 0.2
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Serve a small page per path after a fixed delay, counting concurrent requests."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(LATENCY)
+            if self.path.startswith("/missing"):
+                self.send_error(404)
+                return
+            body = (f"<html><body><h1>Page {self.path}</h1>"
+                    f"<p>Text with a <a href='/next'>link</a>.</p></body></html>").encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run a local HTTP server with artificial latency."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.active = httpd.max_active = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+async def _collect(results):
+    return [result async for result in results]
+
+
+class TestAsyncConversion:
+    """Test the async counterparts of to_markdown() and to_text()."""
+
+    def test_url_matches_sync(self, server):
+        """Test that async conversion of a URL gives the same output as sync conversion."""
+        url = f"{server.url}/a"
+        assert asyncio.run(ato_markdown(url)) == to_markdown(url)
+        assert asyncio.run(ato_text(url, keep_links=True)) == to_text(url, keep_links=True)
+
+    def test_html_string(self):
+        """Test that HTML strings are converted without fetching."""
+        html = "<h1>Title</h1><p>Body</p>"
+        assert asyncio.run(ato_markdown(html)) == to_markdown(html)
+
+    def test_concurrent_fetches_overlap(self, server):
+        """Test that awaiting several URLs together overlaps their latency."""
+        async def main():
+            return await asyncio.gather(*(ato_text(f"{server.url}/{i}") for i in range(4)))
+
+        start = time.perf_counter()
+        outputs = asyncio.run(main())
+        assert time.perf_counter() - start < 4 * LATENCY
+        assert outputs[2].startswith("Page /2")
+
+    def test_fetch_error(self, server):
+        """Test that fetch errors are raised."""
+        with pytest.raises(Exception, match="404"):
+            asyncio.run(ato_markdown(f"{server.url}/missing"))
+
+
+class TestAConvertMany:
+    """Test concurrent batch conversion of URLs."""
+
+    def test_ordered_results(self, server):
+        """Test that results match sync conversion and come in input order."""
+        urls = [f"{server.url}/{i}" for i in range(6)]
+        results = asyncio.run(_collect(aconvert_many(urls, concurrency=3)))
+        assert [result.index for result in results] == list(range(6))
+        assert [result.output for result in results] == [to_markdown(url) for url in urls]
+
+    def test_concurrency_limit(self, server):
+        """Test that at most concurrency requests are in flight and that they overlap."""
+        urls = [f"{server.url}/{i}" for i in range(12)]
+        start = time.perf_counter()
+        results = asyncio.run(_collect(aconvert_many(urls, mode='text', concurrency=4, ordered=False)))
+        elapsed = time.perf_counter() - start
+        assert sorted(result.index for result in results) == list(range(12))
+        assert 2 <= server.max_active <= 4
+        assert elapsed < 12 * LATENCY / 2
+
+    def test_error_capture(self, server):
+        """Test that a failing URL is reported without stopping the batch."""
+        inputs = [f"{server.url}/a", f"{server.url}/missing", "<p>inline</p>"]
+        results = asyncio.run(_collect(aconvert_many(inputs, concurrency=2)))
+        assert [result.ok for result in results] == [True, False, True]
+        assert "404" in results[1].error
+        assert results[2].output == to_markdown("<p>inline</p>")
+
+    def test_early_exit(self, server):
+        """Test that stopping iteration early cancels the remaining inputs."""
+        async def main():
+            results = aconvert_many((f"{server.url}/{i}" for i in range(20)), concurrency=2)
+            async for result in results:
+                await results.aclose()
+                return result
+
+        assert asyncio.run(main()).index == 0
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments are rejected before any input is read."""
+        with pytest.raises(ValueError):
+            aconvert_many([], mode='html')
+        with pytest.raises(ValueError):
+            aconvert_many([], concurrency=0)
+
+    def test_language_cache_with_process_executor(self):
+        """Test that a language cache, which processes cannot share, is rejected with a process pool."""
+        with ProcessPoolExecutor(1) as executor:
+            with pytest.raises(ValueError, match="language_cache"):
+                aconvert_many([], executor=executor, language_cache=HostLanguageCache())
+            with pytest.raises(ValueError, match="language_cache"):
+                asyncio.run(ato_text("<p>Text</p>", executor=executor, language_cache=HostLanguageCache()))
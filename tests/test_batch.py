@@ -0,0 +1,199 @@
+"""
+Tests for html2cleantext.batch module.
+"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from html2cleantext.renderers import render_markdown
+from html2cleantext.utils import HostLanguageCache
+
+from html2cleantext import convert_many, to_markdown, to_text
+from html2cleantext.batch import BatchResult, ConversionPool, PoolStats
+
+PAGES = [f"<h1>Page {i}</h1><p>Paragraph {i} with a <a href='/p/{i}'>link</a>.</p>" for i in range(12)]
+CRASH = "<p>CRASH</p>"
+
+
+def _render_or_exit(soup):
+    """Render stage that kills its worker process on CRASH pages, like a crash in lxml."""
+    if soup.get_text() == "CRASH":
+        os._exit(1)
+    return render_markdown(soup)
+
+
+class TestConvertMany:
+    """Test batch conversion across worker processes."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_ordered_results(self, workers):
+        """Test that results match to_markdown() and come in input order."""
+        results = list(convert_many(PAGES, workers=workers, chunksize=5))
+        assert [result.index for result in results] == list(range(len(PAGES)))
+        assert [result.output for result in results] == [to_markdown(page) for page in PAGES]
+        assert all(result.ok and result.input == page for result, page in zip(results, PAGES))
+
+    def test_unordered_results(self):
+        """Test that as-completed iteration yields every input once."""
+        results = list(convert_many(iter(PAGES), mode='text', workers=2, ordered=False))
+        assert sorted(result.index for result in results) == list(range(len(PAGES)))
+        for result in results:
+            assert result.output == to_text(PAGES[result.index])
+
+    def test_options_passed_to_workers(self):
+        """Test that converter options apply in the worker processes."""
+        results = list(convert_many(PAGES[:2], mode='text', workers=2, keep_links=True))
+        assert results[0].output == to_text(PAGES[0], keep_links=True)
+        assert "[Link:/p/0]" in results[0].output
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_error_capture(self, workers):
+        """Test that a failing input is reported without stopping the batch."""
+        inputs = [PAGES[0], "/nonexistent/page.html", PAGES[1]]
+        results = list(convert_many(inputs, workers=workers))
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[1] == BatchResult(1, "/nonexistent/page.html", None, results[1].error)
+        assert results[1].error.startswith("FileNotFoundError")
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments are rejected before any input is read."""
+        with pytest.raises(ValueError):
+            convert_many(PAGES, mode='html')
+        with pytest.raises(ValueError):
+            convert_many(PAGES, workers=0)
+        with pytest.raises(ValueError):
+            convert_many(PAGES, chunksize=0)
+        with pytest.raises(TypeError):
+            convert_many(PAGES, unknown_option=True)
+
+
+class TestConversionPool:
+    """Test the warm worker pool."""
+
+    def test_reuse_and_stats(self):
+        """Test that a pool converts several batches and counts its tasks."""
+        with ConversionPool('text', workers=2) as pool:
+            first = list(pool.convert_many(PAGES[:4]))
+            second = list(pool.convert_many(PAGES[4:8], chunksize=2, ordered=False))
+            stats = pool.stats()
+        assert [result.output for result in first] == [to_text(page) for page in PAGES[:4]]
+        assert sorted(result.output for result in second) == sorted(to_text(page) for page in PAGES[4:8])
+        assert stats == PoolStats(tasks=6, documents=8, workers_started=stats.workers_started,
+                                  workers_recycled=0, shared_payloads=0, shared_bytes=0, pickled_payloads=8)
+        assert 1 <= stats.workers_started <= 2
+
+    def test_shared_memory_payloads(self):
+        """Test that long HTML strings are passed through shared memory."""
+        pages = [page + "<p>ünïcödé</p>" for page in PAGES[:3]]
+        with ConversionPool(workers=2, shared_memory_threshold=60) as pool:
+            results = list(pool.convert_many(pages + ["<p>x</p>"]))
+            stats = pool.stats()
+        assert [result.output for result in results] == [to_markdown(page) for page in pages + ["<p>x</p>"]]
+        assert results[0].input == pages[0]
+        assert stats.shared_payloads == 3
+        assert stats.shared_bytes == sum(len(page.encode('utf-8')) for page in pages)
+        assert stats.pickled_payloads == 1
+
+    def test_recycling(self):
+        """Test that workers are replaced after max_tasks_per_worker tasks."""
+        with ConversionPool(workers=2, max_tasks_per_worker=1) as pool:
+            results = list(pool.convert_many(PAGES[:6]))
+            stats = pool.stats()
+        assert all(result.ok for result in results)
+        assert stats.workers_started == 6
+        assert stats.workers_recycled == 6
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_worker_crash(self, ordered):
+        """Test that a worker dying mid-chunk fails only that chunk's inputs instead of hanging."""
+        inputs = [PAGES[0], CRASH, PAGES[1], PAGES[2]]
+        with ConversionPool(workers=2, stages={'render': _render_or_exit}) as pool:
+            results = sorted(pool.convert_many(inputs, chunksize=2, ordered=ordered))
+            assert [result.ok for result in results] == [False, False, True, True]
+            assert all(result.error.startswith("WorkerExited") for result in results[:2])
+            assert [result.output for result in results[2:]] == [to_markdown(PAGES[1]), to_markdown(PAGES[2])]
+
+            # The worker is replaced and the pool keeps converting
+            assert [result.ok for result in pool.convert_many([PAGES[3], CRASH, PAGES[4]])] == [True, False, True]
+            assert pool.stats().tasks == 5
+
+    def test_recycling_counts_replacements(self):
+        """Test that only workers that reach max_tasks_per_worker count as recycled."""
+        with ConversionPool(workers=1, max_tasks_per_worker=2) as pool:
+            list(pool.convert_many(PAGES[:5]))
+            stats = pool.stats()
+        assert (stats.workers_started, stats.workers_recycled) == (3, 2)
+
+    def test_shared_memory_lone_surrogate(self):
+        """Test that an input shared memory cannot hold as UTF-8 fails alone."""
+        bad = PAGES[0] + "<p>\ud800</p>"
+        inputs = [PAGES[1], bad, PAGES[2]]
+        expected = list(convert_many(inputs, workers=1))
+        with ConversionPool(workers=2, shared_memory_threshold=60) as pool:
+            results = list(pool.convert_many(inputs))
+            stats = pool.stats()
+        assert [(result.output, result.error) for result in results] == [
+            (result.output, result.error) for result in expected]
+        assert results[0].ok and results[2].ok
+        assert stats.shared_payloads == 3
+
+    def test_convert_many_starts_pool_lazily(self):
+        """Test that no worker processes start until results are read."""
+        children = len(multiprocessing.active_children())
+        results = convert_many(PAGES[:4], workers=2)
+        assert len(multiprocessing.active_children()) == children
+        del results
+
+    def test_convert_many_recycling(self):
+        """Test that convert_many() passes max_tasks_per_worker to its pool."""
+        results = list(convert_many(PAGES[:4], workers=2, max_tasks_per_worker=1))
+        assert [result.output for result in results] == [to_markdown(page) for page in PAGES[:4]]
+
+    def test_invalid_arguments(self):
+        """Test that invalid pool arguments are rejected."""
+        with pytest.raises(ValueError):
+            ConversionPool(workers=0)
+        with pytest.raises(ValueError):
+            ConversionPool(max_tasks_per_worker=0)
+        with ConversionPool(workers=2) as pool:
+            with pytest.raises(ValueError):
+                pool.convert_many(PAGES, chunksize=0)
+
+
+class TestThreadExecutor:
+    """Test batch conversion on a thread pool."""
+
+    MIXED = PAGES + [
+        "<p>Der schnelle braune Fuchs springt über den faulen Hund und läuft davon.</p>",
+        "<p>আমি বাংলায় গান গাই, আমি বাংলার গান গাই “আজ”।</p>",
+        "<p>He said “hello” to everyone in the room — twice…</p>",
+    ] * 3
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_matches_serial_conversion(self, ordered):
+        """Test that concurrent conversions give the same output as serial ones."""
+        results = list(convert_many(self.MIXED, mode='text', workers=4, chunksize=2,
+                                    ordered=ordered, executor='thread'))
+        assert sorted(result.index for result in results) == list(range(len(self.MIXED)))
+        for result in results:
+            assert result.output == to_text(self.MIXED[result.index])
+        if ordered:
+            assert [result.index for result in results] == list(range(len(self.MIXED)))
+
+    def test_error_capture(self):
+        """Test that a failing input is reported without stopping the batch."""
+        results = list(convert_many([PAGES[0], "/nonexistent/page.html"], workers=2, executor='thread'))
+        assert [result.ok for result in results] == [True, False]
+
+    def test_unpicklable_options(self):
+        """Test that options shared in-process, like a language cache, can be used."""
+        cache = HostLanguageCache()
+        results = list(convert_many(PAGES[:4], workers=2, executor='thread', language_cache=cache))
+        assert all(result.ok for result in results)
+
+    def test_unknown_executor(self):
+        """Test that unknown executors are rejected."""
+        with pytest.raises(ValueError):
+            convert_many(PAGES, executor='fiber')
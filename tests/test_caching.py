@@ -0,0 +1,178 @@
+"""
+Tests for html2cleantext.caching module.
+"""
+
+import os
+import pickle
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from html2cleantext import Converter, to_text
+from html2cleantext.caching import CACHE_FILE_NAME, FetchCache, FetchCacheInfo
+from html2cleantext.fetching import Fetcher
+
+
+class _ValidatingHandler(BaseHTTPRequestHandler):
+    """Serve server.pages, answering matching conditional requests with 304."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        body, headers = server.pages[self.path]
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if ((etag and self.headers.get("If-None-Match") == etag)
+                or (last_modified and self.headers.get("If-Modified-Since") == last_modified)):
+            server.not_modified += 1
+            self.send_response(304)
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        server.full += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run a local HTTP server that supports conditional requests."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ValidatingHandler)
+    httpd.daemon_threads = True
+    httpd.pages = {}
+    httpd.full = httpd.not_modified = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache in a temporary directory."""
+    cache = FetchCache(tmp_path)
+    yield cache
+    cache.close()
+
+
+def _page(text, size=None):
+    body = f"<p>{text}</p>".encode("utf-8")
+    return body if size is None else body.ljust(size)
+
+
+class TestFetchCache:
+    """Test the persistent fetch cache."""
+
+    def test_revalidation(self, server, cache):
+        """Test that an unchanged page is served from the cache after a 304 response."""
+        server.pages["/a"] = (_page("café"), {"ETag": '"v1"'})
+        with Fetcher(cache=cache) as fetcher:
+            assert fetcher.fetch(f"{server.url}/a") == "<p>café</p>"
+            assert fetcher.fetch(f"{server.url}/a") == "<p>café</p>"
+        assert (server.full, server.not_modified) == (1, 1)
+        assert cache.cache_info() == FetchCacheInfo(hits=0, revalidations=1, misses=1, entries=1,
+                                                    size=len(_page("café")))
+
+    def test_last_modified(self, server, cache):
+        """Test that Last-Modified is sent back as If-Modified-Since."""
+        server.pages["/a"] = (_page("A"), {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        with Fetcher(cache=cache) as fetcher:
+            fetcher.fetch(f"{server.url}/a")
+            fetcher.fetch(f"{server.url}/a")
+        assert server.not_modified == 1
+
+    def test_changed_page(self, server, cache):
+        """Test that a changed page is downloaded and replaces the stored one."""
+        server.pages["/a"] = (_page("old"), {"ETag": '"v1"'})
+        with Fetcher(cache=cache) as fetcher:
+            fetcher.fetch(f"{server.url}/a")
+            server.pages["/a"] = (_page("new"), {"ETag": '"v2"'})
+            assert fetcher.fetch(f"{server.url}/a") == "<p>new</p>"
+            assert fetcher.fetch(f"{server.url}/a") == "<p>new</p>"
+        assert (server.full, server.not_modified) == (2, 1)
+        assert cache.lookup(f"{server.url}/a").etag == '"v2"'
+
+    def test_max_age(self, server, tmp_path):
+        """Test that fresh pages are served without a request."""
+        server.pages["/a"] = (_page("A"), {})
+        cache = FetchCache(tmp_path, max_age=3600)
+        with Fetcher(cache=cache) as fetcher:
+            for _ in range(3):
+                assert fetcher.fetch(f"{server.url}/a") == "<p>A</p>"
+            assert fetcher.stats().requests == 1
+        assert server.full == 1
+        assert cache.cache_info()[:3] == (2, 0, 1)
+
+    def test_not_stored(self, server, cache):
+        """Test that pages without validators or marked no-store are not kept."""
+        server.pages["/plain"] = (_page("A"), {})
+        server.pages["/private"] = (_page("B"), {"ETag": '"v1"', "Cache-Control": "private, no-store"})
+        with Fetcher(cache=cache) as fetcher:
+            for _ in range(2):
+                fetcher.fetch(f"{server.url}/plain")
+                fetcher.fetch(f"{server.url}/private")
+        assert server.full == 4
+        assert cache.cache_info() == FetchCacheInfo(0, 0, 4, 0, 0)
+
+    def test_lru_eviction(self, server, tmp_path):
+        """Test that the least recently used pages are evicted beyond max_bytes."""
+        for name in "abcd":
+            server.pages[f"/{name}"] = (_page(name, 100), {"ETag": f'"{name}"'})
+        server.pages["/huge"] = (_page("huge", 400), {"ETag": '"huge"'})
+        cache = FetchCache(tmp_path, max_bytes=250)
+        with Fetcher(cache=cache) as fetcher:
+            fetcher.fetch(f"{server.url}/a")
+            fetcher.fetch(f"{server.url}/b")
+            fetcher.fetch(f"{server.url}/a")
+            fetcher.fetch(f"{server.url}/c")
+            fetcher.fetch(f"{server.url}/huge")
+        assert cache.lookup(f"{server.url}/b") is None
+        assert cache.lookup(f"{server.url}/huge") is None
+        assert cache.lookup(f"{server.url}/a") is not None
+        assert cache.cache_info()[3:] == (2, 200)
+
+    def test_persistence(self, server, tmp_path):
+        """Test that pages survive a new cache on the same directory, and pickling."""
+        server.pages["/a"] = (_page("A"), {"ETag": '"v1"'})
+        first = FetchCache(tmp_path)
+        with Fetcher(cache=first) as fetcher:
+            fetcher.fetch(f"{server.url}/a")
+        first.close()
+        assert os.path.exists(tmp_path / CACHE_FILE_NAME)
+
+        second = pickle.loads(pickle.dumps(FetchCache(tmp_path / CACHE_FILE_NAME)))
+        assert second.cache_info() == FetchCacheInfo(0, 0, 0, 1, len(_page("A")))
+        with Fetcher(cache=second) as fetcher:
+            assert fetcher.fetch(f"{server.url}/a") == "<p>A</p>"
+        assert server.not_modified == 1
+        second.clear()
+        assert second.cache_info().entries == 0
+
+    def test_converter(self, server, cache):
+        """Test that converters fetch through a cached fetcher."""
+        html = "<p>আমি বাংলায় গান গাই।</p>"
+        server.pages["/bn"] = (html.encode("utf-8"), {"ETag": '"bn"'})
+        converter = Converter('text', fetcher=Fetcher(cache=cache))
+        outputs = [converter.convert(f"{server.url}/bn") for _ in range(3)]
+        assert outputs == [to_text(html)] * 3
+        assert cache.cache_info()[:3] == (0, 2, 1)
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test that invalid settings are rejected."""
+        with pytest.raises(ValueError):
+            FetchCache(tmp_path, max_bytes=0)
+        with pytest.raises(ValueError):
+            FetchCache(tmp_path, max_age=-1)
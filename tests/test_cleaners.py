@@ -2,13 +2,19 @@
 Tests for html2cleantext.cleaners module.
 """
 
+import random
+from unittest.mock import patch
+
 import pytest
 from bs4 import BeautifulSoup
 
 from html2cleantext.cleaners import (
     remove_links, remove_images, strip_boilerplate, 
-    normalize_language, clean_html_attributes
+    normalize_language, clean_html_attributes, _remove_low_content_elements,
+    group_product_info, postprocess_text, register_normalizer, character_normalizer
 )
+from html2cleantext import cleaners
+from html2cleantext.utils import format_readable_text
 
 
 class TestRemoveLinks:
@@ -190,6 +196,90 @@ class TestStripBoilerplate:
         assert "console.log" not in result_text
 
 
+    def test_class_id_and_role_selectors(self):
+        """Test that class, id and role selectors are matched in the same pass."""
+        html = (
+            '<body><div class="post navbar">Menu links</div><div id="sidebar">Side</div>'
+            '<div role="contentinfo">Info</div><p class="nav-item">Kept item</p>'
+            '<p>The main article text that should stay in place.</p></body>'
+        )
+        soup = BeautifulSoup(html, 'lxml')
+        result_text = strip_boilerplate(soup, use_readability=False).get_text()
+
+        assert "Menu links" not in result_text
+        assert "Side" not in result_text
+        assert "Info" not in result_text
+        assert "Kept item" in result_text
+        assert "main article text" in result_text
+
+    def test_custom_selectors(self):
+        """Test user-supplied selectors, including ones that need soup.select()."""
+        html = (
+            '<body><div class="promo">Buy now</div><div data-widget="newsletter">Subscribe</div>'
+            '<ul class="related"><li>Related link</li></ul><nav>Navigation</nav>'
+            '<p>The main article text that should stay in place.</p></body>'
+        )
+        selectors = ['.promo', '[data-widget="newsletter"]', 'ul.related > li']
+        soup = BeautifulSoup(html, 'lxml')
+        result_text = strip_boilerplate(soup, use_readability=False, selectors=selectors).get_text()
+
+        assert "Buy now" not in result_text
+        assert "Subscribe" not in result_text
+        assert "Related link" not in result_text
+        assert "Navigation" in result_text
+        assert "main article text" in result_text
+
+
+class TestRemoveLowContentElements:
+    """Test the text-to-HTML ratio filter."""
+
+    @staticmethod
+    def _reference(soup, threshold=0.3):
+        for element in soup.find_all(['div', 'section', 'article']):
+            text_length = len(element.get_text().strip())
+            html_length = len(str(element))
+            if html_length > 0 and text_length / html_length < threshold and text_length < 50:
+                element.decompose()
+
+    def test_low_content_container_removed(self):
+        """Test that markup-heavy containers with little text are removed."""
+        html = ('<div class="wrap"><div class="spacer"><span></span><span></span>x</div>'
+                '<section><p>This paragraph has plenty of readable text in it.</p></section></div>')
+        soup = BeautifulSoup(html, 'lxml')
+        _remove_low_content_elements(soup)
+
+        assert not soup.find(class_='spacer')
+        assert "plenty of readable text" in soup.get_text()
+
+    @pytest.mark.parametrize("html", [
+        '<div>  <section> a&amp;b <!-- note -->\n </section><article><br><img alt="&lt;&gt;"></article></div>',
+        '<div class="a b" title=\'say "hi"\'><div><div><p>Short</p></div></div>tail</div>',
+        '<article><div>\u3000wide space\u3000</div><div><pre>  code  </pre></div></article>',
+        '<section><div><meta charset="latin-1"><p>%s</p></div></section>' % ('word ' * 20),
+    ])
+    def test_matches_reference(self, html):
+        """Test that removals match checking get_text() and str() on every container."""
+        expected = BeautifulSoup(html, 'lxml')
+        self._reference(expected)
+        soup = BeautifulSoup(html, 'lxml')
+        _remove_low_content_elements(soup)
+
+        assert str(soup) == str(expected)
+
+    def test_deep_nesting(self):
+        """Test that deeply nested containers are handled without recursion."""
+        soup = BeautifulSoup("<body></body>", 'lxml')
+        node = soup.body
+        for _ in range(3000):
+            child = soup.new_tag('div')
+            node.append(child)
+            node = child
+        node.append("x")
+        _remove_low_content_elements(soup)
+
+        assert not soup.find('div')
+
+
 class TestCleanHtmlAttributes:
     """Test HTML attribute cleaning functionality."""
     
@@ -288,3 +378,139 @@ class TestNormalizeLanguage:
         """Test handling of empty or None text."""
         assert normalize_language("") == ""
         assert normalize_language(None) == ""
+
+    def test_per_paragraph_normalization(self):
+        """Test that each line of a mixed page is normalized in its own language."""
+        text = ("আমি বাংলায় গান গাই “আজ” ৳১২০০\u200C\n"
+                "He said “hello” to everyone in the room — twice…\n"
+                "ঢাকায় বৃষ্টি হয়েছে।")
+        result = normalize_language(text, per_paragraph=True)
+        bengali, english, last = result.split('\n')
+
+        # Bengali lines only lose zero-width characters
+        assert bengali == "আমি বাংলায় গান গাই “আজ” ৳১২০০"
+        assert english == 'He said "hello" to everyone in the room - twice...'
+        assert last == "ঢাকায় বৃষ্টি হয়েছে।"
+
+    def test_per_paragraph_ignored_with_language(self):
+        """Test that an explicit language applies to every line."""
+        text = "আমি বাংলায় গান গাই “আজ”\nHe said “hello” to everyone."
+        assert normalize_language(text, 'en', per_paragraph=True) == normalize_language(text, 'en')
+
+
+class TestLanguageNormalizers:
+    """Test character replacement normalizers and the normalizer registry."""
+
+    @pytest.fixture(autouse=True)
+    def restore_registry(self, monkeypatch):
+        monkeypatch.setattr(cleaners, '_LANGUAGE_NORMALIZERS', cleaners._LANGUAGE_NORMALIZERS)
+        monkeypatch.setattr(cleaners, '_ASCII_SAFE_LANGUAGES', cleaners._ASCII_SAFE_LANGUAGES)
+
+    def test_character_normalizer(self):
+        """Test single and multi-character replacements and removals."""
+        normalize = character_normalizer({'“': '"', '…': '...', '\u200B': None})
+        assert normalize("“a”…\u200Bb") == '"a”...b'
+        assert normalize("plain ascii") == "plain ascii"
+        assert character_normalizer({'a': 'b'})("a“") == "b“"
+
+    def test_character_normalizer_rejects_chained_replacements(self):
+        """Test that replacements which would be replaced again are rejected."""
+        with pytest.raises(ValueError):
+            character_normalizer({'“': '”', '”': '"'})
+        with pytest.raises(ValueError):
+            character_normalizer({'ab': 'c'})
+
+    def test_bengali_danda_runs(self):
+        """Test that runs of dandas collapse before joiners between them are removed."""
+        assert normalize_language("ক।।খ॥গ।\u200C।", 'bn') == "ক।খ।গ।।"
+
+    def test_register_normalizer(self):
+        """Test that a registered language is normalized and can be unregistered."""
+        register_normalizer('de', lambda text: text.replace('„', '"'))
+        assert normalize_language("„Hallo“", 'de') == '"Hallo“'
+        register_normalizer('de', None)
+        assert normalize_language("„Hallo“", 'de') == "„Hallo“"
+
+    def test_register_replaces_registry(self):
+        """Test that registering replaces the registry, so concurrent readers never see it change."""
+        normalizers = cleaners._LANGUAGE_NORMALIZERS
+        register_normalizer('de', str.lower)
+        assert 'de' not in normalizers
+        assert cleaners._LANGUAGE_NORMALIZERS['de'] is str.lower
+
+    def test_ascii_text_skips_detection(self):
+        """Test that ASCII text is not detected while every normalizer is ASCII-safe."""
+        text = "Plain ASCII text that no registered normalizer would change."
+        with patch('html2cleantext.cleaners.detect_script_language', return_value='en') as detect:
+            assert normalize_language(text) == text
+            assert postprocess_text(text, group_products=False) == text
+            detect.assert_not_called()
+
+            register_normalizer('xx', str.upper)
+            normalize_language(text)
+            detect.assert_called_once()
+
+    def test_other_script_normalizer_detected(self):
+        """Test that a normalizer for a language in another script runs on auto-detected text."""
+        text = "Москва — столица России, крупнейший город страны и её политический центр."
+        assert normalize_language(text) == text
+        register_normalizer('ru', lambda text: text.replace('ё', 'е'))
+        assert 'её' not in normalize_language(text)
+        assert 'её' not in normalize_language(text, per_paragraph=True)
+        assert 'её' not in postprocess_text(text, group_products=False)
+
+
+class TestPostprocessText:
+    """Test the fused normalize/format/group text pass."""
+
+    TOKENS = ['a', 'B', 'x.com', 'Example.com', '?z', '!q', '. ', ':', '  ', '\n', '\n', '\n\n', '\t',
+              '\u00A0', '\u200B', '[IMAGE:https://cdn.example.com/x.png]', 'https://e.com/a', '“', '…',
+              '12,99 €', 'ab 1.299,00 EUR *', 'Statt: 5,00', 'lowercase continuation words ',
+              'Long sentence without end here ', 'Done.']
+
+    @staticmethod
+    def _separate_steps(text, lang, normalize_lang, group_products):
+        if normalize_lang:
+            text = normalize_language(text, lang)
+        text = format_readable_text(text)
+        if group_products:
+            text = group_product_info(text)
+        return text
+
+    @pytest.mark.parametrize("normalize_lang", [True, False])
+    @pytest.mark.parametrize("group_products", [True, False])
+    def test_matches_separate_steps(self, normalize_lang, group_products):
+        """Test that the fused pass gives the same output as the three functions."""
+        rng = random.Random(0)
+        for _ in range(1000):
+            text = ''.join(rng.choice(self.TOKENS) for _ in range(rng.randint(0, 30)))
+            for lang in ('en', 'bn', 'fr'):
+                expected = self._separate_steps(text, lang, normalize_lang, group_products)
+                result = postprocess_text(text, lang, normalize_lang, group_products)
+                assert result == expected, text
+
+    def test_per_paragraph_matches_separate_steps(self):
+        """Test that per-paragraph normalization in the fused pass matches normalize_language()."""
+        text = ("আমি বাংলায় গান গাই “আজ” ৳১২০০\n\n"
+                "He said “hello” to everyone in the room — twice…\n"
+                "ঢাকায় বৃষ্টি হয়েছে। https://example.com/“x”")
+        expected = group_product_info(format_readable_text(normalize_language(text, per_paragraph=True)))
+        assert postprocess_text(text, per_paragraph=True) == expected
+
+    def test_product_cards(self):
+        """Test that lines up to a price are grouped into one card."""
+        text = "Product A\n299,00 €\n\nProduct B\nab 12,99 EUR *"
+        assert postprocess_text(text, 'en') == "Product A 299,00 €\n\nProduct B ab 12,99 EUR *"
+
+    def test_long_merged_paragraph(self):
+        """Test that many continuation lines are merged into one line."""
+        text = "This line is long enough to merge\n" + "and continues here\n" * 5000
+        result = postprocess_text(text, 'en', group_products=False)
+        assert '\n' not in result
+        assert result.count("and continues here") == 5000
+
+    def test_empty_text(self):
+        """Test handling of empty or None text."""
+        assert postprocess_text("") == ""
+        assert postprocess_text(None) == ""
+
@@ -4,10 +4,13 @@ Tests for html2cleantext.core module.
 
 import pytest
 import tempfile
+from functools import partial
 import os
 from pathlib import Path
+from unittest.mock import patch
 
-from html2cleantext.core import to_markdown, to_text, _get_html_content
+from html2cleantext.core import Converter, to_markdown, to_text, _get_html_content, _get_converter
+from html2cleantext.utils import HostLanguageCache
 
 
 class TestGetHtmlContent:
@@ -215,3 +218,214 @@ class TestEdgeCases:
         assert "&" in result
         assert "<script>" in result
         assert '"quotes"' in result
+
+
+class TestSingleParse:
+    """Test the single-parse pipeline against the reference pipeline."""
+
+    HTML = """
+    <html>
+    <head><title>Test</title><style>p { color: red; }</style></head>
+    <body>
+        <nav class="menu"><a href="/">Home</a></nav>
+        <article id="post" data-track="1">
+            <h1>Article Title</h1>
+            <p>This is the first paragraph of the article, long enough to be
+            treated as real content by the boilerplate extractor.</p>
+            <p>A second paragraph with a <a href="https://example.com">link</a>
+            and an <img src="photo.jpg" alt="Photo"> image, plus more words.</p>
+            <ul><li>First item</li><li>Second item</li></ul>
+        </article>
+        <footer>Footer content</footer>
+    </body>
+    </html>
+    """
+
+    @pytest.mark.parametrize("convert", [to_text, to_markdown])
+    def test_deep_nesting(self, convert):
+        """Test that deeply nested content survives like in the reference pipeline."""
+        html = '<div>' * 300 + '<p>deep text here</p>'
+        result = convert(html, remove_boilerplate=False)
+        assert result == 'deep text here'
+        assert result == convert(html, remove_boilerplate=False, single_parse=False)
+
+    @pytest.mark.parametrize("remove_boilerplate", [True, False])
+    def test_markdown_matches_reference(self, remove_boilerplate):
+        """Test that to_markdown gives the same output in both pipelines."""
+        expected = to_markdown(self.HTML, remove_boilerplate=remove_boilerplate, single_parse=False)
+        result = to_markdown(self.HTML, remove_boilerplate=remove_boilerplate, single_parse=True)
+        assert result == expected
+
+    @pytest.mark.parametrize("remove_boilerplate", [True, False])
+    def test_text_matches_reference(self, remove_boilerplate):
+        """Test that to_text gives the same output in both pipelines."""
+        expected = to_text(self.HTML, remove_boilerplate=remove_boilerplate, single_parse=False)
+        result = to_text(self.HTML, remove_boilerplate=remove_boilerplate, single_parse=True)
+        assert result == expected
+
+    def test_urls_kept_as_written(self):
+        """Test that URLs are not percent-encoded by an intermediate serialization."""
+        html = '<article><h1>Title</h1><p>Some article text that is long enough to keep. <img src="a b.png" alt="x"></p></article>'
+        result = to_markdown(html)
+        assert "![x](a b.png)" in result
+
+    @pytest.mark.parametrize("single_parse", [True, False])
+    def test_keep_attributes(self, single_parse):
+        """Test that a custom attribute whitelist can drop link targets."""
+        html = '<p>See <a href="https://example.com">the docs</a> for details.</p>'
+        result = to_markdown(html, remove_boilerplate=False, single_parse=single_parse,
+                             keep_attributes=['title'])
+        assert "https://example.com" not in result
+        assert "the docs" in result
+
+    def test_prune(self):
+        """Test that pruning before parsing does not change the output."""
+        html = self.HTML.replace("<footer>", "<script>var a = '</p>';</script><!-- x --><footer>")
+        assert to_markdown(html, prune=True) == to_markdown(self.HTML)
+        assert to_text(html, prune=True) == to_text(self.HTML)
+
+
+class TestNativeMarkdown:
+    """Test the native Markdown renderer against markdownify."""
+
+    @pytest.mark.parametrize("options", [
+        {},
+        {"remove_boilerplate": False},
+        {"keep_links": False, "keep_images": False},
+        {"readable_format": False},
+    ])
+    def test_matches_markdownify(self, options):
+        """Test that both renderers give the same to_markdown output."""
+        html = TestSingleParse.HTML
+        expected = to_markdown(html, native_markdown=False, **options)
+        result = to_markdown(html, native_markdown=True, **options)
+        assert result == expected
+
+
+class TestConverter:
+    """Test the reusable Converter."""
+
+    HTML = TestSingleParse.HTML
+
+    @pytest.mark.parametrize("output_format, func", [("markdown", to_markdown), ("text", to_text)])
+    @pytest.mark.parametrize("options", [
+        {},
+        {"keep_links": True, "keep_images": True},
+        {"keep_links": False, "keep_images": False, "remove_boilerplate": False},
+        {"readable_format": False, "normalize_lang": False},
+    ])
+    def test_matches_functional_api(self, output_format, func, options):
+        """Test that a converter gives the same output as the function with the same options."""
+        converter = Converter(output_format, **options)
+        assert converter.convert(self.HTML) == func(self.HTML, **options)
+        assert converter(self.HTML) == func(self.HTML, **options)
+
+    def test_functions_reuse_converters(self):
+        """Test that repeated calls with the same options share a converter."""
+        to_text(self.HTML, keep_attributes=['href'])
+        to_text(self.HTML, keep_attributes=['href'])
+        assert _get_converter.cache_info().hits >= 1
+
+    @pytest.mark.parametrize("output_format", ["markdown", "text"])
+    def test_fused_text_stages(self, output_format):
+        """Test that the fused text pass matches running the stages one by one."""
+        from html2cleantext.cleaners import normalize_language
+        separate = Converter(output_format, stages={'normalize': partial(normalize_language, lang=None)})
+        assert Converter(output_format).convert(self.HTML) == separate.convert(self.HTML)
+
+    def test_replace_stage(self):
+        """Test that a stage can be replaced with a custom callable."""
+        converter = Converter('text', stages={'format': str.upper, 'group': None})
+        result = converter.convert("<p>Hello world</p>")
+        assert result.strip() == "HELLO WORLD"
+
+    def test_disable_stage(self):
+        """Test that turning off the links stage keeps <a> tags for the renderer."""
+        converter = Converter('markdown', stages={'links': None})
+        result = converter.convert('<p>See <a href="https://example.com">docs</a> now.</p>')
+        assert "[docs](https://example.com)" in result
+
+    def test_document_stage_gets_base_url(self):
+        """Test that document stages receive the soup and the base URL."""
+        calls = []
+
+        def record(soup, base_url):
+            calls.append(base_url)
+            return soup
+
+        Converter('text', stages={'images': record}).convert("<p>Text</p>")
+        assert calls == [""]
+
+    @patch('html2cleantext.fetching.Fetcher.fetch_markup')
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_language_cache(self, mock_detect, mock_fetch):
+        """Test that URL inputs take their language from the per-host cache."""
+        mock_fetch.return_value = "<p>আমি বাংলায় গান গাই, আমি বাংলার গান গাই।</p>"
+        mock_detect.return_value = 'bn'
+        cache = HostLanguageCache(confirm=2)
+        converter = Converter('text', language_cache=cache)
+        expected = Converter('text', language='bn').convert(mock_fetch.return_value)
+
+        for i in range(5):
+            assert converter.convert(f"https://news.example.com/{i}") == expected
+        assert mock_detect.call_count == 2
+        assert cache.cache_info().hits == 3
+
+        # Raw HTML has no host and is detected as before
+        converter.convert(mock_fetch.return_value)
+        assert cache.cache_info().misses == 2
+
+    @patch('html2cleantext.fetching.Fetcher.fetch_markup')
+    def test_language_cache_ignored_with_language(self, mock_fetch):
+        """Test that an explicit language or custom normalize stage bypasses the cache."""
+        mock_fetch.return_value = "<p>Hello world, this is English text.</p>"
+        cache = HostLanguageCache()
+        to_text("https://example.com/", language='en', language_cache=cache)
+        Converter('text', language_cache=cache, stages={'normalize': str.strip}).convert(
+            "https://example.com/")
+        assert cache.cache_info().misses == 0
+
+    @patch('html2cleantext.fetching.Fetcher.fetch_markup')
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_language_cache_ascii(self, mock_detect, mock_fetch):
+        """Test that pure ASCII pages skip the cache like they skip detection."""
+        mock_fetch.return_value = "<p>Hello world, this is plain English text.</p>"
+        cache = HostLanguageCache()
+        converter = Converter('text', language_cache=cache)
+        for i in range(3):
+            assert converter.convert(f"https://example.com/{i}") == to_text(mock_fetch.return_value)
+        mock_detect.assert_not_called()
+        assert cache.cache_info()[:2] == (0, 0)
+
+    @pytest.mark.parametrize("output_format", ["markdown", "text"])
+    @patch('html2cleantext.fetching.Fetcher.fetch_markup')
+    def test_language_cache_without_normalize_stage(self, mock_fetch, output_format):
+        """Test that a turned-off normalize stage bypasses the cache instead of failing."""
+        mock_fetch.return_value = "<p>আমি বাংলায় গান গাই।</p>"
+        cache = HostLanguageCache()
+        converter = Converter(output_format, readable_format=False, language_cache=cache,
+                              stages={'normalize': None})
+        expected = Converter(output_format, readable_format=False,
+                             stages={'normalize': None}).convert(mock_fetch.return_value)
+        assert converter.convert("https://example.com/") == expected
+        assert cache.cache_info().misses == 0
+
+    @pytest.mark.parametrize("output_format", ["markdown", "text"])
+    def test_paragraph_lang(self, output_format):
+        """Test that paragraph_lang normalizes each paragraph in its own language."""
+        html = ("<p>আমি বাংলায় গান গাই “আজ”।</p>"
+                "<p>He said “hello” to everyone in the room — twice.</p>")
+        result = Converter(output_format, paragraph_lang=True).convert(html)
+        assert "“আজ”" in result
+        assert '"hello"' in result
+        convert = to_markdown if output_format == "markdown" else to_text
+        assert result == convert(html, paragraph_lang=True)
+
+    def test_invalid_configuration(self):
+        """Test that unknown formats, unknown stages and required stages are rejected."""
+        with pytest.raises(ValueError):
+            Converter('html')
+        with pytest.raises(ValueError):
+            Converter('markdown', stages={'group': None})
+        with pytest.raises(ValueError):
+            Converter('text', stages={'render': None})
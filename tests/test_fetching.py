@@ -0,0 +1,260 @@
+"""
+Tests for html2cleantext.fetching module.
+"""
+
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from html2cleantext import Converter, to_text
+from html2cleantext.core import _get_html_content
+from html2cleantext.fetching import (
+    Fetcher, FetchStats, ResponseTooLarge, UnsupportedContentType, get_default_fetcher
+)
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    Serve pages over HTTP/1.1 keep-alive.
+
+    /flaky/<n> fails with 503 n times first, /throttled/<n> with 429 and a
+    Retry-After of an hour; server.pages maps other paths
+    to a Content-Type, a body and whether to send it chunked.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.headers.append(dict(self.headers))
+            failures = server.failures.get(self.path, 0)
+            server.failures[self.path] = failures + 1
+        try:
+            time.sleep(server.latency)
+            if self.path in server.pages:
+                self._send(200, *server.pages[self.path])
+            elif self.path.startswith("/flaky/") and failures < int(self.path.rsplit("/", 1)[1]):
+                self._send(503, b"busy")
+            elif self.path.startswith("/throttled/") and failures < int(self.path.rsplit("/", 1)[1]):
+                self._send(429, b"slow down", headers={"Retry-After": "3600"})
+            elif self.path == "/missing":
+                self._send(404, b"missing")
+            else:
+                self._send(200, f"<p>Page {self.path}</p>".encode("utf-8"))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", chunked=False, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 1 << 14):
+                chunk = body[start:start + (1 << 14)]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run a local keep-alive HTTP server."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.active = httpd.max_active = 0
+    httpd.latency = 0
+    httpd.headers = []
+    httpd.failures = {}
+    httpd.pages = {}
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestFetcher:
+    """Test pooled URL fetching."""
+
+    def test_connection_reuse(self, server):
+        """Test that consecutive fetches from one host share a connection."""
+        with Fetcher() as fetcher:
+            pages = [fetcher.fetch(f"{server.url}/{i}") for i in range(5)]
+            stats = fetcher.stats()
+        assert pages[3] == "<p>Page /3</p>"
+        assert stats == FetchStats(fetches=5, requests=5, connections_opened=1, connections_reused=4)
+
+    def test_headers(self, server):
+        """Test that default, fetcher and per-request headers are sent."""
+        with Fetcher(headers={"Accept-Language": "bn"}) as fetcher:
+            fetcher.fetch(f"{server.url}/a", headers={"X-Trace": "1"})
+            fetcher.fetch(f"{server.url}/b")
+        first, second = server.headers
+        assert first["User-Agent"].startswith("Mozilla/5.0")
+        assert first["Accept-Language"] == second["Accept-Language"] == "bn"
+        assert first["X-Trace"] == "1" and "X-Trace" not in second
+
+    def test_retry(self, server):
+        """Test that retryable statuses are retried on the pooled connection."""
+        with Fetcher(backoff_factor=0) as fetcher:
+            assert fetcher.fetch(f"{server.url}/flaky/2") == "<p>Page /flaky/2</p>"
+            stats = fetcher.stats()
+        assert stats.fetches == 1
+        assert stats.requests == 3
+        assert stats.connections_opened == 1
+
+    def test_retry_after_capped(self, server):
+        """Test that a long Retry-After waits only max_retry_wait seconds."""
+        with Fetcher(max_retry_wait=0.1) as fetcher:
+            start = time.perf_counter()
+            assert fetcher.fetch(f"{server.url}/throttled/2") == "<p>Page /throttled/2</p>"
+            elapsed = time.perf_counter() - start
+            assert fetcher.stats().requests == 3
+        assert 0.2 <= elapsed < 5
+
+    def test_retries_exhausted(self, server):
+        """Test that the last error response is raised once retries run out."""
+        with Fetcher(retries=1, backoff_factor=0) as fetcher:
+            with pytest.raises(requests.HTTPError, match="503"):
+                fetcher.fetch(f"{server.url}/flaky/5")
+            with pytest.raises(requests.HTTPError, match="404"):
+                fetcher.fetch(f"{server.url}/missing")
+            assert fetcher.stats().requests == 3
+
+    def test_per_host_limit(self, server):
+        """Test that at most pool_connections_per_host requests reach a host at once."""
+        server.latency = 0.05
+        with Fetcher(pool_connections_per_host=2) as fetcher:
+            with ThreadPoolExecutor(6) as executor:
+                pages = list(executor.map(fetcher.fetch, [f"{server.url}/{i}" for i in range(12)]))
+            stats = fetcher.stats()
+        assert len(pages) == 12
+        assert server.max_active <= 2
+        assert stats.connections_opened <= 2
+
+    def test_pickle(self, server):
+        """Test that a pickled fetcher keeps its settings but not its connections."""
+        fetcher = Fetcher(timeout=5, headers={"Accept-Language": "bn"}, pool_connections_per_host=3)
+        fetcher.fetch(f"{server.url}/a")
+        copy = pickle.loads(pickle.dumps(fetcher))
+        assert copy.timeout == 5
+        assert copy.session.headers["Accept-Language"] == "bn"
+        assert copy.stats() == FetchStats(0, 0, 0, 0)
+        assert copy.fetch(f"{server.url}/b") == "<p>Page /b</p>"
+
+    def test_invalid_arguments(self):
+        """Test that invalid settings and URLs are rejected."""
+        with pytest.raises(ValueError):
+            Fetcher(pool_connections_per_host=0)
+        with pytest.raises(ValueError):
+            Fetcher(pool_hosts=0)
+        with pytest.raises(ValueError):
+            Fetcher(retries=-1)
+        with pytest.raises(ValueError):
+            Fetcher(max_retry_wait=-1)
+        with pytest.raises(ValueError):
+            Fetcher().fetch("")
+
+
+class TestStreaming:
+    """Test streamed bodies, size caps, content types and encodings."""
+
+    def test_unsupported_content_type(self, server):
+        """Test that non-HTML responses are rejected before their body is used."""
+        server.pages["/report.pdf"] = (b"%PDF-1.7" + b"\0" * 100000, "application/pdf")
+        server.pages["/page"] = (b"<p>Page</p>", "Application/XHTML+XML; charset=utf-8")
+        server.pages["/untyped"] = (b"<p>Untyped</p>", None)
+        with Fetcher() as fetcher:
+            with pytest.raises(UnsupportedContentType, match="application/pdf"):
+                fetcher.fetch(f"{server.url}/report.pdf")
+            assert fetcher.fetch(f"{server.url}/page") == "<p>Page</p>"
+            assert fetcher.fetch(f"{server.url}/untyped") == "<p>Untyped</p>"
+        with Fetcher(content_types=None) as fetcher:
+            assert fetcher.fetch_bytes(f"{server.url}/report.pdf")[0].startswith(b"%PDF")
+        assert issubclass(UnsupportedContentType, requests.RequestException)
+
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_max_bytes(self, server, chunked):
+        """Test that bodies over max_bytes are abandoned, with or without a Content-Length."""
+        server.pages["/big"] = (b"<p>" + b"x" * 200000 + b"</p>", "text/html", chunked)
+        with Fetcher(max_bytes=100000) as fetcher:
+            with pytest.raises(ResponseTooLarge):
+                fetcher.fetch(f"{server.url}/big")
+            assert fetcher.fetch(f"{server.url}/0") == "<p>Page /0</p>"
+        with Fetcher(max_bytes=None) as fetcher:
+            assert len(fetcher.fetch_bytes(f"{server.url}/big")[0]) == 200007
+
+    def test_encodings(self, server):
+        """Test that bodies are decoded from their BOM, header or <meta> charset, else as UTF-8."""
+        meta = '<meta http-equiv="Content-Type" content="text/html; charset=windows-1252"><p>café “q”</p>'
+        server.pages["/meta"] = (meta.encode("cp1252"), "text/html")
+        server.pages["/header"] = ("<p>café</p>".encode("cp1252"), "text/html; charset=windows-1252")
+        server.pages["/undeclared"] = ("<p>café — বাংলা</p>".encode("utf-8"), "text/html")
+        server.pages["/bom"] = ("\ufeff<p>café</p>".encode("utf-16-le"), "text/html; charset=iso-8859-1")
+        with Fetcher() as fetcher:
+            assert fetcher.fetch_markup(f"{server.url}/meta") == meta.encode("cp1252")
+            assert fetcher.fetch(f"{server.url}/meta") == meta
+            assert fetcher.fetch_bytes(f"{server.url}/header")[1] == "windows-1252"
+            assert fetcher.fetch_markup(f"{server.url}/header") == "<p>café</p>"
+            assert fetcher.fetch(f"{server.url}/undeclared") == "<p>café — বাংলা</p>"
+            assert fetcher.fetch(f"{server.url}/bom") == "<p>café</p>"
+            converter = Converter('text', fetcher=fetcher)
+            assert converter.convert(f"{server.url}/meta") == to_text("<p>café “q”</p>")
+            assert converter.convert(f"{server.url}/undeclared") == to_text("<p>café — বাংলা</p>")
+            pruned = Converter('text', prune=True, fetcher=fetcher)
+            assert pruned.convert(f"{server.url}/meta") == to_text("<p>café “q”</p>")
+
+    def test_invalid_max_bytes(self):
+        """Test that a non-positive max_bytes is rejected."""
+        with pytest.raises(ValueError):
+            Fetcher(max_bytes=0)
+
+
+class TestDefaultFetcher:
+    """Test the fetcher shared by URL inputs."""
+
+    def test_url_inputs_use_default_fetcher(self, server):
+        """Test that URL inputs reuse the connections of the shared fetcher."""
+        fetcher = get_default_fetcher()
+        assert get_default_fetcher() is fetcher
+        before = fetcher.stats()
+        for i in range(3):
+            assert _get_html_content(f"{server.url}/{i}") == f"<p>Page /{i}</p>".encode("ascii")
+        after = fetcher.stats()
+        assert after.fetches - before.fetches == 3
+        assert after.connections_reused - before.connections_reused == 2
+
+    def test_converter_fetcher(self, server):
+        """Test that a Converter fetches URL inputs with its own fetcher."""
+        with Fetcher() as fetcher:
+            assert Converter('text', fetcher=fetcher).convert(f"{server.url}/x") == "Page /x"
+            assert fetcher.stats().fetches == 1
+
+    def test_new_fetcher_after_fork(self):
+        """Test that a forked process does not share the parent's connections."""
+        fetcher = get_default_fetcher()
+        with patch('html2cleantext.fetching.os.getpid', return_value=os.getpid() + 1):
+            assert get_default_fetcher() is not fetcher
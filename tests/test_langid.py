@@ -0,0 +1,76 @@
+"""
+Tests for html2cleantext.langid module.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from langdetect import detector_factory
+
+from html2cleantext import langid
+from html2cleantext.langid import BatchLanguageDetector, detect_languages
+from html2cleantext.utils import detect_language, get_language_detector
+
+TEXTS = {
+    'en': "The quick brown fox jumps over the lazy dog and runs across the field. ",
+    'bn': "আমি বাংলায় গান গাই, আমি বাংলার গান গাই। আজকের সংবাদ: ঢাকায় বৃষ্টি হয়েছে। ",
+    'de': "Der schnelle braune Fuchs springt über den faulen Hund und läuft davon. ",
+    'fr': "Le renard brun rapide saute par-dessus le chien paresseux et s'enfuit. ",
+    'ru': "Быстрая коричневая лиса прыгает через ленивую собаку и убегает. ",
+}
+
+
+class TestBatchLanguageDetector:
+    """Test vectorized batch language detection."""
+
+    def test_ngrams_match_langdetect(self):
+        """Test that the extracted n-grams are the ones langdetect samples from."""
+        detector_factory.init_factory()
+        factory = detector_factory._factory
+        batch = BatchLanguageDetector()
+        words = {index: word for word, index in batch._vocabulary.items()}
+        rng = random.Random(0)
+        alphabet = "abcXYZ ÄéÉ,.!'-\n\tআমিবাং中文Привет https://x.com a@b.com ăạ"
+
+        for _ in range(300):
+            sample = ''.join(rng.choice(alphabet) for _ in range(rng.randint(10, 200)))
+            detector = factory.create()
+            detector.append(sample)
+            detector.cleaning_text()
+            expected = Counter(detector._extract_ngrams())
+
+            extracted = Counter()
+            ngrams = batch._ngram_counts(sample)
+            if ngrams is not None:
+                for index, count in zip(*ngrams):
+                    extracted[words[int(index)]] += int(count)
+            assert extracted == expected, sample
+
+    def test_agrees_with_detect_language(self):
+        """Test that batch results match detect_language() on clear documents."""
+        texts = [text * repeat for text in TEXTS.values() for repeat in (1, 5, 60)]
+        texts.append(TEXTS['en'] * 20 + TEXTS['bn'] * 200)
+        assert detect_languages(texts) == [detect_language(text) for text in texts]
+
+    def test_undetectable_texts(self):
+        """Test that texts detect_language() gives up on return None."""
+        assert detect_languages(["", None, 123, "Hi", "12345 67890 !!!"]) == [None] * 5
+
+    def test_candidate_languages(self):
+        """Test restricting detection to a LanguageDetector's candidates."""
+        detector = get_language_detector(('en', 'bn'))
+        batch = BatchLanguageDetector(detector)
+        assert batch.languages == ('en', 'bn')
+        assert batch.detect([TEXTS['en'], TEXTS['bn'], TEXTS['fr']])[:2] == ['en', 'bn']
+        assert detect_languages([TEXTS['de']], detector=detector)[0] in ('en', 'bn')
+
+    def test_groups_give_same_results(self, monkeypatch):
+        """Test that scoring in many small groups gives the same results."""
+        texts = [text * repeat for text in TEXTS.values() for repeat in (2, 30)]
+        expected = BatchLanguageDetector().detect(texts)
+        monkeypatch.setattr(langid, 'GROUP_ROWS', 50)
+        assert BatchLanguageDetector().detect(texts) == expected
@@ -0,0 +1,225 @@
+"""
+Tests for html2cleantext.parsing module.
+"""
+
+import pytest
+from lxml import etree
+from bs4 import BeautifulSoup, Comment, Doctype
+
+from html2cleantext.parsing import (
+    decode_html, html_markup, parse_html, parse_soup, prune_html, soup_from_tree, META_PRESCAN_BYTES
+)
+from html2cleantext.cleaners import KEEP_ATTRIBUTES, clean_html_attributes
+
+
+class TestParseHtml:
+    """Test lxml document parsing."""
+
+    def test_fragment_gets_document_structure(self):
+        """Test that fragments are wrapped in html/body like BeautifulSoup does."""
+        root = parse_html("<h1>Title</h1><p>Body</p>")
+        assert root.tag == 'html'
+        assert root.find('body/h1').text == 'Title'
+
+    def test_empty_input(self):
+        """Test that empty or comment-only input yields an empty document."""
+        for html in ["", "   ", "<!-- only a comment -->"]:
+            root = parse_html(html)
+            assert root.tag == 'html'
+            assert len(root) == 0
+
+    def test_encoding_declaration(self):
+        """Test that unicode input with an XML encoding declaration is accepted."""
+        root = parse_html('<?xml version="1.0" encoding="utf-8"?><p>café</p>')
+        assert 'café' in root.text_content()
+
+    def test_deep_nesting(self):
+        """Test that content nested past libxml2's default depth limit of 256 is kept."""
+        root = parse_html('<div>' * 1000 + '<p>deep text here</p>')
+        assert root.text_content() == 'deep text here'
+
+
+class TestPruneHtml:
+    """Test pruning markup before parsing."""
+
+    def test_removes_regions(self):
+        """Test that scripts, styles, SVG and comments are removed."""
+        html = ('<p>A</p><script>var x = 1;</script><style>p {}</style>'
+                '<svg><svg/><path d="M0"/></svg><!-- note --><p>B</p>')
+        pruned, removed = prune_html(html)
+
+        assert pruned == '<p>A</p><p>B</p>'
+        assert removed == len(html) - len(pruned)
+
+    def test_script_end_tag_in_string(self):
+        """Test that an end tag inside a JS string closes the script like the parser does."""
+        html = '<p>a<script>var s = "</script>";</script>b</p>'
+        pruned, _ = prune_html(html)
+
+        assert pruned == '<p>a";</script>b</p>'
+
+    def test_script_like_end_tags(self):
+        """Test that only real end tags close a script, in any case."""
+        pruned, _ = prune_html('<p>a<SCRIPT>x</scripts>y</Script >b</p>')
+        assert pruned == '<p>ab</p>'
+
+    def test_unterminated_regions(self):
+        """Test that unterminated scripts and comments run to the end of the input."""
+        assert prune_html('<p>a<script>never closed')[0] == '<p>a'
+        assert prune_html('<p>a<!-- never closed')[0] == '<p>a'
+        assert prune_html('<p>a<!-->b')[0] == '<p>ab'
+
+    @pytest.mark.parametrize("tag", ["title", "textarea", "TITLE"])
+    def test_rcdata_text_kept(self, tag):
+        """Test that comment- and tag-like text in title and textarea is left alone."""
+        html = f'<{tag}>a <!-- b --> <script>c</script> d</{tag}><!-- e --><p>f</p>'
+        assert prune_html(html)[0] == f'<{tag}>a <!-- b --> <script>c</script> d</{tag}><p>f</p>'
+        assert prune_html('<title>open <!-- x')[0] == '<title>open <!-- x'
+
+    def test_unclosed_svg_kept(self):
+        """Test that an SVG without an end tag is left to the parser."""
+        pruned, _ = prune_html('<p>a<svg><text>t</text>b<!-- c -->')
+        assert pruned == '<p>a<svg><text>t</text>b'
+
+    def test_quoted_attributes_skipped(self):
+        """Test that markup inside attribute values is not pruned."""
+        html = '<a title="<script>" href=\'x>y\'>link</a><p>text</p>'
+        assert prune_html(html) == (html, 0)
+
+    def test_data_uri_payload(self):
+        """Test that base64 payloads are dropped and the media type is kept."""
+        pruned, removed = prune_html('<img src="data:image/png;base64,iVBORw0KGgo=" alt="x">')
+
+        assert pruned == '<img src="data:image/png;base64," alt="x">'
+        assert removed == len('iVBORw0KGgo=')
+
+    @pytest.mark.parametrize("scheme", ["DATA:", "Data:"])
+    def test_data_uri_payload_case(self, scheme):
+        """Test that the data URI scheme is matched case-insensitively."""
+        pruned, removed = prune_html(f'<img src="{scheme}image/png;base64,iVBORw0KGgo=">')
+
+        assert pruned == f'<img src="{scheme}image/png;base64,">'
+        assert removed == len('iVBORw0KGgo=')
+
+    def test_counts_utf8_bytes(self):
+        """Test that the removed size is reported in UTF-8 bytes."""
+        _, removed = prune_html('<p>café</p><script>é</script>')
+        assert removed == len('<script>é</script>'.encode('utf-8'))
+
+
+class TestSoupFromTree:
+    """Test building BeautifulSoup documents from lxml trees."""
+
+    def test_matches_beautifulsoup_parse(self):
+        """Test that replaying the tree gives the same soup as parsing the markup."""
+        html = '''<!DOCTYPE html>
+        <html><head><title>T</title></head>
+        <body><div class="a">Text <b>bold</b> tail<!-- note --><br>after</div>
+        <table><tr><td colspan="2">Cell</td></tr></table></body></html>'''
+
+        expected = BeautifulSoup(html, 'lxml')
+        result = soup_from_tree(parse_html(html))
+
+        assert str(result) == str(expected)
+
+    def test_comments_and_doctype_preserved(self):
+        """Test that comments and the doctype become the matching soup nodes."""
+        soup = soup_from_tree(parse_html("<!DOCTYPE html><p>Hi<!-- note --></p>"))
+
+        assert isinstance(soup.contents[0], Doctype)
+        assert soup.find(string=lambda s: isinstance(s, Comment)) == " note "
+
+    def test_no_doctype_added(self):
+        """Test that documents without a doctype do not gain a default one."""
+        soup = soup_from_tree(parse_html("<p>Hi</p>"))
+        assert not any(isinstance(node, Doctype) for node in soup.contents)
+
+    def test_subtree_tail_not_included(self):
+        """Test that converting a subtree ignores the text after it."""
+        root = parse_html("<div><p>Inside</p>Outside</div>")
+        soup = soup_from_tree(root.find('body/div/p'))
+
+        assert soup.get_text() == "Inside"
+
+    def test_deep_nesting(self):
+        """Test that deeply nested trees are replayed without recursion."""
+        root = parse_html("<div></div>")
+        node = root.find('body/div')
+        for _ in range(2000):
+            node = etree.SubElement(node, 'span')
+        node.text = "deep"
+        soup = soup_from_tree(root)
+
+        assert soup.get_text() == "deep"
+
+    def test_keep_attributes(self):
+        """Test that only whitelisted attributes are kept while replaying."""
+        root = parse_html('<a href="/x" class="c" data-track="1" title="T">Link</a>')
+        soup = soup_from_tree(root, KEEP_ATTRIBUTES)
+
+        assert soup.a.attrs == {'href': '/x', 'title': 'T'}
+
+
+class TestParseSoup:
+    """Test BeautifulSoup parsing with attribute filtering."""
+
+    HTML = '''<div id="main" class="a b" style="color: red" data-sku="1">
+    <a href="/p" rel="nofollow" onclick="track()">Link</a>
+    <img src="x.jpg" alt="X" data-lazy="1" width="10">
+    <table><tr><td colspan="2" rowspan="3" class="cell">Cell</td></tr></table></div>'''
+
+    def test_matches_clean_html_attributes(self):
+        """Test that filtering while parsing matches cleaning the parsed tree."""
+        expected = clean_html_attributes(BeautifulSoup(self.HTML, 'lxml'))
+        result = parse_soup(self.HTML, KEEP_ATTRIBUTES)
+
+        assert str(result) == str(expected)
+
+    def test_keeps_all_attributes_by_default(self):
+        """Test that no attributes are dropped without a whitelist."""
+        result = parse_soup(self.HTML)
+        assert str(result) == str(BeautifulSoup(self.HTML, 'lxml'))
+
+    def test_custom_whitelist(self):
+        """Test that a custom whitelist is honoured."""
+        soup = parse_soup(self.HTML, ['id', 'data-sku'])
+
+        assert soup.div.attrs == {'id': 'main', 'data-sku': '1'}
+        assert soup.a.attrs == {}
+
+
+class TestHtmlMarkup:
+    """Test preparing undecoded response bodies for the parser."""
+
+    TEXT = "<p>café “q” — বাংলা</p>"
+
+    @pytest.mark.parametrize("body, declared", [
+        ('<meta charset="windows-1252"><p>café “q”</p>'.encode("cp1252"), None),
+        ('<meta charset="utf-8"><p>café — বাংলা</p>'.encode("utf-8"), "UTF8"),
+        ("\ufeff<p>café</p>".encode("utf-16-le"), "iso-8859-1"),
+        (b"<p>plain ascii</p>", None),
+    ])
+    def test_bytes_when_parser_finds_encoding(self, body, declared):
+        """Test that bodies the parser decodes correctly by itself stay bytes."""
+        markup = html_markup(body, declared)
+        assert markup is body
+        assert parse_html(markup).text_content() == parse_html(decode_html(body, declared)).text_content()
+
+    @pytest.mark.parametrize("body, declared, expected", [
+        (TEXT.encode("utf-8"), None, TEXT),
+        ("<p>café “q”</p>".encode("cp1252"), None, "<p>café “q”</p>"),
+        ("<p>café</p>".encode("cp1252"), "windows-1252", "<p>café</p>"),
+        ('<meta charset="iso-8859-1"><p>café</p>'.encode("utf-8"), "utf-8",
+         '<meta charset="iso-8859-1"><p>café</p>'),
+        (TEXT.encode("utf-8"), "no-such-charset", TEXT),
+    ])
+    def test_decoded_otherwise(self, body, declared, expected):
+        """Test that undeclared, header-only or conflicting encodings are decoded here."""
+        assert html_markup(body, declared) == expected
+        assert decode_html(body, declared) == expected
+
+    def test_meta_prescan_limit(self):
+        """Test that a <meta> charset is only looked for near the start."""
+        body = ("<!--" + " " * META_PRESCAN_BYTES + '--><meta charset="utf-8">' + self.TEXT).encode("utf-8")
+        assert isinstance(html_markup(body), str)
+        assert decode_html(body).endswith(self.TEXT)
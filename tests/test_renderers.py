@@ -0,0 +1,131 @@
+"""
+Tests for html2cleantext.renderers module.
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+from markdownify import markdownify
+
+from html2cleantext.renderers import render_markdown, extract_text
+
+
+def _markdownify(soup):
+    return markdownify(str(soup), heading_style="ATX", bullets="*")
+
+
+class TestRenderMarkdown:
+    """Test the native Markdown renderer."""
+
+    def test_headings_and_paragraphs(self):
+        """Test ATX headings and paragraph spacing."""
+        soup = BeautifulSoup("<h1>Title</h1><p>First <strong>bold</strong> text.</p><h3>Sub</h3>", 'lxml')
+        result = render_markdown(soup)
+
+        assert result == "# Title\n\nFirst **bold** text.\n\n### Sub"
+
+    def test_nested_lists(self):
+        """Test bullets, numbering and nested list indentation."""
+        html = '<ul><li>One</li><li>Two<ol start="3"><li>Three</li><li>Four</li></ol></li></ul>'
+        result = render_markdown(BeautifulSoup(html, 'lxml'))
+
+        assert "* One" in result
+        assert "  3. Three" in result
+        assert "  4. Four" in result
+
+    def test_links_images_and_code(self):
+        """Test inline links, images and code spans."""
+        html = ('<p><a href="https://example.com" title="Ex">site</a> '
+                '<img src="pic.png" alt="Pic"> <code>a_b</code> snake_case</p>')
+        result = render_markdown(BeautifulSoup(html, 'lxml'))
+
+        assert '[site](https://example.com "Ex")' in result
+        assert "![Pic](pic.png)" in result
+        assert "`a_b`" in result
+        assert r"snake\_case" in result
+
+    def test_blockquote_and_pre(self):
+        """Test blockquote markers and fenced code blocks."""
+        html = "<blockquote><p>Quoted</p><p>Text</p></blockquote><pre>line 1\n  line 2\n</pre>"
+        result = render_markdown(BeautifulSoup(html, 'lxml'))
+
+        assert "> Quoted\n>\n> Text" in result
+        assert "```\nline 1\n  line 2\n```" in result
+
+    def test_table(self):
+        """Test table rows with a header separator."""
+        html = '<table><tr><th>Name</th><th>Price</th></tr><tr><td colspan="2">Total</td></tr></table>'
+        result = render_markdown(BeautifulSoup(html, 'lxml'))
+
+        assert result == "| Name | Price |\n| --- | --- |\n| Total | |"
+
+    def test_adjacent_strings_merged(self):
+        """Test that strings left behind by cleaning behave like one text node."""
+        soup = BeautifulSoup('<p>Check out <a href="https://example.com">link</a> now</p>', 'lxml')
+        soup.a.replace_with("[link](https://example.com)")
+
+        assert render_markdown(soup) == _markdownify(soup)
+
+    @pytest.mark.parametrize("html", [
+        "<h1>Title</h1><p>Paragraph with <strong>bold</strong> text.</p>",
+        "<h1>Unclosed header<p>Missing closing tags",
+        "<p>Testing &amp; entities like &lt;script&gt; and &quot;quotes&quot;</p>",
+        "<div>  <span>inline</span>\n <em> spaced </em><br>next</div><hr><dl><dt>Term</dt><dd>Def</dd></dl>",
+        "<table><thead><tr><th>A</th></tr></thead><tbody><tr><td><h2>In cell</h2></td></tr></tbody></table>",
+        "<p>1. not a list * star <del>gone</del> <q>quote</q> x<sub>2</sub></p><script>var a;</script>",
+    ])
+    def test_matches_markdownify(self, html):
+        """Test that output matches markdownify on the same tree."""
+        soup = BeautifulSoup(html, 'lxml')
+        assert render_markdown(soup) == _markdownify(soup)
+
+
+def _reference_text(soup):
+    """The original replace-and-flatten readable text extraction."""
+    for tag in soup.find_all(['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                              'li', 'blockquote', 'article', 'section', 'br']):
+        if tag.name == 'br':
+            tag.replace_with("\n")
+        else:
+            tag.replace_with(f"{tag.get_text().strip()}\n\n")
+    return soup.get_text(separator=' ', strip=True)
+
+
+class TestExtractText:
+    """Test the single-traversal plain text extractor."""
+
+    def test_blocks_and_inline_text(self):
+        """Test that blocks become single pieces joined by spaces."""
+        soup = BeautifulSoup("<h1>Title</h1><p>Para <b>x</b></p><div><p>a</p><p>b</p></div>tail", 'lxml')
+        assert extract_text(soup) == "Title Para x ab tail"
+
+    def test_does_not_modify_tree(self):
+        """Test that the tree is left untouched."""
+        soup = BeautifulSoup("<div><p>One</p><br><p>Two</p></div>", 'lxml')
+        before = str(soup)
+        extract_text(soup)
+
+        assert str(soup) == before
+
+    def test_deep_nesting(self):
+        """Test that deeply nested blocks are handled without recursion."""
+        soup = BeautifulSoup("<body></body>", 'lxml')
+        node = soup.body
+        for i in range(3000):
+            child = soup.new_tag('div')
+            child.append(f"level {i} ")
+            node.append(child)
+            node = child
+
+        assert extract_text(soup).startswith("level 0 level 1")
+
+    @pytest.mark.parametrize("html", [
+        "<h1>Title</h1><p>Paragraph with <strong>bold</strong> text.</p>",
+        "<p>Line one<br>Line two</p><br>loose<span> inline </span><li>item</li>",
+        "<section><article><h2>Head</h2><p>Body</p></article></section>after",
+        "<p>Text</p><script>var a;</script><style>p {}</style><!-- comment -->end",
+        "<div>  </div><p>\n</p><blockquote>Quote <q>q</q></blockquote>",
+    ])
+    def test_matches_reference(self, html):
+        """Test that output matches the original replace-based extraction."""
+        expected = _reference_text(BeautifulSoup(html, 'lxml'))
+        assert extract_text(BeautifulSoup(html, 'lxml')) == expected
@@ -2,11 +2,20 @@
 Tests for html2cleantext.utils module.
 """
 
+import random
+import re
+import threading
+import time
+
 import pytest
 from unittest.mock import patch, Mock
 
 from html2cleantext.utils import (
-    fetch_url, detect_language, is_url, is_file_path, normalize_whitespace
+    fetch_url, detect_language, is_url, is_file_path, normalize_whitespace,
+    protect_items, restore_items, format_readable_text, _detection_samples,
+    classify_script, detect_script_language, script_detection_info,
+    reset_script_detection_info, LanguageDetector, get_language_detector, HostLanguageCache,
+    detect_paragraph_languages, PARAGRAPH_DETECTIONS, _paragraph_script_counts, _script_counts
 )
 
 
@@ -114,6 +123,327 @@ class TestDetectLanguage:
         result = detect_language("Some text that fails detection")
         assert result is None
 
+    def test_long_mixed_text_keeps_full_text_answer(self):
+        """Test that sampling agrees with detecting from the whole text."""
+        english = "The quick brown fox jumps over the lazy dog and runs across the field. "
+        bengali = "আমি বাংলায় গান গাই, আমি বাংলার গান গাই। "
+        for text in (english * 20 + bengali * 200, bengali * 200 + english * 20):
+            assert detect_language(text) == detect_language(text, sample_size=None) == 'bn'
+
+    @patch('html2cleantext.utils.detect')
+    @patch('html2cleantext.utils.detect_langs')
+    def test_confident_sample_stops_early(self, mock_detect_langs, mock_detect):
+        """Test that the end slice is skipped once the first sample is confident."""
+        mock_detect_langs.return_value = [Mock(lang='en', prob=0.99)]
+
+        assert detect_language("English words here. " * 1000) == 'en'
+        assert mock_detect_langs.call_count == 1
+        assert len(mock_detect_langs.call_args[0][0]) < 3000
+        mock_detect.assert_not_called()
+
+    @patch('html2cleantext.utils.detect')
+    @patch('html2cleantext.utils.detect_langs')
+    def test_unconfident_sample_adds_end_slice(self, mock_detect_langs, mock_detect):
+        """Test that detection falls back to all three slices below the threshold."""
+        mock_detect_langs.return_value = [Mock(lang='en', prob=0.6)]
+        mock_detect.return_value = 'de'
+
+        assert detect_language("English words here. " * 1000) == 'de'
+        assert len(mock_detect.call_args[0][0]) <= 3000
+
+    @patch('html2cleantext.utils.detect')
+    def test_no_sample_size_detects_whole_text(self, mock_detect):
+        """Test that sample_size=None passes the whole normalized text."""
+        mock_detect.return_value = 'en'
+        text = "English   words\nhere. " * 1000
+
+        assert detect_language(text, sample_size=None) == 'en'
+        mock_detect.assert_called_once_with(' '.join(text.split()))
+
+    def test_detection_samples(self):
+        """Test the stratified start, middle and end slices."""
+        assert _detection_samples("short  text", 3000) == ["short text"]
+
+        text = ' '.join(f"w{i:04d}" for i in range(2000))
+        first, full = _detection_samples(text, 300)
+        assert first.startswith("w0000 ")
+        assert "w1000" in first
+        assert full.startswith(first + " ")
+        assert full.endswith(" w1999")
+        assert len(full) <= 300
+
+    def test_concurrent_first_use(self, monkeypatch):
+        """Test that threads detecting at once all see fully loaded profiles."""
+        from langdetect import detector_factory
+        import html2cleantext.utils as utils
+
+        texts = ["The quick brown fox jumps over the lazy dog and runs away.",
+                 "Le renard brun rapide saute par-dessus le chien paresseux."] * 4
+        expected = [detect_language(text) for text in texts]
+        monkeypatch.setattr(detector_factory, '_factory', None)
+        monkeypatch.setattr(utils, '_profiles_loaded', False)
+
+        results = [None] * len(texts)
+        barrier = threading.Barrier(len(texts))
+
+        def run(index):
+            barrier.wait()
+            results[index] = detect_language(texts[index])
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == expected
+
+
+class TestLanguageDetector:
+    """Test language detection restricted to candidate languages."""
+
+    def test_detects_candidates(self):
+        """Test detection among the candidate languages."""
+        detector = LanguageDetector(['en', 'bn', 'de'])
+        assert detector.languages == ('en', 'bn', 'de')
+        assert detector.detect("The quick brown fox jumps over the lazy dog.") == 'en'
+        assert detector.detect("আমি বাংলায় গান গাই, আমি বাংলার গান গাই।") == 'bn'
+        assert detector.detect("Der schnelle braune Fuchs springt über den faulen Hund.") == 'de'
+        assert detector.detect_langs("Der schnelle braune Fuchs springt.")[0].lang == 'de'
+
+    def test_only_returns_candidates(self):
+        """Test that languages outside the candidates are never returned."""
+        detector = LanguageDetector(['en', 'bn'])
+        text = "Le renard brun rapide saute par-dessus le chien paresseux."
+        assert detector.detect(text) in ('en', 'bn')
+
+    def test_deterministic_without_global_seed(self):
+        """Test that results do not depend on DetectorFactory.seed."""
+        from langdetect import DetectorFactory
+        detector = LanguageDetector(['en', 'de', 'nl'])
+        text = "Hand in hand"
+        saved_seed = DetectorFactory.seed
+        try:
+            DetectorFactory.seed = None
+            results = {str(detector.detect_langs(text)) for _ in range(10)}
+        finally:
+            DetectorFactory.seed = saved_seed
+        assert len(results) == 1
+
+    def test_invalid_languages(self):
+        """Test that unknown or too few languages are rejected."""
+        with pytest.raises(ValueError):
+            LanguageDetector(['en'])
+        with pytest.raises(ValueError):
+            LanguageDetector(['en', 'en'])
+        with pytest.raises(ValueError):
+            LanguageDetector(['en', 'xx'])
+
+    def test_shared_instance(self):
+        """Test that get_language_detector() returns one detector per candidate set."""
+        detector = get_language_detector(('en', 'bn'))
+        assert get_language_detector(('en', 'bn')) is detector
+        assert get_language_detector(('en', 'de')) is not detector
+
+    @patch('html2cleantext.utils.detect_langs')
+    @patch('html2cleantext.utils.detect')
+    def test_detect_language_uses_detector(self, mock_detect, mock_detect_langs):
+        """Test that detect_language() and detect_script_language() use the detector."""
+        detector = get_language_detector(('en', 'bn'))
+        assert detect_language("The quick brown fox jumps over the lazy dog. " * 200,
+                               detector=detector) == 'en'
+        assert detect_script_language("The quick brown fox jumps over the lazy dog.",
+                                      detector=detector) == 'en'
+        mock_detect.assert_not_called()
+        mock_detect_langs.assert_not_called()
+
+
+class TestScriptDetection:
+    """Test the Unicode-script front end to language detection."""
+
+    BENGALI = "আমি বাংলায় গান গাই, আমি বাংলার গান গাই। "
+    ENGLISH = "The quick brown fox jumps over the lazy dog. "
+
+    def setup_method(self):
+        reset_script_detection_info()
+
+    def test_classify_script(self):
+        """Test classification by the dominant script."""
+        assert classify_script(self.BENGALI * 10) == 'bengali'
+        assert classify_script(self.ENGLISH * 10) == 'latin'
+        assert classify_script("Быстрая коричневая лиса. " * 10) == 'other'
+        assert classify_script(self.BENGALI + self.ENGLISH) == 'mixed'
+        assert classify_script("123 456 !!!") is None
+        assert classify_script("") is None
+
+    @patch('html2cleantext.utils.detect_language')
+    def test_clear_scripts_skip_langdetect(self, mock_detect_language):
+        """Test that Bengali and non-Latin text is decided without langdetect."""
+        assert detect_script_language(self.BENGALI * 10) == 'bn'
+        assert detect_script_language("我们在这里测试中文文本检测。" * 10) is None
+        assert detect_script_language("১২") is None
+        mock_detect_language.assert_not_called()
+        assert script_detection_info() == (3, 3)
+
+    @patch('html2cleantext.utils.detect_language')
+    def test_latin_and_mixed_text_fall_back(self, mock_detect_language):
+        """Test that Latin-script and mixed text still runs langdetect."""
+        mock_detect_language.return_value = 'en'
+
+        assert detect_script_language(self.ENGLISH * 10) == 'en'
+        assert detect_script_language(self.BENGALI + self.ENGLISH) == 'en'
+        assert detect_script_language(self.BENGALI * 10) == 'bn'
+        assert mock_detect_language.call_count == 2
+        info = script_detection_info()
+        assert info == (3, 1)
+        assert info.skip_rate == pytest.approx(1 / 3)
+
+    def test_matches_langdetect(self):
+        """Test that the script decision agrees with langdetect."""
+        for text in (self.BENGALI * 20, self.BENGALI * 20 + "iPhone Samsung",
+                     self.ENGLISH * 20, self.ENGLISH * 5 + self.BENGALI * 5):
+            assert detect_script_language(text) == detect_language(text)
+
+    def test_reset(self):
+        """Test resetting the counts."""
+        detect_script_language(self.BENGALI * 10)
+        reset_script_detection_info()
+        info = script_detection_info()
+        assert info == (0, 0)
+        assert info.skip_rate == 0.0
+
+
+class TestParagraphLanguages:
+    """Test per-paragraph language detection."""
+
+    BENGALI = "আমি বাংলায় গান গাই, আমি বাংলার গান গাই।"
+    ENGLISH = "Free delivery on all orders over 2000 taka."
+
+    def test_script_decides_without_langdetect(self):
+        """Test that Bengali, non-Latin and letterless paragraphs skip langdetect."""
+        paragraphs = ["৳১২০০", self.BENGALI, "১২ ৩৪", "Привет мир, как дела?", "!!!"]
+        with patch('html2cleantext.utils.detect_language') as mock_detect_language:
+            languages = detect_paragraph_languages(paragraphs)
+        mock_detect_language.assert_not_called()
+        assert languages == ['bn', 'bn', 'bn', None, None]
+
+    def test_latin_paragraphs_grouped(self):
+        """Test that Latin-script paragraphs share a bounded number of detections."""
+        paragraphs = [self.BENGALI if i % 2 else self.ENGLISH for i in range(400)]
+        with patch('html2cleantext.utils.detect_language', return_value='en') as mock_detect_language:
+            languages = detect_paragraph_languages(paragraphs)
+        assert languages == ['bn' if i % 2 else 'en' for i in range(400)]
+        assert mock_detect_language.call_count == PARAGRAPH_DETECTIONS
+
+        with patch('html2cleantext.utils.detect_language', return_value='en') as mock_detect_language:
+            detect_paragraph_languages([self.BENGALI, self.ENGLISH, "iPhone 15 Pro"])
+        assert mock_detect_language.call_count == 1
+        assert mock_detect_language.call_args[0][0] == self.ENGLISH + "\niPhone 15 Pro"
+
+    def test_mixed_paragraph_by_majority(self):
+        """Test that Bengali sentences with English names count as Bengali."""
+        assert detect_paragraph_languages(["আমাদের নতুন iPhone 15 এখন দোকানে পাওয়া যাচ্ছে"]) == ['bn']
+
+    def test_real_detection(self):
+        """Test detection without mocks."""
+        paragraphs = [self.BENGALI, "The quick brown fox jumps over the lazy dog.", "", self.BENGALI]
+        assert detect_paragraph_languages(paragraphs) == ['bn', 'en', 'en', 'bn']
+        assert detect_paragraph_languages([]) == []
+
+    def test_counts_documents(self):
+        """Test that each call counts as one document in script_detection_info()."""
+        reset_script_detection_info()
+        detect_paragraph_languages([self.BENGALI])
+        with patch('html2cleantext.utils.detect_language', return_value='en'):
+            detect_paragraph_languages([self.BENGALI, self.ENGLISH])
+        assert script_detection_info() == (2, 1)
+
+    def test_paragraph_script_counts(self):
+        """Test that counting all paragraphs at once matches counting each."""
+        rng = random.Random(0)
+        alphabet = "ab Z1_আমি২৳ Пр!\n.é²中"
+        for _ in range(500):
+            paragraphs = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+                          for _ in range(rng.randint(1, 6))]
+            assert _paragraph_script_counts(paragraphs) == [_script_counts(p) for p in paragraphs]
+
+
+class TestHostLanguageCache:
+    """Test the per-host language prior cache."""
+
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_confident_prior_reused(self, mock_detect):
+        """Test that pages reuse the host's language once it is confirmed."""
+        mock_detect.return_value = 'bn'
+        cache = HostLanguageCache(confirm=3, verify_every=5)
+
+        results = [cache.detect("text", f"https://news.example.com/{i}") for i in range(13)]
+        assert results == ['bn'] * 13
+        # 3 detections confirm the prior; then every 5th page is re-verified
+        assert mock_detect.call_count == 5
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (8, 5, 1)
+
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_disagreeing_verification_drops_prior(self, mock_detect):
+        """Test that a verification in another language drops the prior."""
+        mock_detect.return_value = 'en'
+        cache = HostLanguageCache(confirm=2, verify_every=3)
+        for _ in range(4):
+            cache.detect("text", "https://shop.example.com/")
+
+        mock_detect.return_value = 'bn'
+        # The third page with a prior is verified and disagrees
+        assert cache.detect("text", "https://shop.example.com/") == 'bn'
+        assert mock_detect.call_count == 3
+        # Until 'bn' is confirmed, every page is detected
+        assert cache.detect("text", "https://shop.example.com/") == 'bn'
+        assert mock_detect.call_count == 4
+
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_hosts_separate(self, mock_detect):
+        """Test that priors are kept per host."""
+        cache = HostLanguageCache(confirm=1)
+        mock_detect.return_value = 'bn'
+        cache.detect("text", "https://a.example.com/1")
+        mock_detect.return_value = 'en'
+        assert cache.detect("text", "https://b.example.com/1") == 'en'
+        assert cache.detect("text", "https://A.example.com/2") == 'bn'
+
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_lru_eviction(self, mock_detect):
+        """Test that the least recently used host is evicted."""
+        mock_detect.return_value = 'en'
+        cache = HostLanguageCache(maxsize=2, confirm=1)
+        cache.detect("text", "https://a.example.com/")
+        cache.detect("text", "https://b.example.com/")
+        cache.detect("text", "https://a.example.com/")
+        cache.detect("text", "https://c.example.com/")
+        assert cache.cache_info().currsize == 2
+
+        calls = mock_detect.call_count
+        cache.detect("text", "https://a.example.com/")
+        assert mock_detect.call_count == calls
+        cache.detect("text", "https://b.example.com/")
+        assert mock_detect.call_count == calls + 1
+
+    @patch('html2cleantext.utils.detect_script_language')
+    def test_failed_detection_not_cached(self, mock_detect):
+        """Test that failed detections and URLs without a host are not cached."""
+        mock_detect.return_value = None
+        cache = HostLanguageCache(confirm=1)
+        assert cache.detect("text", "https://a.example.com/") is None
+        assert cache.detect("text", "not a url") is None
+        assert cache.cache_info().currsize == 0
+
+    def test_clear_and_validation(self):
+        """Test clearing the cache and rejecting invalid sizes."""
+        cache = HostLanguageCache()
+        cache.detect("The quick brown fox jumps over the lazy dog.", "https://a.example.com/")
+        cache.cache_clear()
+        assert cache.cache_info() == (0, 0, 1024, 0)
+        with pytest.raises(ValueError):
+            HostLanguageCache(maxsize=0)
+
 
 class TestNormalizeWhitespace:
     """Test whitespace normalization function."""
@@ -142,6 +472,63 @@ class TestNormalizeWhitespace:
         assert normalize_whitespace("   ") == ""
 
 
+class TestProtectItems:
+    """Test URL and image placeholder protection."""
+
+    URL_RE = re.compile(r'(https?://[^\s\]]+|[^\s\]]*\.[a-zA-Z]{2,}[^\s\]]*)')
+    IMAGE_RE = re.compile(r'(\[IMAGE:[^\]]+\])')
+
+    def _protect_with_regexes(self, text):
+        items = []
+
+        def protect(match):
+            items.append(match.group(0))
+            return f"__PROTECTED_ITEM_{len(items) - 1}__"
+
+        text = self.URL_RE.sub(protect, text)
+        text = self.IMAGE_RE.sub(protect, text)
+        return text, items
+
+    def test_matches_regex_substitution(self):
+        """Test that protection gives the same result as the URL and image regexes."""
+        tokens = ['a', 'B', 'x.com', '.co', '?', ' ', '\n', ']', '[', '[IMAGE:', '[IMAGE:]',
+                  'http://', 'https://', 'h', '://', '[IMAGE:x.png]', 'https://e.com/a', 'word ']
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 20)))
+            assert protect_items(text) == self._protect_with_regexes(text), text
+
+    def test_image_keeps_inner_url_placeholder(self):
+        """Test that images are numbered after URLs and keep the URLs inside them."""
+        text, items = protect_items("See [IMAGE: photo.jpg] at https://example.com")
+        assert text == "See __PROTECTED_ITEM_2__ at __PROTECTED_ITEM_1__"
+        assert items == ["photo.jpg", "https://example.com", "[IMAGE: __PROTECTED_ITEM_0__]"]
+
+    def test_round_trip(self):
+        """Test that restoring gives back the original text."""
+        text = "Visit https://example.com/a?b=1 or [IMAGE:https://cdn.example.com/x.png] now."
+        protected, items = protect_items(text)
+        assert "example.com" not in protected
+        assert restore_items(protected, items) == text
+
+    def test_unknown_placeholders_left_alone(self):
+        """Test that placeholders without an item are not replaced."""
+        assert restore_items("__PROTECTED_ITEM_5__", ["x"]) == "__PROTECTED_ITEM_5__"
+
+    @pytest.mark.parametrize("text", [
+        "a" * 200000,
+        "a." * 100000,
+        "[IMAGE:" * 30000,
+        "http:" * 40000,
+        " https://x.com/" * 20000,
+    ], ids=["long-token", "dots", "unclosed-images", "schemes", "many-urls"])
+    def test_adversarial_inputs_linear(self, text):
+        """Test that inputs which make the regexes quadratic are handled in linear time."""
+        start = time.perf_counter()
+        format_readable_text(text)
+        assert time.perf_counter() - start < 2.0
+
+
 class TestFetchUrl:
     """Test URL fetching function."""
     